@@ -0,0 +1,189 @@
+"""
+Admission control: per-cost-class concurrency limits with bounded wait queues, plus
+load shedding on event-loop lag.
+
+Every route belongs to a cost class, declared by its router module as
+`COST_CLASS = "text" | "file-conversion" | "codegen"` and recorded in the router
+manifest. Routes without one, and the app's own endpoints, are "trivial" and are never
+limited. Each other class admits up to its concurrency limit; further requests wait in
+a queue of at most `queue_size` (and for at most `queue_timeout` seconds). A request
+that would overflow the queue gets 503 with Retry-After straight away.
+
+A monitor task measures how late the event loop wakes up. While the lag is over
+`max_loop_lag`, new non-trivial requests are shed the same way, so health checks and
+cheap tools stay responsive during a burst of big uploads.
+"""
+import asyncio
+import math
+from typing import Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .router_loader import RouteTable
+from .serialization import AppJSONResponse
+
+TRIVIAL = "trivial"
+TEXT = "text"
+FILE_CONVERSION = "file-conversion"
+CODEGEN = "codegen"
+COST_CLASSES = (TRIVIAL, TEXT, FILE_CONVERSION, CODEGEN)
+
+def route_cost_classes(manifest: List[Dict]) -> RouteTable:
+    """Map full route paths (templates included) to the cost class of their router module."""
+    return RouteTable({
+        route["path"]: entry.get("cost_class", TRIVIAL)
+        for entry in manifest
+        for route in entry["routes"]
+        if entry.get("cost_class", TRIVIAL) != TRIVIAL
+    })
+
+class ClassGate:
+    """Concurrency limit with a bounded number of waiters."""
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0, "loop_lag": 0}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the serving event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    async def acquire(self, timeout: float) -> Optional[str]:
+        """Take a slot; returns the shedding reason instead when none is available."""
+        if self.semaphore.locked():
+            if self.waiting >= self.queue_size:
+                self.shed["queue_full"] += 1
+                return "queue_full"
+            self.waiting += 1
+            try:
+                # Not wait_for: on 3.11 it can time out after acquire() succeeded and leak the permit.
+                # A cancelled acquire() hands back a permit it was just given.
+                async with asyncio.timeout(timeout):
+                    await self.semaphore.acquire()
+            except asyncio.TimeoutError:
+                self.shed["queue_timeout"] += 1
+                return "queue_timeout"
+            finally:
+                self.waiting -= 1
+        else:
+            await self.semaphore.acquire()
+        self.active += 1
+        self.admitted += 1
+        return None
+
+    def release(self) -> None:
+        self.active -= 1
+        self.semaphore.release()
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "limit": self.limit,
+            "queue_size": self.queue_size,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+        }
+
+class LoopLagMonitor:
+    """Samples how late a periodic sleep wakes up; the reading decays between spikes."""
+
+    def __init__(self, interval: float = 0.1, decay: float = 0.8):
+        self.interval = interval
+        self.decay = decay
+        self.lag = 0.0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            sample = max(0.0, loop.time() - started - self.interval)
+            self.lag = max(sample, self.lag * self.decay)
+            self.max_lag = max(self.max_lag, sample)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+class AdmissionController:
+    def __init__(self, limits: Dict[str, int], queue_size: int, queue_timeout: float,
+                 max_loop_lag: float, retry_after: int, monitor: Optional[LoopLagMonitor] = None):
+        self.gates = {name: ClassGate(name, limit, queue_size) for name, limit in limits.items() if name != TRIVIAL}
+        self.queue_timeout = queue_timeout
+        self.max_loop_lag = max_loop_lag
+        self.retry_after = retry_after
+        self.monitor = monitor or LoopLagMonitor()
+
+    def retry_after_for(self, reason: str) -> int:
+        if reason == "loop_lag":
+            return max(1, math.ceil(self.monitor.lag))
+        return self.retry_after
+
+    async def admit(self, cost_class: str) -> Tuple[Optional[ClassGate], Optional[str]]:
+        gate = self.gates.get(cost_class)
+        if gate is None:
+            return None, None
+        if self.max_loop_lag and self.monitor.lag > self.max_loop_lag:
+            gate.shed["loop_lag"] += 1
+            return None, "loop_lag"
+        reason = await gate.acquire(self.queue_timeout)
+        return (None, reason) if reason else (gate, None)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "loop_lag_ms": round(self.monitor.lag * 1000, 1),
+            "max_loop_lag_ms": round(self.monitor.max_lag * 1000, 1),
+            "classes": {name: gate.as_dict() for name, gate in self.gates.items()},
+        }
+
+    def metric_families(self) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        gates = self.gates.values()
+        return [
+            ("xutil_event_loop_lag_seconds", "gauge", "Decayed event loop lag", [({}, self.monitor.lag)]),
+            ("xutil_admission_active", "gauge", "Requests holding a slot", [({"class": g.name}, g.active) for g in gates]),
+            ("xutil_admission_waiting", "gauge", "Requests waiting for a slot", [({"class": g.name}, g.waiting) for g in gates]),
+            ("xutil_admission_admitted_total", "counter", "Requests admitted", [({"class": g.name}, g.admitted) for g in gates]),
+            ("xutil_admission_shed_total", "counter", "Requests answered with 503",
+             [({"class": g.name, "reason": reason}, count) for g in gates for reason, count in g.shed.items()]),
+        ]
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, controller: AdmissionController, cost_classes: Optional[RouteTable] = None):
+        self.app = app
+        self.controller = controller
+        self.cost_classes = cost_classes or RouteTable({})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        cost_class = self.cost_classes.get(scope["path"], TRIVIAL)
+        gate, reason = await self.controller.admit(cost_class)
+        if reason is not None:
+            response = AppJSONResponse(
+                {"detail": f"Server busy ({reason.replace('_', ' ')}), retry later"},
+                status_code=503,
+                headers={"Retry-After": str(self.controller.retry_after_for(reason))},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if gate is not None:
+                gate.release()
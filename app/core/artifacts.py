@@ -0,0 +1,135 @@
+"""
+Build-time artifacts: the router manifest and a precompiled OpenAPI document.
+
+    python -m app.core.artifacts build   # write app/router_manifest.json and app/build/openapi.json(.gz)
+    python -m app.core.artifacts check   # exit 1 if the artifacts are stale
+
+At runtime the app reads the manifest instead of scanning app/routers, and serves
+/openapi.json from the prebuilt bytes instead of generating it on the first hit.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from fastapi import FastAPI, Request, Response
+from .router_loader import API_PREFIX, MANIFEST_PATH, discover_routers, import_router_module
+
+BUILD_DIR = Path(__file__).resolve().parent.parent / "build"
+OPENAPI_FILE = "openapi.json"
+
+def build_manifest(modules: List[str]) -> Dict[str, Any]:
+    entries = []
+    for module_path in modules:
+        module = import_router_module(module_path, trigger="build")
+        router = getattr(module, "router", None)
+        if router is None:
+            continue
+        module_body_limit = getattr(module, "MAX_BODY_BYTES", None)
+        module_cacheable = getattr(module, "RESULT_CACHEABLE", True)
+        entries.append({
+            "module": module_path,
+            "prefix": router.prefix,
+            "cacheable": module_cacheable,
+            "cost_class": getattr(module, "COST_CLASS", "trivial"),
+            "routes": [
+                {
+                    "path": f"{API_PREFIX}{route.path}",
+                    "methods": sorted(getattr(route, "methods", None) or []),
+                    "max_body_bytes": getattr(getattr(route, "endpoint", None), "max_body_bytes", module_body_limit),
+                    "cacheable": module_cacheable and getattr(getattr(route, "endpoint", None), "result_cacheable", True),
+                }
+                for route in router.routes
+            ],
+        })
+    return {"routers": entries}
+
+def render_manifest(manifest: Dict[str, Any]) -> bytes:
+    return (json.dumps(manifest, indent=2) + "\n").encode("utf-8")
+
+def render_openapi() -> bytes:
+    # Imported here so the app (and every router) is only loaded by the build step
+    from ..main import app, lazy_loader
+    if lazy_loader is not None:
+        lazy_loader.load_all_sync(trigger="build")
+    # Call the class method so a previously installed precompiled document is not reused
+    app.openapi_schema = None
+    schema = FastAPI.openapi(app)
+    return json.dumps(schema, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def build(build_dir: Path = BUILD_DIR) -> None:
+    MANIFEST_PATH.write_bytes(render_manifest(build_manifest(discover_routers())))
+    build_dir.mkdir(parents=True, exist_ok=True)
+    openapi = render_openapi()
+    (build_dir / OPENAPI_FILE).write_bytes(openapi)
+    (build_dir / f"{OPENAPI_FILE}.gz").write_bytes(gzip.compress(openapi, compresslevel=9, mtime=0))
+    print(f"Wrote {MANIFEST_PATH} and {build_dir / OPENAPI_FILE} ({len(openapi)} bytes)")
+
+def check(build_dir: Path = BUILD_DIR) -> List[str]:
+    """Return the artifacts that no longer match what the code would generate."""
+    stale = []
+    if not MANIFEST_PATH.exists() or MANIFEST_PATH.read_bytes() != render_manifest(build_manifest(discover_routers())):
+        stale.append(str(MANIFEST_PATH))
+    openapi_path = build_dir / OPENAPI_FILE
+    if not openapi_path.exists() or openapi_path.read_bytes() != render_openapi():
+        stale.append(str(openapi_path))
+    return stale
+
+class PrecompiledOpenAPI:
+    """Serves a prebuilt OpenAPI document with an ETag and a gzip variant."""
+
+    def __init__(self, build_dir: Path = BUILD_DIR):
+        self.path = build_dir / OPENAPI_FILE
+        self.gzip_path = build_dir / f"{OPENAPI_FILE}.gz"
+        self._body: Optional[bytes] = None
+        self._gzip_body: Optional[bytes] = None
+        self._etag: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return self.path.exists()
+
+    def _load(self) -> None:
+        if self._body is None:
+            self._body = self.path.read_bytes()
+            self._gzip_body = self.gzip_path.read_bytes() if self.gzip_path.exists() else None
+            self._etag = f'"{hashlib.sha256(self._body).hexdigest()[:32]}"'
+
+    def schema(self) -> Dict[str, Any]:
+        self._load()
+        return json.loads(self._body)
+
+    async def endpoint(self, request: Request) -> Response:
+        self._load()
+        headers = {"ETag": self._etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        if self._etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        if self._gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(self._gzip_body, media_type="application/json", headers=headers)
+        return Response(self._body, media_type="application/json", headers=headers)
+
+    def install(self, app: FastAPI) -> None:
+        """Replace FastAPI's generated /openapi.json route with the prebuilt document."""
+        app.router.routes = [r for r in app.router.routes if getattr(r, "path", None) != app.openapi_url]
+        app.add_route(app.openapi_url, self.endpoint, include_in_schema=False)
+        app.openapi = self.schema
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or verify the router manifest and OpenAPI artifacts")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--build-dir", type=Path, default=BUILD_DIR)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.build_dir)
+        return 0
+    stale = check(args.build_dir)
+    for path in stale:
+        print(f"Stale artifact: {path} (run `python -m app.core.artifacts build`)", file=sys.stderr)
+    return 1 if stale else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Per-route request body limits, enforced while the body streams in.
+
+A request whose Content-Length is over the route's limit is answered with 413 before a
+single body byte is read. Chunked or under-declared bodies are counted as they arrive,
+and the first chunk past the limit raises `RequestTooLarge` (an HTTPException, so
+FastAPI's body parsing passes it through as a 413). Either way at most one chunk over
+the limit is ever held in memory.
+
+Limits come from the router manifest. Each route takes the `max_body_size` decorator
+value of its endpoint, else its module's `MAX_BODY_BYTES`, else the
+XUTIL_DEFAULT_MAX_BODY_BYTES setting.
+"""
+from typing import Callable, Dict, List, Optional
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .router_loader import RouteTable
+from .serialization import AppJSONResponse
+
+def max_body_size(limit: int) -> Callable:
+    """Give one endpoint its own body limit; place it below the router decorator."""
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.max_body_bytes = limit
+        return endpoint
+    return decorate
+
+def route_limits(manifest: List[Dict]) -> RouteTable:
+    """Map full route paths (templates included) to their body limit, for routes that declare one."""
+    return RouteTable({
+        route["path"]: route["max_body_bytes"]
+        for entry in manifest
+        for route in entry["routes"]
+        if route.get("max_body_bytes") is not None
+    })
+
+def _describe(limit: int) -> str:
+    return f"{limit / (1024 * 1024):.1f}MB" if limit >= 1024 * 1024 else f"{limit / 1024:.0f}KB"
+
+class RequestTooLarge(HTTPException):
+    def __init__(self, limit: int, detail: Optional[str] = None):
+        super().__init__(status_code=413, detail=detail or f"Request body exceeds the {_describe(limit)} limit for this endpoint")
+
+class BodyLimitMiddleware:
+    def __init__(self, app: ASGIApp, default_limit: int, limits: Optional[RouteTable] = None):
+        self.app = app
+        self.default_limit = default_limit
+        self.limits = limits or RouteTable({})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(scope["path"], self.default_limit)
+        declared = dict(scope["headers"]).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._reject(scope, receive, send, RequestTooLarge(limit))
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise RequestTooLarge(limit)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except RequestTooLarge as e:
+            # Raised outside FastAPI's body parsing (e.g. by another middleware buffering the body)
+            if response_started:
+                raise
+            await self._reject(scope, receive, send, e)
+
+    async def _reject(self, scope: Scope, receive: Receive, send: Send, error: RequestTooLarge) -> None:
+        # Connection: close so the server drops the rest of the body instead of reading it
+        response = AppJSONResponse({"detail": error.detail}, status_code=413, headers={"Connection": "close"})
+        await response(scope, receive, send)
@@ -0,0 +1,91 @@
+"""
+Single-flight coalescing of identical concurrent conversions.
+
+When many clients upload the same file at once (a popular sample, a retrying client),
+only the first request runs the conversion. Requests for the same tool with the same
+input digest and options that arrive while it is in flight wait for it and get the
+same rendered response bytes. Nothing is kept once the computation finishes; the result
+cache handles repeats over time, while this covers bursts of uploads too large for it.
+
+The computation runs in its own task, so a leader whose client disconnects does not
+cancel the result for the others. Errors are shared the same way as results.
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from .executor import run_crud
+from .raw_body import raw_bytes
+from .serialization import AppJSONResponse, json_format
+
+# Inputs at least this large are hashed off the event loop (hashlib releases the GIL)
+THREAD_HASH_MIN_BYTES = 1024 * 1024
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class ToolStats:
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+
+    @property
+    def rate(self) -> float:
+        total = self.leaders + self.followers
+        return self.followers / total if total else 0.0
+
+class SingleFlight:
+    def __init__(self):
+        self.in_flight: Dict[Tuple, asyncio.Task] = {}
+        self.tools: Dict[str, ToolStats] = {}
+
+    async def do(self, tool: str, key: Tuple, compute: Callable[[], Awaitable[Any]]) -> Any:
+        stats = self.tools.setdefault(tool, ToolStats())
+        task = self.in_flight.get(key)
+        if task is None:
+            stats.leaders += 1
+            task = asyncio.ensure_future(compute())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            stats.followers += 1
+        # shield: a waiter going away must not cancel the work the others wait on
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Tuple, task: asyncio.Task) -> None:
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here so an error nobody awaited is not logged as lost
+
+    def metric_families(self) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        tools = sorted(self.tools.items())
+        return [
+            ("xutil_coalesce_leaders_total", "counter", "Conversions actually computed", [({"tool": t}, s.leaders) for t, s in tools]),
+            ("xutil_coalesce_followers_total", "counter", "Requests that shared an in-flight conversion", [({"tool": t}, s.followers) for t, s in tools]),
+            ("xutil_coalesce_rate", "gauge", "Share of requests served by another request's conversion", [({"tool": t}, s.rate) for t, s in tools]),
+            ("xutil_coalesce_in_flight", "gauge", "Distinct conversions currently running", [({}, len(self.in_flight))]),
+        ]
+
+single_flight = SingleFlight()
+
+async def run_coalesced(tool: str, func: Callable, data: bytes, *, raw_media_type: Optional[str] = None, **kwargs: Any) -> Response:
+    """
+    Run `func(data, **kwargs)` via `run_crud`, sharing one computation between identical
+    concurrent requests. Returns the rendered JSON response, or with `raw_media_type` the
+    converted document itself.
+    """
+    digest = await run_in_threadpool(_digest, data) if len(data) >= THREAD_HASH_MIN_BYTES else _digest(data)
+    # The output format changes the rendered bytes, so it is part of the key
+    key = (tool, digest, tuple(sorted(kwargs.items())), json_format.get(), raw_media_type)
+
+    async def compute() -> bytes:
+        result = await run_crud(func, data, size=len(data), **kwargs)
+        if raw_media_type is not None:
+            return raw_bytes(result)
+        return AppJSONResponse(jsonable_encoder(result)).body
+
+    body = await single_flight.do(tool, key, compute)
+    return Response(body, media_type=raw_media_type or "application/json")
@@ -0,0 +1,218 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+zstd and br come from the `zstandard` and `brotli` packages pinned in requirements.txt;
+an install without them offers only gzip. The client's q-values pick the encoding, and
+ties go to the order in XUTIL_COMPRESSION_ENCODINGS. Responses under the size threshold,
+non-text media types and responses that already carry a Content-Encoding go out
+untouched.
+
+Complete bodies are compressed in one go, in a worker thread once they are large enough
+to stall the event loop. Streamed bodies are buffered only up to the threshold; after
+that each chunk is compressed and flushed as it arrives, so clients still see
+incremental output. Compressed responses get `Vary: Accept-Encoding` and a weak ETag,
+since the bytes differ from the identity representation.
+"""
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+GZIP = "gzip"
+BROTLI = "br"
+ZSTD = "zstd"
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml", "application/yaml", "application/x-yaml",
+                      "application/javascript", "application/x-ndjson", "+json", "+xml")
+# Complete bodies at least this large are compressed off the event loop
+THREAD_MIN_BYTES = 256 * 1024
+
+class Compressor:
+    """Incremental compressor: compress() returns whatever output is ready, finish() the rest."""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == ZSTD:
+            self._zstd = zstandard.ZstdCompressor(level=level).compressobj()
+        elif encoding == BROTLI:
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self.encoding == ZSTD:
+            out = self._zstd.compress(data)
+            return out + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if flush else out
+        if self.encoding == BROTLI:
+            out = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self.encoding == ZSTD:
+            return self._zstd.flush()
+        if self.encoding == BROTLI:
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+def compress_body(encoding: str, level: int, body: bytes) -> bytes:
+    compressor = Compressor(encoding, level)
+    return compressor.compress(body) + compressor.finish()
+
+def available_encodings(preference: Sequence[str]) -> List[str]:
+    installed = {GZIP: True, BROTLI: brotli is not None, ZSTD: zstandard is not None}
+    return [encoding for encoding in preference if installed.get(encoding)]
+
+def negotiate(accept_encoding: str, supported: Sequence[str]) -> Optional[str]:
+    """Pick the supported encoding with the highest q-value; ties go to the order of `supported`."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if vary is None:
+        headers["vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, encodings: Sequence[str], levels: Dict[str, int], min_size: int):
+        self.app = app
+        self.encodings = available_encodings(encodings)
+        self.levels = levels
+        self.min_size = min_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept, self.encodings) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressedResponse(encoding, self.levels[encoding], self.min_size, send)
+        await self.app(scope, receive, responder.wrapped_send)
+
+class _CompressedResponse:
+    """Per-request state: decides on the first body message, then streams or passes through."""
+
+    def __init__(self, encoding: str, level: int, min_size: int, send: Send):
+        self.encoding = encoding
+        self.level = level
+        self.min_size = min_size
+        self.send = send
+        self.start: Optional[Message] = None
+        self.buffered: List[bytes] = []
+        self.buffered_size = 0
+        self.compressor: Optional[Compressor] = None
+        self.passthrough = False
+
+    def _eligible(self, message: Message) -> bool:
+        headers = MutableHeaders(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return any(marker in content_type for marker in COMPRESSIBLE_TYPES)
+
+    def _identity_start(self) -> Message:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        _add_vary(headers)
+        return {**self.start, "headers": headers.raw}
+
+    def _compressed_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(raw=list(self.start["headers"]))
+        headers["content-encoding"] = self.encoding
+        if content_length is None:
+            del headers["content-length"]
+        else:
+            headers["content-length"] = str(content_length)
+        _add_vary(headers)
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return {**self.start, "headers": headers.raw}
+
+    async def wrapped_send(self, message: Message) -> None:
+        if self.passthrough:
+            await self.send(message)
+            return
+        if message["type"] == "http.response.start":
+            if self._eligible(message):
+                self.start = message
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.compressor is not None:
+            chunk = self.compressor.compress(body, flush=True) if more_body else self.compressor.compress(body) + self.compressor.finish()
+            await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+            return
+
+        self.buffered.append(body)
+        self.buffered_size += len(body)
+        if not more_body:
+            await self._send_complete(b"".join(self.buffered))
+            return
+        if self.buffered_size >= self.min_size:
+            # Streaming: commit to compression and flush what we have so far
+            self.compressor = Compressor(self.encoding, self.level)
+            await self.send(self._compressed_start(content_length=None))
+            await self.send({"type": "http.response.body", "body": self.compressor.compress(b"".join(self.buffered), flush=True), "more_body": True})
+            self.buffered = []
+
+    async def _send_complete(self, body: bytes) -> None:
+        if len(body) < self.min_size:
+            await self.send(self._identity_start())
+            await self.send({"type": "http.response.body", "body": body})
+            return
+        if len(body) >= THREAD_MIN_BYTES:
+            compressed = await run_in_threadpool(compress_body, self.encoding, self.level, body)
+        else:
+            compressed = compress_body(self.encoding, self.level, body)
+        await self.send(self._compressed_start(content_length=len(compressed)))
+        await self.send({"type": "http.response.body", "body": compressed})
+
+def parse_encodings(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip().lower() for item in value.split(",") if item.strip())
@@ -0,0 +1,78 @@
+from functools import lru_cache
+from typing import Literal, Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class Settings(BaseSettings):
+    """Application settings, read from XUTIL_* environment variables."""
+
+    model_config = SettingsConfigDict(env_prefix="XUTIL_", env_file=".env", extra="ignore")
+
+    lazy_routers: bool = Field(False, description="Register routers from the manifest and import them on first use")
+    background_router_loading: bool = Field(True, description="In lazy mode, import the remaining routers in a background task after startup")
+    router_manifest_scan: bool = Field(False, description="Development only: scan app/routers at startup and include routers missing from the manifest")
+    precompiled_openapi: bool = Field(True, description="Serve /openapi.json from app/build when the artifact exists")
+    batch_max_operations: int = Field(100, ge=1, description="Maximum operations accepted by /api/batch")
+    batch_concurrency: int = Field(8, ge=1, description="Batch operations allowed to run at the same time")
+    result_cache_enabled: bool = Field(True, description="Cache responses of deterministic tool endpoints")
+    result_cache_max_entries: int = Field(10000, ge=1, description="Maximum cached responses")
+    result_cache_max_bytes: int = Field(64 * 1024 * 1024, ge=0, description="Byte budget for all cached responses")
+    result_cache_max_entry_bytes: int = Field(1024 * 1024, ge=0, description="Responses larger than this are not cached")
+    result_cache_max_body_bytes: int = Field(256 * 1024, ge=0, description="Requests with larger bodies bypass the cache")
+    result_cache_max_age: int = Field(3600, ge=0, description="Cache-Control max-age sent with cacheable responses")
+    executor_inline_max_bytes: int = Field(16 * 1024, ge=0, description="Inputs up to this size run inline on the event loop")
+    executor_process_min_bytes: int = Field(1024 * 1024, ge=0, description="Inputs from this size run in the process pool")
+    executor_thread_workers: int = Field(4, ge=0, description="Thread pool size for medium inputs (0 runs them inline)")
+    executor_process_workers: int = Field(2, ge=0, description="Process pool size for large inputs (0 uses the thread pool)")
+    metrics_enabled: bool = Field(True, description="Record per-route metrics for /api/metrics")
+    profiling_enabled: bool = Field(False, description="Profile requests that send the X-Profile header")
+    profiling_dir: str = Field("profiles", description="Directory that captured .prof files are written to")
+    profiling_token: Optional[str] = Field(None, description="When set, the X-Profile header must carry this value")
+    profiling_max_files: int = Field(100, ge=1, description="Oldest captures are deleted beyond this many")
+    default_max_body_bytes: int = Field(2 * 1024 * 1024, ge=0, description="Body limit for routes that do not declare MAX_BODY_BYTES")
+    compression_enabled: bool = Field(True, description="Compress responses for clients that send Accept-Encoding")
+    compression_encodings: str = Field("zstd,br,gzip", description="Offered encodings in preference order; zstd and br need zstandard and brotli installed")
+    compression_min_bytes: int = Field(1024, ge=0, description="Responses smaller than this are sent uncompressed")
+    compression_gzip_level: int = Field(6, ge=1, le=9, description="zlib level for gzip")
+    compression_brotli_quality: int = Field(4, ge=0, le=11, description="Brotli quality")
+    compression_zstd_level: int = Field(3, ge=1, le=22, description="zstd level")
+    upload_max_compression_ratio: int = Field(200, ge=1, description="Reject compressed uploads that inflate more than this many times")
+    admission_enabled: bool = Field(True, description="Limit concurrent requests per route cost class and shed load with 503")
+    admission_text_concurrency: int = Field(32, ge=1, description="Concurrent requests to text tool routes")
+    admission_file_conversion_concurrency: int = Field(4, ge=1, description="Concurrent requests to CSV/XML/YAML conversion routes")
+    admission_codegen_concurrency: int = Field(4, ge=1, description="Concurrent requests to code generation routes")
+    admission_queue_size: int = Field(16, ge=0, description="Requests allowed to wait per cost class once it is at its limit")
+    admission_queue_timeout: float = Field(10.0, gt=0, description="Seconds a queued request waits for a slot before getting 503")
+    admission_max_loop_lag: float = Field(0.5, ge=0, description="Shed non-trivial requests while event loop lag exceeds this many seconds; 0 disables")
+    admission_retry_after: int = Field(2, ge=1, description="Retry-After seconds sent when a queue is full or times out")
+    prefork_workers: int = Field(0, ge=0, description="Workers forked by app.core.prefork; 0 means one per CPU")
+    prefork_max_requests: int = Field(10000, ge=0, description="Recycle a prefork worker after this many requests; 0 disables")
+    prefork_max_requests_jitter: int = Field(1000, ge=0, description="Random extra requests per worker so recycling is staggered")
+    prefork_max_rss_mb: int = Field(1024, ge=0, description="Recycle a prefork worker once its RSS exceeds this many MB; 0 disables")
+    prefork_report_interval: float = Field(60.0, ge=0, description="Seconds between per-worker memory reports; 0 disables")
+    prefork_graceful_timeout: float = Field(30.0, gt=0, description="Seconds workers get to finish in-flight requests on shutdown")
+    log_level: str = Field("INFO", description="Root log level")
+    log_format: Literal["json", "text"] = Field("json", description="json writes one object per line; text is for local runs")
+    log_queue_size: int = Field(10000, ge=1, description="Log records buffered for the writer thread; more are dropped, never waited on")
+    log_trivial_sample_rate: float = Field(0.1, ge=0, le=1, description="Share of access records kept for trivial routes")
+    log_slow_request_seconds: float = Field(1.0, ge=0, description="Requests slower than this are always access-logged")
+    warmup_enabled: bool = Field(True, description="Replay each router's WARMUP_REQUESTS after startup; /api/ready waits for it")
+    warmup_process_pool: bool = Field(True, description="Spawn the crud process pool during warm-up instead of on the first big upload")
+    warmup_process_pool_timeout: float = Field(60.0, gt=0, description="Seconds warm-up waits for every process worker; /api/ready stays 503 if some never start")
+    live_debounce_ms: int = Field(150, ge=0, description="Default wait before a live WebSocket conversion runs, so keystroke bursts collapse into one call")
+    live_max_debounce_ms: int = Field(2000, ge=0, description="Upper bound for a client-requested debounce")
+    live_max_channels: int = Field(16, ge=1, description="Channels with a pending or running call per WebSocket connection")
+    live_max_message_bytes: int = Field(2 * 1024 * 1024, ge=1, description="Largest live WebSocket message accepted")
+    json_csv_max_rows: int = Field(100_000, ge=1, description="Rows JSON to CSV may produce when exploding lists; larger requests are rejected or use their on_overflow strategy")
+    json_csv_stream_max_rows: int = Field(5_000_000, ge=1, description="Rows the streaming JSON to CSV route may produce; rows are spooled to disk, so this bounds disk and time rather than memory")
+    jobs_dir: str = Field("jobs", description="Directory holding job inputs, results and status; share it between workers")
+    jobs_max_input_bytes: int = Field(100 * 1024 * 1024, ge=1, description="Largest decompressed upload accepted by the job API")
+    jobs_ttl_seconds: float = Field(3600.0, gt=0, description="Seconds a finished job's result is kept before eviction")
+    jobs_concurrency: int = Field(2, ge=1, description="Jobs converting at once per worker")
+    jobs_max_queued: int = Field(64, ge=1, description="Jobs waiting per worker before submissions get 503")
+    jobs_sweep_interval: float = Field(60.0, gt=0, description="Seconds between sweeps for expired jobs")
+    startup_budget_ms: Optional[float] = Field(None, description="Warn when app startup exceeds this many milliseconds")
+
+@lru_cache
+def get_settings() -> Settings:
+    return Settings()
@@ -0,0 +1,227 @@
+"""
+Streaming decompression of compressed uploads, bounded by decompressed size and ratio.
+
+Two forms are accepted:
+
+* A request body sent with `Content-Encoding: gzip|zstd|bzip2` (any route).
+  `RequestDecompressionMiddleware` inflates it as it streams in, so routes see plain
+  bytes. The route's body limit applies to the decompressed bytes.
+* A multipart file whose name ends in .gz/.zst/.bz2, or whose part carries a
+  Content-Encoding header. The file converters read it through `iter_upload` or
+  `read_upload`, which strip the suffix and apply the converter's file size limit to
+  the decompressed bytes.
+
+Both paths reject output that grows past `max_ratio` times the compressed input (once
+it is over 1MB), which stops decompression bombs before they allocate. zstd needs the
+`zstandard` package from requirements.txt; without it zstd bodies and .zst uploads
+are rejected and startup logs a warning.
+"""
+import bz2
+import zlib
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .body_limit import RequestTooLarge
+from .compression import GZIP, ZSTD
+from .config import get_settings
+from .serialization import AppJSONResponse
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+BZIP2 = "bzip2"
+ENCODING_ALIASES = {"gzip": GZIP, "x-gzip": GZIP, "zstd": ZSTD, "bzip2": BZIP2, "x-bzip2": BZIP2}
+SUFFIX_ENCODINGS = {".gz": GZIP, ".gzip": GZIP, ".zst": ZSTD, ".zstd": ZSTD, ".bz2": BZIP2}
+# The ratio guard only applies past this much output, so small repetitive files pass
+RATIO_GUARD_MIN_BYTES = 1024 * 1024
+# zstd has no output bound per call, so feed it small slices to keep each step bounded
+ZSTD_FEED_BYTES = 1024
+OUTPUT_STEP_BYTES = 256 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+class DecompressionError(ValueError):
+    pass
+
+class DecompressionLimitError(DecompressionError):
+    pass
+
+def supported_encodings() -> List[str]:
+    return [GZIP, BZIP2] + ([ZSTD] if zstandard is not None else [])
+
+class StreamDecompressor:
+    """Feed compressed chunks, get decompressed chunks; raises once limits are crossed."""
+
+    def __init__(self, encoding: str, max_output: int, max_ratio: int):
+        if encoding == ZSTD and zstandard is None:
+            raise DecompressionError("zstd uploads are not supported on this server")
+        self.encoding = encoding
+        self.max_output = max_output
+        self.max_ratio = max_ratio
+        self.consumed = 0
+        self.produced = 0
+        self._decoder = self._new_decoder()
+
+    def _new_decoder(self):
+        if self.encoding == GZIP:
+            return zlib.decompressobj(wbits=47)  # 32 + 15: accept gzip or zlib headers
+        if self.encoding == BZIP2:
+            return bz2.BZ2Decompressor()
+        return zstandard.ZstdDecompressor().decompressobj()
+
+    def _account(self, output: bytes) -> bytes:
+        self.produced += len(output)
+        if self.produced > self.max_output:
+            raise DecompressionLimitError(f"Decompressed size exceeds {self.max_output / (1024 * 1024):.0f}MB limit")
+        if self.produced > RATIO_GUARD_MIN_BYTES and self.produced > self.max_ratio * max(self.consumed, 1):
+            raise DecompressionLimitError(f"Compression ratio exceeds {self.max_ratio}:1")
+        return output
+
+    def feed(self, data: bytes) -> List[bytes]:
+        try:
+            return list(self._feed(data))
+        except (zlib.error, OSError, EOFError) as e:
+            raise DecompressionError(f"Could not decompress {self.encoding} data: {e}") from e
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise DecompressionError(f"Could not decompress {self.encoding} data: {e}") from e
+            raise
+
+    def _feed(self, data: bytes):
+        if self.encoding == ZSTD:
+            for start in range(0, len(data), ZSTD_FEED_BYTES):
+                piece = data[start:start + ZSTD_FEED_BYTES]
+                self.consumed += len(piece)
+                yield from self._decode(piece)
+        else:
+            self.consumed += len(data)
+            yield from self._decode(data)
+
+    def _decode(self, pending: bytes):
+        while True:
+            if self._decoder.eof:
+                # Concatenated members (pigz, pbzip2, multi-frame zstd): decode the rest with a fresh decoder
+                pending = self._decoder.unused_data + pending
+                if not pending:
+                    return
+                self._decoder = self._new_decoder()
+            if self.encoding == GZIP:
+                out = self._decoder.decompress(pending, OUTPUT_STEP_BYTES)
+                pending = self._decoder.unconsumed_tail
+            elif self.encoding == BZIP2:
+                out = self._decoder.decompress(pending, OUTPUT_STEP_BYTES)
+                pending = b""
+            else:
+                out = self._decoder.decompress(pending)
+                pending = b""
+            if out:
+                yield self._account(out)
+            elif not pending and not self._decoder.eof:
+                return
+
+    def finish(self) -> None:
+        """Raise if the stream ended before the compressed data was complete."""
+        if not self._decoder.eof:
+            raise DecompressionError(f"Truncated {self.encoding} data")
+
+class UploadContent(NamedTuple):
+    filename: str  # compression suffix removed, for the converters' extension checks
+    encoding: Optional[str]
+    content: bytes
+
+def upload_encoding(file: UploadFile) -> Tuple[str, Optional[str]]:
+    """Return the logical filename and the compression of an uploaded file, if any."""
+    filename = file.filename or ""
+    declared = ENCODING_ALIASES.get((file.headers.get("content-encoding") or "").strip().lower())
+    lowered = filename.lower()
+    for suffix, encoding in SUFFIX_ENCODINGS.items():
+        if lowered.endswith(suffix):
+            return filename[:-len(suffix)], encoding
+    return filename, declared
+
+async def iter_upload(file: UploadFile, max_bytes: int, max_ratio: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Yield the decompressed content of an upload chunk by chunk.
+
+    Raises:
+        HTTPException: 400 if the file is over `max_bytes` once decompressed, trips the
+            ratio guard, or is not valid compressed data
+    """
+    _, encoding = upload_encoding(file)
+    max_ratio = max_ratio or get_settings().upload_max_compression_ratio
+    try:
+        decompressor = StreamDecompressor(encoding, max_bytes, max_ratio) if encoding else None
+        size = 0
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if decompressor is None:
+                size += len(chunk)
+                if size > max_bytes:
+                    raise DecompressionLimitError(f"File size exceeds {max_bytes / (1024 * 1024):.0f}MB limit")
+                yield chunk
+                continue
+            for out in decompressor.feed(chunk):
+                if out:
+                    yield out
+        if decompressor is not None:
+            decompressor.finish()
+    except DecompressionError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+async def read_upload(file: UploadFile, max_bytes: int, max_ratio: Optional[int] = None) -> UploadContent:
+    """Read a whole upload, decompressing it when it is .gz/.zst/.bz2 or carries a Content-Encoding."""
+    filename, encoding = upload_encoding(file)
+    chunks = [chunk async for chunk in iter_upload(file, max_bytes, max_ratio)]
+    return UploadContent(filename, encoding, b"".join(chunks))
+
+class RequestDecompressionMiddleware:
+    def __init__(self, app: ASGIApp, default_limit: int, limits: Optional[Dict[str, int]] = None, max_ratio: int = 200):
+        self.app = app
+        self.default_limit = default_limit
+        self.limits = limits or {}
+        self.max_ratio = max_ratio
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        declared = Headers(scope=scope).get("content-encoding", "").strip().lower()
+        if not declared or declared == "identity":
+            await self.app(scope, receive, send)
+            return
+        encoding = ENCODING_ALIASES.get(declared)
+        if encoding not in supported_encodings():
+            response = AppJSONResponse({"detail": f"Unsupported Content-Encoding: {declared}"}, status_code=415)
+            await response(scope, receive, send)
+            return
+
+        limit = self.limits.get(scope["path"], self.default_limit)
+        decompressor = StreamDecompressor(encoding, limit, self.max_ratio)
+        pending: List[bytes] = []
+        finished = False
+
+        async def decompressing_receive() -> Message:
+            nonlocal finished
+            while not pending and not finished:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return message
+                try:
+                    pending.extend(out for out in decompressor.feed(message.get("body", b"")) if out)
+                    if not message.get("more_body", False):
+                        decompressor.finish()
+                        finished = True
+                except DecompressionLimitError as e:
+                    raise RequestTooLarge(limit, detail=str(e))
+                except DecompressionError as e:
+                    raise HTTPException(status_code=400, detail=str(e))
+            body = pending.pop(0) if pending else b""
+            return {"type": "http.request", "body": body, "more_body": bool(pending) or not finished}
+
+        # The body routes see is the decompressed one, so drop the headers describing the wire form
+        scope["headers"] = [(k, v) for k, v in scope["headers"] if k not in (b"content-encoding", b"content-length")]
+        await self.app(scope, decompressing_receive, send)
@@ -0,0 +1,214 @@
+"""
+Runs crud functions off the event loop, picking the execution mode by input size.
+
+Small inputs run inline (a thread hop would cost more than the work), medium inputs go
+to a thread pool, and large inputs go to a process pool so parsing a 10MB upload does
+not hold the GIL that the event loop needs. Functions sent to the process pool must be
+importable module-level callables with picklable arguments and results.
+"""
+import asyncio
+import contextvars
+import functools
+import importlib
+import multiprocessing
+import os
+import pkgutil
+import time
+from contextvars import ContextVar
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from .config import get_settings
+from .serialization import json_format
+from .structured_logging import request_id
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+# Crud packages whose heavy imports (pandas, lxml, yaml) process workers load when they start
+PROCESS_PRELOAD_PACKAGES = ("app.crud.converters",)
+
+# Overrides size-based selection for the current request (profiling forces INLINE)
+forced_mode: ContextVar[Optional[str]] = ContextVar("crud_forced_mode", default=None)
+
+# Request context crud code reads; threads copy the whole context, process workers get these values set
+FORWARDED_CONTEXT: Tuple[ContextVar, ...] = (json_format, request_id)
+
+def _preload_worker() -> None:
+    for package_name in PROCESS_PRELOAD_PACKAGES:
+        package = importlib.import_module(package_name)
+        for module in pkgutil.iter_modules(package.__path__):
+            importlib.import_module(f"{package_name}.{module.name}")
+
+# How long a prestart ping keeps its worker busy, so one warm worker can't answer a whole round
+PING_HOLD_SECONDS = 0.01
+
+def _worker_ping() -> int:
+    time.sleep(PING_HOLD_SECONDS)
+    return os.getpid()
+
+def _call_in_worker(func: Callable, args: Tuple, kwargs: Dict[str, Any], context: Tuple = ()) -> Tuple[str, Any]:
+    # Every process call sets all forwarded values, so nothing leaks from the previous request
+    for var, value in zip(FORWARDED_CONTEXT, context):
+        var.set(value)
+    # HTTPException does not survive pickling, so ship it back as plain data
+    try:
+        return "ok", func(*args, **kwargs)
+    except HTTPException as e:
+        return "http_error", (e.status_code, e.detail, e.headers)
+
+class PoolStats:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.submitted = 0
+        self.completed = 0
+        self.max_queue_depth = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+class CrudExecutor:
+    def __init__(self, inline_max_bytes: int, process_min_bytes: int, thread_workers: int, process_workers: int):
+        self.inline_max_bytes = inline_max_bytes
+        self.process_min_bytes = process_min_bytes
+        self.inline_calls = 0
+        self.thread_stats = PoolStats(thread_workers)
+        self.process_stats = PoolStats(process_workers)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def mode_for(self, size: int) -> str:
+        if size <= self.inline_max_bytes:
+            return INLINE
+        if self.process_stats.workers > 0 and size >= self.process_min_bytes:
+            return PROCESS
+        return THREAD if self.thread_stats.workers > 0 else INLINE
+
+    def _pool(self, mode: str) -> Executor:
+        # Pools start on first use so importing the app never forks or spawns
+        if mode == PROCESS:
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_stats.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_preload_worker,
+                )
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.thread_stats.workers, thread_name_prefix="crud")
+        return self._thread_pool
+
+    async def run(self, func: Callable, *args: Any, size: int, mode: Optional[str] = None, **kwargs: Any) -> Any:
+        mode = mode or forced_mode.get() or self.mode_for(size)
+        if mode == INLINE:
+            self.inline_calls += 1
+            return func(*args, **kwargs)
+
+        stats = self.process_stats if mode == PROCESS else self.thread_stats
+        stats.submitted += 1
+        stats.max_queue_depth = max(stats.max_queue_depth, stats.queue_depth)
+        pool = self._pool(mode)
+        try:
+            loop = asyncio.get_running_loop()
+            if mode == THREAD:
+                # Threads see the request's context vars (correlation id, JSON format)
+                call = functools.partial(contextvars.copy_context().run, _call_in_worker, func, args, kwargs)
+            else:
+                context = tuple(var.get() for var in FORWARDED_CONTEXT)
+                call = functools.partial(_call_in_worker, func, args, kwargs, context)
+            status, value = await loop.run_in_executor(pool, call)
+        except BrokenProcessPool:
+            # A worker died (OOM kill, segfault); the pool is unusable, so start a fresh one next call
+            self._discard_process_pool(pool)
+            raise
+        finally:
+            stats.completed += 1
+        if status == "http_error":
+            status_code, detail, headers = value
+            raise HTTPException(status_code=status_code, detail=detail, headers=headers)
+        return value
+
+    def _discard_process_pool(self, pool: Executor) -> None:
+        # Concurrent calls all see the same broken pool; only the first replaces it
+        if pool is self._process_pool:
+            self._process_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def prestart(self, timeout: float = 60.0) -> int:
+        """
+        Spawn the process pool now and wait until every worker has finished its imports.
+
+        Returns how many distinct workers answered, which is below the configured count
+        only if `timeout` ran out first.
+        """
+        workers = self.process_stats.workers
+        if workers == 0:
+            return 0
+        loop = asyncio.get_running_loop()
+        pool = self._pool(PROCESS)
+        deadline = loop.time() + timeout
+        answered = set()
+        # A worker that finished its imports first can answer a whole round of pings while
+        # another is still importing, so keep pinging until each one has answered itself
+        while len(answered) < workers and loop.time() < deadline:
+            answered.update(await asyncio.gather(*(loop.run_in_executor(pool, _worker_ping) for _ in range(workers))))
+        return len(answered)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inline_max_bytes": self.inline_max_bytes,
+            "process_min_bytes": self.process_min_bytes,
+            "inline_calls": self.inline_calls,
+            "thread_pool": self.thread_stats.as_dict(),
+            "process_pool": self.process_stats.as_dict(),
+        }
+
+    def metric_families(self) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        pools = {THREAD: self.thread_stats, PROCESS: self.process_stats}
+        families = [("xutil_executor_inline_calls_total", "counter", "Crud calls run inline on the event loop", [({}, self.inline_calls)])]
+        for field, kind, help_text in (
+            ("submitted", "counter", "Crud calls submitted to a pool"),
+            ("in_flight", "gauge", "Crud calls running or waiting in a pool"),
+            ("queue_depth", "gauge", "Crud calls waiting for a free pool worker"),
+            ("max_queue_depth", "gauge", "Highest queue depth seen since startup"),
+            ("workers", "gauge", "Configured pool size"),
+        ):
+            name = f"xutil_executor_{field}_total" if kind == "counter" else f"xutil_executor_{field}"
+            families.append((name, kind, help_text, [({"pool": mode}, getattr(stats, field)) for mode, stats in pools.items()]))
+        return families
+
+    def shutdown(self) -> None:
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._thread_pool = None
+        self._process_pool = None
+
+_settings = get_settings()
+crud_executor = CrudExecutor(
+    inline_max_bytes=_settings.executor_inline_max_bytes,
+    process_min_bytes=_settings.executor_process_min_bytes,
+    thread_workers=_settings.executor_thread_workers,
+    process_workers=_settings.executor_process_workers,
+)
+
+async def run_crud(func: Callable, *args: Any, size: int, **kwargs: Any) -> Any:
+    """Run a crud function inline, in the thread pool or in the process pool depending on input size."""
+    return await crud_executor.run(func, *args, size=size, **kwargs)
@@ -0,0 +1,294 @@
+"""
+Background conversion jobs with an on-disk result store.
+
+A submitted job gets a directory `<jobs_dir>/<id>/` holding the uploaded input, the
+converted result and `meta.json`. Status lives only on disk and is written atomically,
+so with several workers (uvicorn --workers, app.core.prefork) any worker can answer a
+status poll or serve a download, whichever worker ran the job.
+
+Each worker runs up to `concurrency` jobs from its own bounded queue. The conversion
+goes through the crud executor: big inputs run in the process pool, where
+`execute_job` reads the input file and writes the result file itself, so no large
+payload is pickled between processes. Progress is reported as coarse stages (reading,
+converting, writing), since the converters don't report progress from inside.
+
+Finished jobs expire `ttl` seconds after they complete. A sweeper removes expired
+directories, and also jobs that never finished within the TTL. Jobs never stay
+`queued` or `running` after their worker is gone: shutdown marks this worker's
+unfinished jobs failed, and the sweeper (which also runs at startup) fails unfinished
+jobs whose worker process on this host no longer exists, e.g. after a crash.
+"""
+import asyncio
+import logging
+import os
+import re
+import shutil
+import socket
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import orjson
+from fastapi import HTTPException
+from .config import get_settings
+from .executor import run_crud
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+META_FILE = "meta.json"
+VALID_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+RESTARTED_ERROR = "Server restarted before the job finished; submit it again"
+WORKER_HOST = socket.gethostname()
+
+def worker_id() -> str:
+    return f"{WORKER_HOST}:{os.getpid()}"
+
+def worker_gone(worker: Optional[str]) -> bool:
+    """True if `worker` is a process on this host that no longer exists; other hosts can't be checked."""
+    host, _, pid = (worker or "").rpartition(":")
+    if host != WORKER_HOST or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+class JobStore:
+    def __init__(self, directory: str, ttl: float):
+        self.root = Path(directory)
+        self.ttl = ttl
+
+    def job_dir(self, job_id: str) -> Path:
+        if not VALID_JOB_ID.match(job_id):
+            raise KeyError(job_id)
+        return self.root / job_id
+
+    def new_job_dir(self) -> Path:
+        directory = self.root / uuid.uuid4().hex
+        directory.mkdir(parents=True)
+        return directory
+
+    @staticmethod
+    def write_meta(directory: Path, meta: Dict[str, Any]) -> None:
+        # Readers in other workers must never see a half-written file
+        tmp = directory / f".{META_FILE}.{os.getpid()}"
+        tmp.write_bytes(orjson.dumps(meta))
+        os.replace(tmp, directory / META_FILE)
+
+    @staticmethod
+    def update(directory: Path, **changes: Any) -> Optional[Dict[str, Any]]:
+        """Merge `changes` into a job's meta; returns None if the job was deleted meanwhile."""
+        try:
+            meta = orjson.loads((directory / META_FILE).read_bytes())
+        except FileNotFoundError:
+            return None
+        meta.update(changes)
+        try:
+            JobStore.write_meta(directory, meta)
+        except FileNotFoundError:
+            return None
+        return meta
+
+    @staticmethod
+    def fail_unfinished(directory: Path, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a queued or running job failed because its worker stopped; False if it had already finished."""
+        if meta is None:
+            try:
+                meta = orjson.loads((directory / META_FILE).read_bytes())
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                return False
+        if meta["status"] in FINISHED:
+            return False
+        return JobStore.update(
+            directory, status=FAILED, stage=FAILED, progress=1.0, finished_at=time.time(),
+            error=RESTARTED_ERROR, status_code=503,
+        ) is not None
+
+    def read(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            meta = orjson.loads((self.job_dir(job_id) / META_FILE).read_bytes())
+        except (KeyError, FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        return None if self.expired(meta) else meta
+
+    def expired(self, meta: Dict[str, Any], now: Optional[float] = None) -> bool:
+        now = now or time.time()
+        if meta["status"] in FINISHED:
+            return now > meta["finished_at"] + self.ttl
+        # Unfinished past the TTL: its worker is gone
+        return now > meta["created_at"] + self.ttl
+
+    def delete(self, job_id: str) -> bool:
+        try:
+            directory = self.job_dir(job_id)
+        except KeyError:
+            return False
+        if not directory.exists():
+            return False
+        shutil.rmtree(directory, ignore_errors=True)
+        return True
+
+    def sweep(self) -> Tuple[int, int]:
+        """Remove expired jobs and fail orphaned ones; returns (removed, failed)."""
+        removed = failed = 0
+        if not self.root.exists():
+            return 0, 0
+        now = time.time()
+        for directory in self.root.iterdir():
+            try:
+                meta = orjson.loads((directory / META_FILE).read_bytes())
+            except (NotADirectoryError, FileNotFoundError, orjson.JSONDecodeError):
+                # Directory without readable meta: only remove once it is clearly abandoned
+                if directory.is_dir() and now - directory.stat().st_mtime > self.ttl:
+                    shutil.rmtree(directory, ignore_errors=True)
+                    removed += 1
+                continue
+            if self.expired(meta, now):
+                shutil.rmtree(directory, ignore_errors=True)
+                removed += 1
+            elif meta["status"] not in FINISHED and worker_gone(meta.get("worker")):
+                failed += self.fail_unfinished(directory, meta)
+        return removed, failed
+
+def execute_job(func: Callable, directory: str, input_name: str, result_name: str, options: Dict[str, Any]) -> int:
+    """Run a conversion from the input file to the result file; may run in a pool process."""
+    path = Path(directory)
+    JobStore.update(path, stage="reading", progress=0.05)
+    contents = (path / input_name).read_bytes()
+    JobStore.update(path, stage="converting", progress=0.15)
+    result = func(contents, **options)
+    # Converters return a ConversionResponse whose `result` is the converted document
+    text = getattr(result, "result", result)
+    data = text.encode("utf-8") if isinstance(text, str) else orjson.dumps(text)
+    if JobStore.update(path, stage="writing", progress=0.9) is None:
+        return 0  # Deleted while converting
+    tmp = path / f".{result_name}.tmp"
+    tmp.write_bytes(data)
+    os.replace(tmp, path / result_name)
+    return len(data)
+
+class JobManager:
+    def __init__(self, store: JobStore, concurrency: int, max_queued: int, sweep_interval: float):
+        self.store = store
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self.sweep_interval = sweep_interval
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+        self.running = 0
+        self.active: Set[Path] = set()  # Queued or running in this worker
+        self.finished: Dict[str, int] = {SUCCEEDED: 0, FAILED: 0}
+
+    def start(self) -> None:
+        if self.tasks:
+            return
+        self.queue = asyncio.Queue(self.max_queued)
+        self.tasks = [asyncio.create_task(self._runner()) for _ in range(self.concurrency)]
+        self.tasks.append(asyncio.create_task(self._sweeper()))
+
+    def stop(self) -> None:
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+        # Nothing will pick these up again, so fail them now instead of leaving pollers waiting
+        failed = sum(self.store.fail_unfinished(directory) for directory in self.active)
+        self.active.clear()
+        if failed:
+            logger.warning("Marked %d unfinished jobs failed on shutdown", failed)
+
+    def accepts(self) -> bool:
+        return self.queue is None or not self.queue.full()
+
+    def submit(self, tool: str, func: Callable, input_path: Path, result_name: str, media_type: str,
+               options: Dict[str, Any], input_bytes: int) -> Dict[str, Any]:
+        """
+        Queue a job whose input is already written to `input_path` inside a `new_job_dir()`.
+
+        Raises:
+            HTTPException: 503 if this worker's job queue is full
+        """
+        if self.queue is None:
+            self.start()
+        if self.queue.full():
+            raise HTTPException(status_code=503, detail="Too many queued jobs, retry later", headers={"Retry-After": "10"})
+        meta = {
+            "id": input_path.parent.name, "tool": tool, "status": QUEUED, "stage": QUEUED, "progress": 0.0,
+            "created_at": time.time(), "started_at": None, "finished_at": None, "error": None, "status_code": None,
+            "input_bytes": input_bytes, "result_bytes": None, "result_name": result_name, "media_type": media_type,
+            "worker": worker_id(),
+        }
+        directory = input_path.parent
+        self.store.write_meta(directory, meta)
+        self.active.add(directory)
+        self.queue.put_nowait((directory, func, input_path.name, result_name, options, input_bytes))
+        return meta
+
+    async def _runner(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run(*job)
+            except Exception:
+                logger.exception("Job runner failed")
+            finally:
+                self.active.discard(job[0])
+                self.queue.task_done()
+
+    async def _run(self, directory: Path, func: Callable, input_name: str, result_name: str, options: Dict[str, Any], size: int) -> None:
+        if JobStore.update(directory, status=RUNNING, stage="starting", started_at=time.time()) is None:
+            return  # Deleted while queued
+        self.running += 1
+        status, error, status_code, result_bytes = SUCCEEDED, None, None, None
+        try:
+            result_bytes = await run_crud(execute_job, func, str(directory), input_name, result_name, options, size=size)
+        except HTTPException as e:
+            status, error, status_code = FAILED, e.detail, e.status_code
+        except ValueError as e:
+            status, error, status_code = FAILED, str(e), 400
+        except Exception as e:
+            logger.exception("Job %s failed", directory.name)
+            status, error, status_code = FAILED, f"Conversion failed: {e}", 500
+        finally:
+            self.running -= 1
+        self.finished[status] += 1
+        JobStore.update(
+            directory, status=status, stage=status, progress=1.0, finished_at=time.time(),
+            error=error, status_code=status_code, result_bytes=result_bytes,
+        )
+        logger.info("Job %s %s", directory.name, status)
+
+    async def _sweeper(self) -> None:
+        while True:
+            try:
+                removed, failed = await asyncio.to_thread(self.store.sweep)
+                if removed:
+                    logger.info("Evicted %d expired jobs", removed)
+                if failed:
+                    logger.warning("Marked %d jobs failed whose worker exited", failed)
+            except Exception:
+                logger.exception("Job sweep failed")
+            await asyncio.sleep(self.sweep_interval)
+
+    def metric_families(self) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        queued = self.queue.qsize() if self.queue is not None else 0
+        return [
+            ("xutil_jobs_queued", "gauge", "Jobs waiting in this worker's queue", [({}, queued)]),
+            ("xutil_jobs_running", "gauge", "Jobs converting in this worker", [({}, self.running)]),
+            ("xutil_jobs_finished_total", "counter", "Jobs finished by this worker", [({"status": s}, n) for s, n in self.finished.items()]),
+        ]
+
+_settings = get_settings()
+job_manager = JobManager(
+    JobStore(_settings.jobs_dir, _settings.jobs_ttl_seconds),
+    concurrency=_settings.jobs_concurrency,
+    max_queued=_settings.jobs_max_queued,
+    sweep_interval=_settings.jobs_sweep_interval,
+)
@@ -0,0 +1,156 @@
+"""
+Per-route request metrics in Prometheus text format, served from /api/metrics.
+
+MetricsMiddleware records latency, request and response body sizes, and status codes,
+labelled by the matched route template (not the raw path) so label cardinality stays
+bounded. Other subsystems publish gauges and counters via `metrics.register_collector`.
+Every worker process keeps its own registry, so scrape each worker or aggregate with
+Prometheus.
+"""
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 10485760, 52428800, 209715200)
+UNMATCHED_ROUTE = "<unmatched>"
+# Middleware that answers before routing (e.g. result cache hits) names the route here
+ROUTE_LABEL_SCOPE_KEY = "xutil.route_label"
+
+# (metric name, type, help, [(labels, value)])
+Sample = Tuple[Dict[str, str], float]
+MetricFamily = Tuple[str, str, str, List[Sample]]
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name: str, labels: Dict[str, str]) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{name}_bucket", {**labels, "le": repr(float(bound))}, cumulative
+        yield f"{name}_bucket", {**labels, "le": "+Inf"}, self.count
+        yield f"{name}_sum", labels, self.sum
+        yield f"{name}_count", labels, self.count
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels.items())
+    return "{" + ",".join(escaped) + "}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.request_bytes: Dict[Tuple[str, str], Histogram] = {}
+        self.response_bytes: Dict[Tuple[str, str], Histogram] = {}
+        self.responses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight = 0
+        self.collectors: List[Callable[[], List[MetricFamily]]] = []
+
+    def register_collector(self, collector: Callable[[], List[MetricFamily]]) -> None:
+        self.collectors.append(collector)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, request_size: int, response_size: int) -> None:
+        key = (method, route)
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(LATENCY_BUCKETS)
+            self.request_bytes[key] = Histogram(SIZE_BUCKETS)
+            self.response_bytes[key] = Histogram(SIZE_BUCKETS)
+        histogram.observe(seconds)
+        self.request_bytes[key].observe(request_size)
+        self.response_bytes[key].observe(response_size)
+        status_key = (method, route, status)
+        self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def render(self) -> str:
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name, help_text, histograms in (
+            ("xutil_request_duration_seconds", "Request latency by route", self.latency),
+            ("xutil_request_size_bytes", "Request body size by route", self.request_bytes),
+            ("xutil_response_size_bytes", "Response body size by route", self.response_bytes),
+        ):
+            family(name, "histogram", help_text)
+            for (method, route), histogram in sorted(histograms.items()):
+                for sample_name, labels, value in histogram.samples(name, {"method": method, "route": route}):
+                    lines.append(f"{sample_name}{_format_labels(labels)} {value}")
+
+        family("xutil_responses_total", "counter", "Responses by route and status code")
+        for (method, route, status), count in sorted(self.responses.items()):
+            lines.append(f"xutil_responses_total{_format_labels({'method': method, 'route': route, 'status': str(status)})} {count}")
+
+        family("xutil_requests_in_flight", "gauge", "Requests currently being handled")
+        lines.append(f"xutil_requests_in_flight {self.in_flight}")
+
+        for collector in self.collectors:
+            for name, kind, help_text, samples in collector():
+                family(name, kind, help_text)
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+def route_label(scope: Scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        return scope.get(ROUTE_LABEL_SCOPE_KEY, UNMATCHED_ROUTE)
+    return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, registry: Optional[MetricsRegistry] = None):
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_size = 0
+        response_size = 0
+        status = 500
+
+        async def counting_receive() -> Message:
+            nonlocal request_size
+            message = await receive()
+            request_size += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message: Message) -> None:
+            nonlocal response_size, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        registry = self.registry
+        registry.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            registry.in_flight -= 1
+            registry.observe(
+                scope["method"], route_label(scope), status,
+                time.perf_counter() - started, request_size, response_size,
+            )
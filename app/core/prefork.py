@@ -0,0 +1,264 @@
+"""
+Production launcher: preload the app once, then fork uvicorn workers that share it.
+
+    python -m app.core.prefork --port 8000 --workers 4
+
+The master imports `app.main`, loads every lazy router, builds the OpenAPI document and
+replays the warm-up requests, then runs `gc.collect()` and `gc.freeze()` before forking.
+Frozen objects are never touched by the collector again, so the pages holding pandas,
+lxml and the schemas stay shared copy-on-write between workers instead of being dirtied
+by each worker's first GC pass.
+
+Workers serve a socket bound by the master. A worker is recycled (it finishes in-flight
+requests, then exits and is replaced) after `--max-requests` requests, plus a random
+jitter so they don't all restart at once, or once its RSS is over `--max-rss-mb`. This
+contains the heap growth that big conversions leave behind. Every
+`--report-interval` seconds the master logs RSS, PSS and shared memory for each worker.
+Defaults come from the XUTIL_PREFORK_* settings. Linux only: it relies on fork and /proc.
+"""
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from .config import get_settings
+from .structured_logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Worker exit codes the master reports as recycling rather than crashes
+EXIT_MAX_REQUESTS = 10
+EXIT_MAX_RSS = 11
+RECYCLE_REASONS = {EXIT_MAX_REQUESTS: "max requests", EXIT_MAX_RSS: "RSS limit"}
+RSS_CHECK_INTERVAL = 5.0
+MB = 1024 * 1024
+
+def process_memory(pid: int) -> Dict[str, int]:
+    """RSS, PSS and shared bytes of a process, from /proc/<pid>/smaps_rollup."""
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared"}
+    memory = {"rss": 0, "pss": 0, "shared": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] += int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        pass
+    return memory
+
+def current_rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def preload_app():
+    """Import the app with every router loaded, then freeze it out of the collector's reach."""
+    from ..main import app, lazy_loader
+    if lazy_loader is not None:
+        lazy_loader.load_all_sync(trigger="preload")
+    app.openapi()
+    if get_settings().warmup_enabled:
+        # Caches filled by the warm-up requests (regexes, pytz zones, ...) are then shared too;
+        # each worker still prestarts its own process pool before reporting ready
+        from .warmup import run_warmup_requests
+        asyncio.run(run_warmup_requests(app))
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded app: %d objects frozen, master RSS %.1fMB", gc.get_freeze_count(), current_rss() / MB)
+    return app
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+@dataclass
+class WorkerInfo:
+    slot: int
+    started: float
+    max_requests: int
+
+class PreforkServer:
+    def __init__(self, app, sock: socket.socket, workers: int, max_requests: int, max_requests_jitter: int,
+                 max_rss_bytes: int, report_interval: float, graceful_timeout: float, log_level: str):
+        self.app = app
+        self.sock = sock
+        self.worker_count = workers
+        self.max_requests = max_requests
+        self.max_requests_jitter = max_requests_jitter
+        self.max_rss_bytes = max_rss_bytes
+        self.report_interval = report_interval
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.workers: Dict[int, WorkerInfo] = {}
+        self.stopping = False
+
+    # Master
+
+    def run(self) -> int:
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, self._handle_stop)
+        for slot in range(self.worker_count):
+            self.spawn(slot)
+        last_report = time.monotonic()
+        while not self.stopping:
+            self.reap()
+            if self.report_interval and time.monotonic() - last_report >= self.report_interval:
+                self.report_memory()
+                last_report = time.monotonic()
+            time.sleep(0.5)
+        self.shutdown()
+        return 0
+
+    def _handle_stop(self, signum, frame) -> None:
+        self.stopping = True
+
+    def spawn(self, slot: int) -> None:
+        limit = self.max_requests + random.randint(0, self.max_requests_jitter) if self.max_requests else 0
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._serve(limit)
+            except BaseException:
+                logger.exception("Worker %d crashed", os.getpid())
+            finally:
+                # Never return into the master's loop or run its exit handlers
+                os._exit(code)
+        self.workers[pid] = WorkerInfo(slot, time.monotonic(), limit)
+        logger.info("Started worker %d (slot %d, max requests %s)", pid, slot, limit or "unlimited")
+
+    def reap(self) -> None:
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            info = self.workers.pop(pid, None)
+            if info is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            uptime = time.monotonic() - info.started
+            if code in RECYCLE_REASONS:
+                logger.info("Recycled worker %d after %.0fs (%s)", pid, uptime, RECYCLE_REASONS[code])
+            elif self.stopping and code in (0, -signal.SIGTERM, -signal.SIGINT):
+                # uvicorn re-raises the stop signal once it has shut down gracefully
+                logger.info("Stopped worker %d after %.0fs", pid, uptime)
+            else:
+                logger.warning("Worker %d exited with code %d after %.0fs", pid, code, uptime)
+            if not self.stopping:
+                self.spawn(info.slot)
+
+    def report_memory(self) -> None:
+        for pid, info in sorted(self.workers.items(), key=lambda item: item[1].slot):
+            memory = process_memory(pid)
+            logger.info(
+                "Worker %d (slot %d): rss %.1fMB, pss %.1fMB, shared %.1fMB, up %.0fs",
+                pid, info.slot, memory["rss"] / MB, memory["pss"] / MB, memory["shared"] / MB, time.monotonic() - info.started,
+            )
+
+    def shutdown(self) -> None:
+        logger.info("Stopping %d workers", len(self.workers))
+        for pid in self.workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            logger.warning("Killing worker %d after the %.0fs graceful timeout", pid, self.graceful_timeout)
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            os.waitpid(pid, 0)
+            self.workers.pop(pid, None)
+
+    # Worker
+
+    def _serve(self, max_requests: int) -> int:
+        import uvicorn
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_DFL)
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            log_level=self.log_level,
+            limit_max_requests=max_requests or None,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        server = uvicorn.Server(config)
+        over_rss = threading.Event()
+        if self.max_rss_bytes:
+            threading.Thread(target=self._watch_rss, args=(server, over_rss), daemon=True).start()
+        server.run(sockets=[self.sock])
+        if over_rss.is_set():
+            return EXIT_MAX_RSS
+        if max_requests and server.server_state.total_requests >= max_requests:
+            return EXIT_MAX_REQUESTS
+        return 0
+
+    def _watch_rss(self, server, over_rss: threading.Event) -> None:
+        while not server.should_exit:
+            time.sleep(RSS_CHECK_INTERVAL)
+            rss = current_rss()
+            if rss > self.max_rss_bytes:
+                logger.info("Worker %d RSS %.1fMB is over the %.0fMB limit, recycling", os.getpid(), rss / MB, self.max_rss_bytes / MB)
+                over_rss.set()
+                server.should_exit = True
+                return
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.core.prefork", description="Serve the app from preloaded, forked uvicorn workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.prefork_workers or os.cpu_count() or 1)
+    parser.add_argument("--max-requests", type=int, default=settings.prefork_max_requests, help="Recycle a worker after this many requests; 0 disables")
+    parser.add_argument("--max-requests-jitter", type=int, default=settings.prefork_max_requests_jitter)
+    parser.add_argument("--max-rss-mb", type=int, default=settings.prefork_max_rss_mb, help="Recycle a worker once its RSS is over this; 0 disables")
+    parser.add_argument("--report-interval", type=float, default=settings.prefork_report_interval, help="Seconds between memory reports; 0 disables")
+    parser.add_argument("--graceful-timeout", type=float, default=settings.prefork_graceful_timeout)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    configure_logging(args.log_level)
+    sock = bind_socket(args.host, args.port)
+    app = preload_app()
+    if args.max_rss_mb and current_rss() > args.max_rss_mb * MB:
+        logger.warning("--max-rss-mb %d is below the preloaded master's RSS; workers will recycle continuously", args.max_rss_mb)
+    logger.info("Listening on %s:%d with %d workers", args.host, args.port, args.workers)
+    server = PreforkServer(
+        app,
+        sock,
+        workers=args.workers,
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        max_rss_bytes=args.max_rss_mb * MB,
+        report_interval=args.report_interval,
+        graceful_timeout=args.graceful_timeout,
+        log_level=args.log_level,
+    )
+    return server.run()
+
+if __name__ == "__main__":
+    sys.exit(main())
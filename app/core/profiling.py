@@ -0,0 +1,130 @@
+"""
+Opt-in cProfile capture for single requests.
+
+With XUTIL_PROFILING_ENABLED=true, a request carrying the `X-Profile` header runs under
+cProfile and the stats are written to `<profiling_dir>/<id>.prof`; the id comes back in
+the `X-Profile-Id` response header. When XUTIL_PROFILING_TOKEN is set the header value
+must match it. While a request is profiled its crud calls run inline, because cProfile
+only sees the thread it was enabled on, and it bypasses the result cache.
+
+Only one request is profiled at a time (cProfile is per-interpreter), so a second
+profiled request is served normally with `X-Profile-Status: busy`. Other requests that
+interleave on the event loop while the profile is running will show up in it too.
+
+Inspect a capture with `python -m app.core.profiling show <id> [--limit N] [--all]`.
+"""
+import argparse
+import cProfile
+import hmac
+import pstats
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .executor import INLINE, forced_mode
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_STATUS_HEADER = b"x-profile-status"
+# Set on the scope of a profiled request so the result cache lets it through
+PROFILING_SCOPE_KEY = "xutil.profiling"
+PROFILE_SUFFIX = ".prof"
+
+def prune_profiles(directory: Path, keep: int) -> None:
+    """Delete the oldest captures so at most `keep` remain."""
+    profiles = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+    for stale in profiles[:max(0, len(profiles) - keep)]:
+        stale.unlink(missing_ok=True)
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, directory: Path, token: Optional[str] = None, max_files: int = 100):
+        self.app = app
+        self.directory = Path(directory)
+        self.token = token
+        self.max_files = max_files
+        self.active = False
+
+    def _requested(self, scope: Scope) -> bool:
+        value = dict(scope["headers"]).get(PROFILE_HEADER)
+        if value is None:
+            return False
+        if self.token is None:
+            return True
+        return hmac.compare_digest(value, self.token.encode())
+
+    def _save(self, profiler: cProfile.Profile, path: Path) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path)
+        prune_profiles(self.directory, self.max_files)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if self.active:
+            async def busy_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": [*message["headers"], (PROFILE_STATUS_HEADER, b"busy")]}
+                await send(message)
+
+            await self.app(scope, receive, busy_send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+        async def tagged_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message["headers"], (PROFILE_ID_HEADER, profile_id.encode())]}
+            await send(message)
+
+        scope[PROFILING_SCOPE_KEY] = profile_id
+        profiler = cProfile.Profile()
+        token = forced_mode.set(INLINE)
+        self.active = True
+        profiler.enable()
+        try:
+            await self.app(scope, receive, tagged_send)
+        finally:
+            profiler.disable()
+            self.active = False
+            forced_mode.reset(token)
+            await run_in_threadpool(self._save, profiler, self.directory / f"{profile_id}{PROFILE_SUFFIX}")
+
+def show(path: Path, limit: int, app_only: bool) -> None:
+    stats = pstats.Stats(str(path))
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    # pstats treats string restrictions as regexes over "file:line(function)"
+    restrictions: List = [r"[/\\]app[/\\]"] if app_only else []
+    stats.print_stats(*restrictions, limit)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .config import get_settings
+
+    parser = argparse.ArgumentParser(prog="python -m app.core.profiling", description="Inspect captured request profiles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List captured profiles, newest first")
+    show_parser = sub.add_parser("show", help="Print the hottest frames of one profile")
+    show_parser.add_argument("profile_id")
+    show_parser.add_argument("--limit", type=int, default=30)
+    show_parser.add_argument("--all", action="store_true", help="Include library and stdlib frames")
+    args = parser.parse_args(argv)
+
+    directory = Path(get_settings().profiling_dir)
+    if args.command == "list":
+        for path in sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.stat().st_mtime, reverse=True):
+            print(path.stem)
+        return 0
+
+    path = directory / f"{args.profile_id}{PROFILE_SUFFIX}"
+    if not path.exists():
+        print(f"No profile {args.profile_id} in {directory}", file=sys.stderr)
+        return 1
+    show(path, args.limit, app_only=not args.all)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""
+Raw-body mode for the document converters.
+
+The regular endpoints wrap documents in JSON: `{"xml_text": "<a/>"}` in and
+`{"result": "{...}"}` out, so every document is escaped, parsed as an envelope and
+escaped again. The `-raw` endpoints take the document itself as the request body with
+its native Content-Type (application/json, application/xml, text/yaml, text/csv) and
+answer with the converted document under its native Content-Type. Options such as the
+CSV separator or the class name move to query parameters.
+
+Content-Encoding request bodies are decoded by `RequestDecompressionMiddleware` as usual.
+"""
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from fastapi import HTTPException, Request, Response
+from .body_limit import RequestTooLarge
+
+JSON_TYPES = ("application/json",)
+XML_TYPES = ("application/xml", "text/xml")
+YAML_TYPES = ("application/yaml", "application/x-yaml", "text/yaml", "text/x-yaml")
+CSV_TYPES = ("text/csv",)
+
+def _media_type(request: Request) -> Tuple[str, Optional[str]]:
+    media_type, _, params = request.headers.get("content-type", "").partition(";")
+    charset = None
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "charset":
+            charset = value.strip().strip('"').lower()
+    return media_type.strip().lower(), charset
+
+async def iter_raw_body(request: Request, accepted: Tuple[str, ...], max_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Yield a raw request body chunk by chunk after checking its Content-Type.
+
+    Raises:
+        HTTPException: 415 for another media type or a non UTF-8 charset, 413 past `max_bytes`
+    """
+    media_type, charset = _media_type(request)
+    if media_type not in accepted:
+        raise HTTPException(status_code=415, detail=f"Unsupported Content-Type. Expected {' or '.join(accepted)}")
+    if charset not in (None, "utf-8", "utf8", "us-ascii"):
+        raise HTTPException(status_code=415, detail="Only UTF-8 bodies are supported")
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise RequestTooLarge(max_bytes)
+        if chunk:
+            yield chunk
+
+async def read_raw_body(request: Request, accepted: Tuple[str, ...], max_bytes: int) -> bytes:
+    """Read a whole raw request body; see `iter_raw_body`. An empty body is a 400."""
+    body = b"".join([chunk async for chunk in iter_raw_body(request, accepted, max_bytes)])
+    if not body:
+        raise HTTPException(status_code=400, detail="Request body is empty")
+    return body
+
+def raw_bytes(result: Any) -> bytes:
+    """The converted document of a crud result (a ConversionResponse or plain text) as bytes."""
+    text = getattr(result, "result", result)
+    return text.encode("utf-8") if isinstance(text, str) else text
+
+def raw_response(result: Any, media_type: str) -> Response:
+    return Response(raw_bytes(result), media_type=media_type)
+
+def raw_openapi(accepted: Tuple[str, ...], produces: str) -> Dict[str, Any]:
+    """`openapi_extra` documenting the raw request and response bodies, which FastAPI cannot infer from the signature."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {media_type: {"schema": {"type": "string"}} for media_type in accepted},
+        },
+        "responses": {"200": {"content": {produces: {"schema": {"type": "string"}}}}},
+    }
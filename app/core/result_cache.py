@@ -0,0 +1,250 @@
+"""
+Content-addressed cache for deterministic tool endpoints.
+
+Responses are keyed by (method, path, canonical query, canonical JSON body, output
+format) and stored in a pluggable backend; the default is an in-process LRU bounded by
+entry count and total bytes. Cached and fresh responses carry an ETag derived from the
+body plus Cache-Control, and a matching If-None-Match is answered with 304.
+
+Routers opt out by setting `RESULT_CACHEABLE = False` at module level (random
+generators, anything time-dependent), and single endpoints with `@no_result_cache`
+(anything with side effects, such as writing files); both are recorded per route in
+the router manifest.
+Multipart uploads are not cached, because the random boundary makes every body unique,
+and neither are profiled requests.
+"""
+import hashlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .metrics import ROUTE_LABEL_SCOPE_KEY
+from .profiling import PROFILING_SCOPE_KEY
+from .router_loader import RouteTable
+from .serialization import JSON_FORMAT_HEADER
+
+CachedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes, str]  # status, headers, body, etag
+
+def no_result_cache(endpoint: Callable) -> Callable:
+    """Keep one endpoint out of the result cache; place it below the router decorator."""
+    endpoint.result_cacheable = False
+    return endpoint
+
+def cacheable_routes(manifest: List[Dict]) -> RouteTable:
+    """Map full route paths (templates included) to whether their responses may be cached."""
+    return RouteTable({
+        route["path"]: route.get("cacheable", entry.get("cacheable", True))
+        for entry in manifest
+        for route in entry["routes"]
+    })
+
+class CacheBackend(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: CachedResponse) -> None: ...
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]: ...
+
+class LRUByteCache(CacheBackend):
+    """LRU cache bounded by both entry count and the summed size of stored bodies."""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(value: CachedResponse) -> int:
+        return len(value[2]) + sum(len(k) + len(v) for k, v in value[1])
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        size = self._size(value)
+        if size > self.max_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.bytes -= self._size(old)
+        self.entries[key] = value
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= self._size(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+def cache_metric_families(backend: CacheBackend) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+    counters = {"hits", "misses", "evictions"}
+    return [
+        (f"xutil_result_cache_{name}_total" if name in counters else f"xutil_result_cache_{name}",
+         "counter" if name in counters else "gauge", f"Result cache {name.replace('_', ' ')}", [({}, value)])
+        for name, value in backend.stats().items()
+        if isinstance(value, (int, float))
+    ]
+
+def canonical_body(body: bytes, content_type: str) -> bytes:
+    """Normalize JSON bodies so key order and whitespace do not change the cache key."""
+    if "json" in content_type and body:
+        try:
+            return orjson.dumps(orjson.loads(body), option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONDecodeError:
+            pass
+    return body
+
+def cache_key(method: str, path: str, query_string: bytes, body: bytes, content_type: str, output_format: bytes) -> str:
+    digest = hashlib.sha256()
+    query = urlencode(sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)))
+    for part in (method.encode(), path.encode(), query.encode(), output_format, canonical_body(body, content_type)):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+class ResultCacheMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        backend: CacheBackend,
+        routes: RouteTable,
+        max_body_bytes: int,
+        max_entry_bytes: int,
+        max_age: int,
+    ):
+        self.app = app
+        self.backend = backend
+        self.routes = routes
+        self.max_body_bytes = max_body_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.cache_control = f"public, max-age={max_age}".encode()
+
+    def _cacheable(self, scope: Scope, headers: Dict[bytes, bytes]) -> bool:
+        if scope["method"] not in ("GET", "POST") or PROFILING_SCOPE_KEY in scope:
+            return False
+        if not self.routes.get(scope["path"], False):
+            return False
+        if headers.get(b"content-type", b"").startswith(b"multipart/"):
+            return False
+        if scope["method"] == "POST":
+            length = headers.get(b"content-length")
+            if length is None or not length.isdigit() or int(length) > self.max_body_bytes:
+                return False
+        return True
+
+    async def _send_cached(self, send: Send, entry: CachedResponse, if_none_match: bytes) -> None:
+        status, headers, body, etag = entry
+        validators = [(b"etag", etag.encode()), (b"cache-control", self.cache_control)]
+        if etag.encode() in if_none_match:
+            await send({"type": "http.response.start", "status": 304, "headers": validators})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": status, "headers": headers + validators + [(b"x-cache", b"HIT")]})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        if not self._cacheable(scope, headers):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        key = cache_key(
+            scope["method"], scope["path"], scope.get("query_string", b""), body,
+            headers.get(b"content-type", b"").decode("latin-1"), headers.get(JSON_FORMAT_HEADER, b""),
+        )
+        if_none_match = headers.get(b"if-none-match", b"")
+        entry = self.backend.get(key)
+        if entry is not None:
+            # Only 200s are cached, so the path is a real route without path parameters
+            scope[ROUTE_LABEL_SCOPE_KEY] = scope["path"]
+            await self._send_cached(send, entry, if_none_match)
+            return
+
+        replayed = False
+
+        async def replay_receive() -> Message:
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start: Optional[Message] = None
+        buffered: List[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def capture_send(message: Message) -> None:
+            nonlocal start, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            buffered.append(message.get("body", b""))
+            size += len(buffered[-1])
+            if size > self.max_entry_bytes:
+                # Too big to be worth caching: flush what we have and stream the rest
+                passthrough = True
+                await send(start)
+                await send({"type": "http.response.body", "body": b"".join(buffered), "more_body": message.get("more_body", False)})
+                return
+            if message.get("more_body", False):
+                return
+            response_body = b"".join(buffered)
+            response_headers = [(k, v) for k, v in start["headers"] if k.lower() not in (b"etag", b"cache-control")]
+            etag = f'"{hashlib.sha256(response_body).hexdigest()[:32]}"'
+            self.backend.set(key, (start["status"], response_headers, response_body, etag))
+            if etag.encode() in if_none_match:
+                await self._send_cached(send, (start["status"], response_headers, response_body, etag), if_none_match)
+                return
+            await send({
+                **start,
+                "headers": response_headers + [(b"etag", etag.encode()), (b"cache-control", self.cache_control), (b"x-cache", b"MISS")],
+            })
+            await send({"type": "http.response.body", "body": response_body})
+
+        await self.app(scope, replay_receive, capture_send)
@@ -0,0 +1,157 @@
+import asyncio
+import importlib
+import json
+import logging
+import pkgutil
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import BaseRoute, Match, compile_path
+from starlette.types import Receive, Scope, Send
+from .startup_report import startup_report
+
+API_PREFIX = "/api"
+ROUTER_PACKAGE = "app.routers"
+ROUTER_PATH = Path(__file__).resolve().parent.parent / "routers"
+MANIFEST_PATH = Path(__file__).resolve().parent.parent / "router_manifest.json"
+
+logger = logging.getLogger(__name__)
+
+class RouteTable:
+    """
+    Per-route values keyed by the manifest's path templates, looked up by request path.
+
+    Static paths are a dict hit. Templated ones such as `/api/jobs/{tool}` are matched
+    with the same regexes Starlette routes with, in manifest order.
+    """
+
+    def __init__(self, values: Dict[str, Any]):
+        self.exact: Dict[str, Any] = {}
+        self.templated: List[Tuple[Pattern[str], Any]] = []
+        for path, value in values.items():
+            if "{" in path:
+                self.templated.append((compile_path(path)[0], value))
+            else:
+                self.exact[path] = value
+
+    def get(self, path: str, default: Any = None) -> Any:
+        if path in self.exact:
+            return self.exact[path]
+        for regex, value in self.templated:
+            if regex.match(path):
+                return value
+        return default
+
+def discover_routers() -> List[str]:
+    """Scan app/routers/<category>/ for router modules (the pre-manifest behaviour)."""
+    modules = []
+    for category in sorted(ROUTER_PATH.iterdir()):
+        if category.is_dir():
+            package_name = f"{ROUTER_PACKAGE}.{category.name}"
+            for _, module_name, is_pkg in sorted(pkgutil.iter_modules([str(category)]), key=lambda m: m[1]):
+                if not is_pkg:
+                    modules.append(f"{package_name}.{module_name}")
+    return modules
+
+def load_manifest(path: Path = MANIFEST_PATH) -> List[Dict[str, str]]:
+    """Read the router manifest: one {module, prefix} entry per router module."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["routers"]
+
+def unlisted_routers(manifest: List[Dict[str, str]]) -> List[str]:
+    """Router modules on disk that the manifest lacks, i.e. added since the last artifacts build."""
+    listed = {entry["module"] for entry in manifest}
+    return [module_path for module_path in discover_routers() if module_path not in listed]
+
+def import_router_module(module_path: str, trigger: str):
+    """Import a router module, recording how long it took and how many modules it pulled in."""
+    modules_before = len(sys.modules)
+    started = time.perf_counter()
+    module = importlib.import_module(module_path)
+    startup_report.record_import(
+        module_path,
+        import_ms=(time.perf_counter() - started) * 1000,
+        new_modules=len(sys.modules) - modules_before,
+        trigger=trigger,
+    )
+    return module
+
+class LazyRouterStub(BaseRoute):
+    """Placeholder matching every path under a router prefix until the real router is imported."""
+
+    def __init__(self, loader: "LazyRouterLoader", module_path: str, prefix: str):
+        self.loader = loader
+        self.module_path = module_path
+        self.path = f"{API_PREFIX}{prefix}"
+
+    def matches(self, scope: Scope):
+        if scope["type"] not in ("http", "websocket"):
+            return Match.NONE, {}
+        path = scope["path"]
+        if path == self.path or path.startswith(self.path + "/"):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.loader.load(self.module_path, trigger="request")
+        # The stub is gone now; dispatch again so the real route handles the request
+        await self.loader.app.router(scope, receive, send)
+
+class LazyRouterLoader:
+    """Registers routers from the manifest and imports each one on first use."""
+
+    def __init__(self, app: FastAPI, manifest: List[Dict[str, str]]):
+        self.app = app
+        self.manifest = manifest
+        self.stubs: Dict[str, LazyRouterStub] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    def register(self) -> None:
+        for entry in self.manifest:
+            stub = LazyRouterStub(self, entry["module"], entry["prefix"])
+            self.stubs[entry["module"]] = stub
+            self.app.router.routes.append(stub)
+
+    @property
+    def pending(self) -> List[str]:
+        return list(self.stubs)
+
+    def _include(self, module) -> None:
+        stub = self.stubs.pop(module.__name__, None)
+        if stub is None:
+            return
+        if hasattr(module, "router"):
+            self.app.include_router(module.router, prefix=API_PREFIX)
+        self.app.router.routes.remove(stub)
+        # Routes changed, so a cached OpenAPI document is stale
+        self.app.openapi_schema = None
+
+    async def load(self, module_path: str, trigger: str) -> None:
+        if module_path not in self.stubs:
+            return
+        lock = self.locks.setdefault(module_path, asyncio.Lock())
+        async with lock:
+            if module_path not in self.stubs:
+                return
+            # Heavy libraries (pandas, lxml, ...) import off the event loop
+            module = await run_in_threadpool(import_router_module, module_path, trigger)
+            self._include(module)
+
+    def load_all_sync(self, trigger: str) -> None:
+        for module_path in self.pending:
+            self._include(import_router_module(module_path, trigger))
+
+    async def load_all(self, trigger: str) -> None:
+        for module_path in self.pending:
+            await self.load(module_path, trigger=trigger)
+
+def include_all_routers(app: FastAPI, modules: Optional[List[str]] = None) -> None:
+    """Eagerly import every router module and include it under /api."""
+    for full_module_path in modules if modules is not None else discover_routers():
+        module = import_router_module(full_module_path, trigger="startup")
+        if hasattr(module, "router"):
+            app.include_router(module.router, prefix=API_PREFIX)
+            logger.debug("Included router %s", full_module_path)
@@ -0,0 +1,103 @@
+"""
+orjson-backed JSON encoding and decoding shared by every router and crud module.
+
+Output style is chosen per request with the `X-JSON-Format: compact|pretty` header or
+the `json_format` query parameter. It applies both to the response envelope and to JSON
+documents that converters embed in their `result` strings. Without the option, responses
+stay compact and converter results stay indented, as before.
+"""
+import json
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Optional
+from urllib.parse import parse_qs
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+COMPACT = "compact"
+PRETTY = "pretty"
+JSON_FORMAT_HEADER = b"x-json-format"
+JSON_FORMAT_QUERY = "json_format"
+
+json_format: ContextVar[Optional[str]] = ContextVar("json_format", default=None)
+
+def _use_indent(default_pretty: bool) -> bool:
+    requested = json_format.get()
+    if requested is None:
+        return default_pretty
+    return requested == PRETTY
+
+def dumps_json_bytes(obj: Any, pretty: Optional[bool] = None) -> bytes:
+    """Serialize with orjson, falling back to the stdlib for values orjson rejects (e.g. >64-bit ints)."""
+    indent = _use_indent(True) if pretty is None else pretty
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    try:
+        return orjson.dumps(obj, option=option)
+    except TypeError:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False, default=str).encode("utf-8")
+
+def dumps_json(obj: Any, pretty: Optional[bool] = None) -> str:
+    """Serialize a converter result to text, indented unless the request asked for compact output."""
+    return dumps_json_bytes(obj, pretty).decode("utf-8")
+
+def loads_json(data: Any) -> Any:
+    """Parse JSON with orjson, re-parsing with the stdlib for input it rejects (big ints, NaN)."""
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Raises json.JSONDecodeError for genuinely invalid input, as callers expect
+        return json.loads(data)
+
+class AppJSONResponse(ORJSONResponse):
+    """Default response class: compact orjson unless the request asked for pretty output."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json_bytes(content, pretty=_use_indent(False))
+
+class ORJSONRequest(Request):
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = loads_json(await self.body())
+        return self._json
+
+class ORJSONRoute(APIRoute):
+    """Route class that decodes JSON request bodies with orjson."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await original_route_handler(ORJSONRequest(request.scope, request.receive))
+
+        return route_handler
+
+class JSONFormatMiddleware:
+    """Reads the per-request compact/pretty option into `json_format`."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = None
+        for name, value in scope["headers"]:
+            if name == JSON_FORMAT_HEADER:
+                requested = value.decode("latin-1").strip().lower()
+                break
+        if requested is None and scope.get("query_string"):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get(JSON_FORMAT_QUERY)
+            if values:
+                requested = values[0].strip().lower()
+        if requested not in (COMPACT, PRETTY):
+            requested = None
+        token = json_format.set(requested)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            json_format.reset(token)
@@ -0,0 +1,112 @@
+"""
+Startup and import-time accounting.
+
+`startup_report` is filled in while the app boots and as lazy routers load; it is
+served from /api/startup-report. Run this module to measure a cold start in a fresh
+interpreter and fail when it exceeds a budget:
+
+    python -m app.core.startup_report --budget-ms 800 [--lazy] [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+class StartupReport:
+    def __init__(self):
+        self.boot_started = time.perf_counter()
+        self.ready_ms: Optional[float] = None
+        self.mode = "eager"
+        self.budget_ms: Optional[float] = None
+        self.imports: List[Dict[str, Any]] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.boot_started) * 1000
+
+    def record_import(self, module: str, import_ms: float, new_modules: int, trigger: str) -> None:
+        self.imports.append({
+            "module": module,
+            "import_ms": round(import_ms, 2),
+            "new_modules": new_modules,
+            "trigger": trigger,
+            "at_ms": round(self.elapsed_ms(), 2),
+        })
+
+    def mark_ready(self) -> None:
+        self.ready_ms = round(self.elapsed_ms(), 2)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget_ms is not None and self.ready_ms is not None and self.ready_ms > self.budget_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "startup_ms": self.ready_ms,
+            "budget_ms": self.budget_ms,
+            "over_budget": self.over_budget,
+            "router_import_ms": round(sum(i["import_ms"] for i in self.imports), 2),
+            "imports": sorted(self.imports, key=lambda i: i["import_ms"], reverse=True),
+        }
+
+startup_report = StartupReport()
+
+_PROBE = (
+    "import json, time\n"
+    "t = time.perf_counter()\n"
+    "from app.main import app\n"
+    "from app.core.startup_report import startup_report\n"
+    "startup_report.mark_ready()\n"
+    "print(json.dumps({'import_app_ms': (time.perf_counter() - t) * 1000, 'report': startup_report.as_dict()}))\n"
+)
+
+def parse_importtime(stderr: str, top: int) -> List[Dict[str, Any]]:
+    """Sum `python -X importtime` self times per top-level package and return the heaviest."""
+    totals: Dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us = int(parts[0])
+        except ValueError:
+            continue
+        package = parts[2].strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    rows = [{"package": name, "self_ms": round(us / 1000, 2)} for name, us in totals.items()]
+    return sorted(rows, key=lambda r: r["self_ms"], reverse=True)[:top]
+
+def measure_cold_start(lazy: bool, top: int) -> Dict[str, Any]:
+    env = dict(os.environ, XUTIL_LAZY_ROUTERS="1" if lazy else "0")
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        capture_output=True, text=True, env=env,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"App failed to import:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_wall_ms"] = round(wall_ms, 2)
+    result["top_imports"] = parse_importtime(proc.stderr, top)
+    return result
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure app cold-start time against a budget")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if importing the app takes longer")
+    parser.add_argument("--lazy", action="store_true", help="Measure with XUTIL_LAZY_ROUTERS=1")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+
+    result = measure_cold_start(args.lazy, args.top)
+    print(json.dumps(result, indent=2))
+    if args.budget_ms is not None and result["import_app_ms"] > args.budget_ms:
+        print(f"Startup budget exceeded: {result['import_app_ms']:.1f}ms > {args.budget_ms}ms", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
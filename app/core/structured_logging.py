@@ -0,0 +1,181 @@
+"""
+App-wide logging that never blocks the event loop.
+
+`configure_logging()` gives the root logger a single QueueHandler. Records are put on a
+bounded queue without formatting and a QueueListener thread formats and writes them.
+When the queue is full, records are dropped and counted instead of making the caller
+wait. Log calls pass `%s` arguments rather than f-strings, so a disabled level costs
+nothing and the message is only built on the listener thread.
+
+Every HTTP request gets a correlation id: the incoming X-Request-ID header when it is
+sane, else a fresh one. It is echoed back on the response and attached to every record
+logged while the request is handled, including crud calls in the thread pool.
+`CorrelationIdMiddleware` also writes one access record per request. Trivial routes
+(health checks, generators) are sampled at XUTIL_LOG_TRIVIAL_SAMPLE_RATE; errors and
+slow requests are always kept.
+
+XUTIL_LOG_FORMAT=json writes one JSON object per line; `text` is meant for local runs.
+"""
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional, Tuple
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .admission import TRIVIAL
+from .router_loader import RouteTable
+
+REQUEST_ID_HEADER = b"x-request-id"
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+JSON = "json"
+TEXT = "text"
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+# Attributes every LogRecord has; anything else was passed via `extra` and is emitted as a field
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+access_logger = logging.getLogger("xutil.access")
+
+class JSONLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": record.request_id,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode("utf-8")
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Enqueues records unformatted and drops them when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The context var is only visible on the logging thread, so capture it now
+        record.request_id = request_id.get() or "-"
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LoggingState:
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[QueueListener] = None
+        self.output: Optional[logging.Handler] = None
+        self.queue_size = 0
+
+    @property
+    def configured(self) -> bool:
+        return self.handler is not None
+
+    def start_listener(self) -> None:
+        log_queue: queue.Queue = queue.Queue(self.queue_size)
+        self.handler.queue = log_queue
+        self.listener = QueueListener(log_queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def after_fork(self) -> None:
+        # The listener thread does not survive fork; give the child its own queue and thread
+        if self.configured:
+            self.start_listener()
+
+    def stop(self) -> None:
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def metric_families(self) -> List[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+        dropped = self.handler.dropped if self.handler is not None else 0
+        return [("xutil_log_records_dropped_total", "counter", "Log records dropped because the log queue was full", [({}, dropped)])]
+
+logging_state = LoggingState()
+
+def configure_logging(level: Optional[str] = None) -> None:
+    """Route the root logger through the queue; later calls are no-ops."""
+    if logging_state.configured:
+        return
+    from .config import get_settings
+    settings = get_settings()
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JSONLineFormatter() if settings.log_format == JSON else logging.Formatter(TEXT_FORMAT))
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    logging_state.output = output
+    logging_state.queue_size = settings.log_queue_size
+    logging_state.handler = NonBlockingQueueHandler(queue.Queue(settings.log_queue_size))
+    root.addHandler(logging_state.handler)
+    root.setLevel((level or settings.log_level).upper())
+    logging_state.start_listener()
+    os.register_at_fork(after_in_child=logging_state.after_fork)
+    atexit.register(logging_state.stop)
+
+def _incoming_request_id(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER:
+            candidate = value.decode("latin-1").strip()
+            return candidate if VALID_REQUEST_ID.match(candidate) else None
+    return None
+
+class CorrelationIdMiddleware:
+    def __init__(self, app: ASGIApp, cost_classes: Optional[RouteTable] = None,
+                 trivial_sample_rate: float = 1.0, slow_request_seconds: float = 1.0):
+        self.app = app
+        self.cost_classes = cost_classes or RouteTable({})
+        self.trivial_sample_rate = trivial_sample_rate
+        self.slow_request_seconds = slow_request_seconds
+
+    def _sampled(self, path: str, status: int, elapsed: float) -> bool:
+        if status >= 500 or elapsed >= self.slow_request_seconds:
+            return True
+        if self.cost_classes.get(path, TRIVIAL) != TRIVIAL:
+            return True
+        return random.random() < self.trivial_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        rid = _incoming_request_id(scope) or uuid.uuid4().hex
+        token = request_id.set(rid)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (REQUEST_ID_HEADER, rid.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            if access_logger.isEnabledFor(logging.INFO) and self._sampled(scope["path"], status, elapsed):
+                access_logger.info(
+                    "%s %s %d %.1fms", scope["method"], scope["path"], status, elapsed * 1000,
+                    extra={"method": scope["method"], "path": scope["path"], "status": status, "duration_ms": round(elapsed * 1000, 1)},
+                )
+            request_id.reset(token)
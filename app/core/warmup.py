@@ -0,0 +1,159 @@
+"""
+Startup warm-up and the readiness probe.
+
+The first request to a tool pays one-time costs: validator and serializer setup, regex
+compilation, pytz zone loading, PyYAML constructor registration, pandas' first-call
+overhead. Router modules list representative calls as
+
+    WARMUP_REQUESTS = [("POST", "/generate", {"text": "Hello World"})]
+
+with paths relative to the router prefix. The dict is the JSON body, or the query
+parameters for GET. Routes that read a raw body take bytes plus a content type as a
+fourth item, e.g. `("POST", "/csv-to-json-raw?engine=pandas", b"a,b\n1,2\n", "text/csv")`;
+a query string in the path is passed through. After startup `warm_up()` replays them through the app's router.
+Middleware is bypassed, so they don't show up in metrics, the result cache or the access
+log. It then prestarts the crud process pool, whose workers import the converter crud
+modules. Only then does /api/ready return 200. /api/health stays a liveness check that
+answers as soon as the server is up.
+
+A failing warm-up call is logged and does not block readiness. A process worker that
+never comes up does: /api/ready keeps returning 503 until every configured worker has
+answered.
+"""
+import asyncio
+import logging
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+import orjson
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from starlette.types import Message
+from .executor import crud_executor
+
+logger = logging.getLogger(__name__)
+
+Payload = Optional[Union[Dict[str, Any], bytes]]
+WarmupRequest = Tuple[str, str, Payload, Optional[str]]  # method, full path, payload, content type
+
+class Readiness:
+    def __init__(self):
+        self.warmed = False
+        self.started = time.perf_counter()
+        self.warmup_ms: Optional[float] = None
+        self.requests = 0
+        self.failures: List[Dict[str, Any]] = []
+        self.process_workers = 0
+        self.process_workers_expected = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed and self.process_workers >= self.process_workers_expected
+
+    def mark_ready(self) -> None:
+        self.warmed = True
+
+    def as_dict(self) -> Dict[str, Any]:
+        status = "ready" if self.ready else "process_pool_incomplete" if self.warmed else "warming_up"
+        return {
+            "status": status,
+            "warmup_ms": self.warmup_ms,
+            "warmup_requests": self.requests,
+            "warmup_failures": self.failures,
+            "process_workers_started": self.process_workers,
+            "process_workers_expected": self.process_workers_expected,
+        }
+
+readiness = Readiness()
+
+def collect_warmup_requests(app: FastAPI) -> List[WarmupRequest]:
+    """WARMUP_REQUESTS of every router module included in the app, as full paths."""
+    modules = sorted({route.endpoint.__module__ for route in app.routes if isinstance(route, APIRoute)})
+    requests = []
+    for module_name in modules:
+        module = sys.modules.get(module_name)
+        router = getattr(module, "router", None)
+        for method, path, payload, *content_type in getattr(module, "WARMUP_REQUESTS", ()):
+            requests.append((method, f"/api{router.prefix}{path}", payload, content_type[0] if content_type else None))
+    return requests
+
+async def dispatch(app: FastAPI, method: str, path: str, payload: Payload, content_type: Optional[str] = None) -> int:
+    """Send one request straight to the app's router and return the response status."""
+    body = b""
+    path, _, query_text = path.partition("?")
+    query = query_text.encode("latin-1")
+    headers = []
+    if isinstance(payload, bytes):
+        body = payload
+        content_type = content_type or "application/octet-stream"
+    elif payload is not None and method == "GET":
+        query = urlencode(payload).encode("latin-1")
+    elif payload is not None:
+        body = orjson.dumps(payload)
+        content_type = content_type or "application/json"
+    if content_type is not None:
+        headers = [(b"content-type", content_type.encode("latin-1")), (b"content-length", str(len(body)).encode("latin-1"))]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+        "method": method, "path": path, "raw_path": path.encode("latin-1"), "root_path": "",
+        "query_string": query, "headers": headers, "client": ("127.0.0.1", 0), "server": ("warmup", 80), "app": app,
+    }
+    sent = False
+    status = 500
+
+    async def receive() -> Message:
+        nonlocal sent
+        if sent:
+            return {"type": "http.disconnect"}
+        sent = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: Message) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app.router(scope, receive, send)
+    return status
+
+async def run_warmup_requests(app: FastAPI) -> Tuple[int, List[Dict[str, Any]]]:
+    requests = collect_warmup_requests(app)
+    failures = []
+    for method, path, payload, content_type in requests:
+        try:
+            status = await dispatch(app, method, path, payload, content_type)
+            error = None if status < 400 else f"HTTP {status}"
+        except Exception as e:
+            # Without the middleware stack, HTTPException and validation errors surface here
+            error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            logger.warning("Warm-up request %s %s failed: %s", method, path, error)
+            failures.append({"method": method, "path": path, "error": error})
+        # Let real requests that arrived meanwhile interleave
+        await asyncio.sleep(0)
+    return len(requests), failures
+
+async def warm_up(app: FastAPI, lazy_loader=None, prestart_pool: bool = True, prestart_timeout: float = 60.0) -> None:
+    started = time.perf_counter()
+    try:
+        if lazy_loader is not None:
+            await lazy_loader.load_all(trigger="warmup")
+        readiness.requests, readiness.failures = await run_warmup_requests(app)
+        if prestart_pool:
+            readiness.process_workers_expected = crud_executor.process_stats.workers
+            readiness.process_workers = await crud_executor.prestart(timeout=prestart_timeout)
+    except Exception:
+        logger.exception("Warm-up did not complete")
+    finally:
+        readiness.warmup_ms = round((time.perf_counter() - started) * 1000, 2)
+        readiness.mark_ready()
+    logger.info(
+        "Warm-up finished in %.1fms: %d requests (%d failed), %d process workers started",
+        readiness.warmup_ms, readiness.requests, len(readiness.failures), readiness.process_workers,
+    )
+    if readiness.process_workers < readiness.process_workers_expected:
+        logger.error(
+            "Only %d of %d process workers started; /api/ready stays 503",
+            readiness.process_workers, readiness.process_workers_expected,
+        )
@@ -0,0 +1,140 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+from ...schemas.batch.batch_schema import (
+    BatchItemResult,
+    BatchOperation,
+    BatchResponse,
+    EncodedTextParams,
+    TextParams,
+)
+from ...schemas.converters.json_python_schema import JSONInput as ClassJSONInput
+from ...schemas.converters.json_typescript_schema import JSONInput as InterfaceJSONInput
+from ...schemas.converters.unix_utc_time_schema import UnixTimeRequest, UtcTimeRequest
+from ...schemas.converters.yaml_json_converter_schema import JSONInput as YAMLJSONInput, YAMLInput
+from ...schemas.encoding_decoding.base_encode_decode_schema import BaseDecodeRequest, BaseEncodeRequest
+from ...schemas.encoding_decoding.cipher_schema import CaesarRequest, ROT13Request
+from ...schemas.encoding_decoding.hash_generator_schema import HashRequest
+from ...schemas.encoding_decoding.morse_code_parser_schema import MorseInput
+from ...schemas.general_converters.angle_converter_schema import AngleConvertRequest, AngleConvertResponse, UNIT_TO_RADIANS
+from ...schemas.general_converters.area_converter_schema import AreaConvertRequest, AreaConvertResponse, UNIT_TO_SQUARE_METERS
+from ...schemas.general_converters.bit_byte_converter_schema import BitByteConvertRequest, BitByteConvertResponse, UNIT_TO_BITS
+from ...schemas.general_converters.energy_converter_schema import EnergyConvertRequest, EnergyConvertResponse, UNIT_TO_JOULES
+from ...schemas.general_converters.frequency_converter_schema import FrequencyConvertRequest, FrequencyConvertResponse, UNIT_TO_HERTZ
+from ...schemas.general_converters.fuel_economy_converter_schema import FuelEconomyConvertRequest, FuelEconomyConvertResponse, UNIT_TO_KM_PER_LITER
+from ...schemas.general_converters.length_converter_schema import LengthConvertRequest, LengthConvertResponse, UNIT_TO_METERS
+from ...schemas.general_converters.power_converter_schema import PowerConvertRequest, PowerConvertResponse, UNIT_TO_WATTS
+from ...schemas.general_converters.pressure_converter_schema import PressureConvertRequest, PressureConvertResponse, UNIT_TO_PASCALS
+from ...schemas.general_converters.speed_converter_schema import SpeedConvertRequest, SpeedConvertResponse, UNIT_TO_METERS_PER_SECOND
+from ...schemas.general_converters.temperature_converter_schema import TemperatureConvertRequest
+from ...schemas.general_converters.time_converter_scehma import TimeConvertRequest, TimeConvertResponse, UNIT_TO_SECONDS
+from ...schemas.general_converters.volume_converter_schema import VolumeConvertRequest, VolumeConvertResponse, UNIT_TO_LITERS
+from ...schemas.general_converters.weight_converter_schema import WeightConvertRequest, WeightConvertResponse, UNIT_TO_GRAMS
+from ...schemas.text_utilities.slug_converter_schema import SlugGenerateRequest
+from ..converters.json_pydantic_crud import json_to_pydantic_logic
+from ..converters.json_python_crud import json_to_python_logic
+from ..converters.json_typescript_crud import json_to_typescript_logic
+from ..converters.unix_utc_time_crud import unix_to_utc_logic, utc_to_unix_logic
+from ..converters.yaml_json_converter_crud import json_to_yaml_logic, yaml_to_json_logic
+from ..encoding_decoding.base_encode_decode_crud import base_decode_logic, base_encode_logic
+from ..encoding_decoding.cipher_crud import caesar_cipher_logic, rot13_cipher_logic
+from ..encoding_decoding.hash_generator_crud import generate_hash_logic
+from ..encoding_decoding.html_entities_crud import decode_html_entities_logic, encode_html_entities_logic
+from ..encoding_decoding.morse_code_parser_crud import char_to_morse_logic, morse_to_char_logic
+from ..encoding_decoding.url_encode_decode_crud import decode_url_logic, encode_url_logic
+from ..general_converters.unit_converter_crud import convert_temperature_logic, convert_unit_logic
+from ..text_utilities.slug_generator_crud import generate_slug_logic
+
+Tool = Tuple[Type[BaseModel], Callable[[Any], Any]]
+
+def _slug(p: SlugGenerateRequest) -> Dict[str, str]:
+    slug = generate_slug_logic(p.text, p.separator, p.case)
+    if not slug:
+        raise ValueError("Generated slug is empty")
+    return {"slug": slug}
+
+def _unit_tool(request_class: Type[BaseModel], conversion_dict: Dict[str, float], response_class: Type[BaseModel]) -> Tool:
+    return request_class, lambda p: convert_unit_logic(data=p, conversion_dict=conversion_dict, response_class=response_class)
+
+# Tool name -> (params model, handler). Handlers mirror what the regular endpoints return.
+TOOLS: Dict[str, Tool] = {
+    "hash.generate": (HashRequest, lambda p: generate_hash_logic(p.text, p.algorithm)),
+    "base.encode": (BaseEncodeRequest, lambda p: base_encode_logic(p.text, p.base_type)),
+    "base.decode": (BaseDecodeRequest, lambda p: base_decode_logic(p.encoded_text, p.base_type)),
+    "url.encode": (TextParams, lambda p: encode_url_logic(p.text)),
+    "url.decode": (EncodedTextParams, lambda p: decode_url_logic(p.encoded_text)),
+    "html-entities.encode": (TextParams, lambda p: encode_html_entities_logic(p.text)),
+    "html-entities.decode": (TextParams, lambda p: decode_html_entities_logic(p.text)),
+    "morse.char-to-morse": (MorseInput, lambda p: {"morse_code": char_to_morse_logic(p.text)}),
+    "morse.morse-to-char": (MorseInput, lambda p: {"decoded_text": morse_to_char_logic(p.text)}),
+    "cipher.rot13": (ROT13Request, lambda p: {"input_text": p.text, "output_text": rot13_cipher_logic(p.text)}),
+    "cipher.caesar": (CaesarRequest, lambda p: {"input_text": p.text, "shift": p.shift, "output_text": caesar_cipher_logic(p.text, p.shift)}),
+    "slug.generate": (SlugGenerateRequest, _slug),
+    "yaml-json.yaml-to-json": (YAMLInput, lambda p: yaml_to_json_logic(p.yaml_text)),
+    "yaml-json.json-to-yaml": (YAMLJSONInput, lambda p: json_to_yaml_logic(p.json_text)),
+    "json-ts.json-to-typescript": (InterfaceJSONInput, lambda p: json_to_typescript_logic(p.json_data, p.interface_name)),
+    "json-pydantic.json-to-pydantic": (ClassJSONInput, lambda p: json_to_pydantic_logic(p.json_data, p.class_name)),
+    "json-python.json-to-python": (ClassJSONInput, lambda p: json_to_python_logic(p.json_data, p.class_name)),
+    "unix-utc.unix-to-utc": (UnixTimeRequest, lambda p: unix_to_utc_logic(p.timestamp)),
+    "unix-utc.utc-to-unix": (UtcTimeRequest, lambda p: utc_to_unix_logic(p.datetime_utc)),
+    "unit.angle": _unit_tool(AngleConvertRequest, UNIT_TO_RADIANS, AngleConvertResponse),
+    "unit.area": _unit_tool(AreaConvertRequest, UNIT_TO_SQUARE_METERS, AreaConvertResponse),
+    "unit.bit-byte": _unit_tool(BitByteConvertRequest, UNIT_TO_BITS, BitByteConvertResponse),
+    "unit.energy": _unit_tool(EnergyConvertRequest, UNIT_TO_JOULES, EnergyConvertResponse),
+    "unit.frequency": _unit_tool(FrequencyConvertRequest, UNIT_TO_HERTZ, FrequencyConvertResponse),
+    "unit.fuel-economy": _unit_tool(FuelEconomyConvertRequest, UNIT_TO_KM_PER_LITER, FuelEconomyConvertResponse),
+    "unit.length": _unit_tool(LengthConvertRequest, UNIT_TO_METERS, LengthConvertResponse),
+    "unit.power": _unit_tool(PowerConvertRequest, UNIT_TO_WATTS, PowerConvertResponse),
+    "unit.pressure": _unit_tool(PressureConvertRequest, UNIT_TO_PASCALS, PressureConvertResponse),
+    "unit.speed": _unit_tool(SpeedConvertRequest, UNIT_TO_METERS_PER_SECOND, SpeedConvertResponse),
+    "unit.temperature": (TemperatureConvertRequest, lambda p: convert_temperature_logic(data=p)),
+    "unit.time": _unit_tool(TimeConvertRequest, UNIT_TO_SECONDS, TimeConvertResponse),
+    "unit.volume": _unit_tool(VolumeConvertRequest, UNIT_TO_LITERS, VolumeConvertResponse),
+    "unit.weight": _unit_tool(WeightConvertRequest, UNIT_TO_GRAMS, WeightConvertResponse),
+}
+
+def run_tool(tool: str, params: Dict[str, Any]) -> Tuple[int, Optional[Any], Optional[Any]]:
+    """
+    Validate params and call a tool's crud function.
+
+    Returns:
+        Tuple of (status code, JSON-ready result, JSON-ready error); errors never raise.
+    """
+    if tool not in TOOLS:
+        return 404, None, f"Unknown tool: {tool}"
+    params_model, handler = TOOLS[tool]
+    try:
+        result = handler(params_model.model_validate(params))
+        return 200, jsonable_encoder(result), None
+    except ValidationError as e:
+        return 422, None, jsonable_encoder(e.errors(include_url=False))
+    except HTTPException as e:
+        return e.status_code, None, e.detail
+    except ValueError as e:
+        return 400, None, str(e)
+    except Exception as e:
+        return 500, None, f"Internal server error: {str(e)}"
+
+async def run_batch_logic(operations: List[BatchOperation], max_operations: int, concurrency: int) -> BatchResponse:
+    """
+    Run a batch of tool invocations with at most `concurrency` in flight.
+
+    Raises:
+        HTTPException: 413 if the batch has more than `max_operations` entries
+    """
+    if len(operations) > max_operations:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds the limit of {max_operations} operations")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(op: BatchOperation) -> BatchItemResult:
+        async with semaphore:
+            status, result, error = await run_in_threadpool(run_tool, op.tool, op.params)
+        return BatchItemResult(id=op.id, tool=op.tool, status=status, result=result, error=error)
+
+    results = await asyncio.gather(*(run_one(op) for op in operations))
+    succeeded = sum(1 for r in results if 200 <= r.status < 300)
+    return BatchResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
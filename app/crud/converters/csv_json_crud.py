@@ -1,19 +1,53 @@
 import pandas as pd
+import csv
 import json
-from typing import Any, Dict, List, Union
+import pickle
+import tempfile
+import ijson
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Union
 from io import StringIO, BytesIO
-from ...schemas.converters.csv_json_schema import ConversionResponse
+from ...schemas.converters.csv_json_schema import ConversionResponse, CSVConversionResponse
+from ...core.serialization import dumps_json, dumps_json_bytes, loads_json
+from .csv_stdlib_crud import StdlibCSVUnsupported, read_csv_stdlib
 
-def flatten_json(data: Union[Dict, List], parent_key: str = '', sep: str = '_') -> List[Dict[str, Any]]:
+STREAM_CHUNK_ROWS = 5000
+
+AUTO = "auto"
+STDLIB = "stdlib"
+PANDAS = "pandas"
+CSV_ENGINES = (AUTO, STDLIB, PANDAS)
+# Below this size the stdlib engine is faster; see benchmarks/csv_engine_bench.py
+STDLIB_MAX_BYTES = 32 * 1024
+
+EXPLODE = "explode"
+INDEX = "index"
+EXPLODE_PATH = "explode-path"
+JSON_CELLS = "json"
+FLATTEN_STRATEGIES = (EXPLODE, INDEX, EXPLODE_PATH, JSON_CELLS)
+DEFAULT_MAX_ROWS = 100_000
+
+
+def _explodes(parent_key: str, strategy: str, explode_path: Optional[str]) -> bool:
+    return strategy == EXPLODE or (strategy == EXPLODE_PATH and parent_key == explode_path)
+
+
+def flatten_json(data: Union[Dict, List], parent_key: str = '', sep: str = '_',
+                 strategy: str = EXPLODE, explode_path: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Generic JSON flattener: supports nested dicts and lists.
-    Expands lists properly into multiple records (rows).
+
+    How lists are handled depends on `strategy`:
+    - explode: every list expands into rows; sibling lists multiply (cartesian product)
+    - index: list items become index-suffixed columns (`items_0_name`), one row per record
+    - explode-path: only the list whose flattened key is `explode_path` expands into rows,
+      other lists become JSON-encoded cells
+    - json: lists become JSON-encoded cells, one row per record
     """
     if isinstance(data, dict):
         records = [{}]
         for k, v in data.items():
             new_key = f"{parent_key}{sep}{k}" if parent_key else k
-            sub_records = flatten_json(v, new_key, sep)
+            sub_records = flatten_json(v, new_key, sep, strategy, explode_path)
             new_records = []
             for record in records:
                 for sub in sub_records:
@@ -23,35 +57,89 @@ def flatten_json(data: Union[Dict, List], parent_key: str = '', sep: str = '_')
         return records
 
     elif isinstance(data, list):
-        records = []
-        for item in data:
-            sub_records = flatten_json(item, parent_key, sep)
-            records.extend(sub_records)
-        return records
+        if _explodes(parent_key, strategy, explode_path):
+            records = []
+            for item in data:
+                sub_records = flatten_json(item, parent_key, sep, strategy, explode_path)
+                records.extend(sub_records)
+            return records
+        if strategy == INDEX:
+            record = {}
+            for i, item in enumerate(data):
+                new_key = f"{parent_key}{sep}{i}" if parent_key else str(i)
+                # Nothing explodes in index mode, so there is exactly one sub-record
+                record.update(flatten_json(item, new_key, sep, strategy, explode_path)[0])
+            return [record]
+        return [{parent_key: dumps_json(data, pretty=False)}]
 
     else:
         return [{parent_key: data}]
 
 
-def json_to_csv_logic(json_data: str, separator: str = '_') -> ConversionResponse:
-    """Convert ANY nested JSON string into flat CSV."""
+def estimate_rows(data: Any, parent_key: str = '', sep: str = '_',
+                  strategy: str = EXPLODE, explode_path: Optional[str] = None) -> int:
+    """Rows `flatten_json` would produce for `data`, counted without building them."""
+    if isinstance(data, dict):
+        rows = 1
+        for k, v in data.items():
+            new_key = f"{parent_key}{sep}{k}" if parent_key else k
+            rows *= estimate_rows(v, new_key, sep, strategy, explode_path)
+            if not rows:
+                return 0
+        return rows
+    if isinstance(data, list) and _explodes(parent_key, strategy, explode_path):
+        return sum(estimate_rows(item, parent_key, sep, strategy, explode_path) for item in data)
+    return 1
+
+
+def _check_flatten_options(flatten: str, explode_path: Optional[str]) -> None:
+    if flatten not in FLATTEN_STRATEGIES:
+        raise ValueError(f"Unknown flatten strategy '{flatten}'")
+    if flatten == EXPLODE_PATH and not explode_path:
+        raise ValueError("explode_path is required for the explode-path strategy")
+
+
+def _overflow_message(rows: str, max_rows: int) -> str:
+    return (
+        f"Flattening would produce {rows} rows, over the limit of {max_rows}. "
+        "Use flatten='index', 'json' or 'explode-path', or set on_overflow"
+    )
+
+
+def json_to_csv_logic(json_data: str, separator: str = '_', flatten: str = EXPLODE, explode_path: Optional[str] = None,
+                      max_rows: int = DEFAULT_MAX_ROWS, on_overflow: Optional[str] = None) -> CSVConversionResponse:
+    """
+    Convert ANY nested JSON string into flat CSV.
+
+    When the exploding strategies would produce more than `max_rows` rows, the request is
+    rejected, or with `on_overflow` (index or json) flattened with that strategy instead.
+    """
     try:
         if not json_data.strip():
             raise ValueError("JSON data cannot be empty")
+        _check_flatten_options(flatten, explode_path)
 
-        data = json.loads(json_data)
+        data = loads_json(json_data)
         if isinstance(data, dict):
             data = [data]  # Make it list-like always
 
+        if flatten in (EXPLODE, EXPLODE_PATH):
+            # Check the budget before building any rows; the cartesian product can be huge
+            rows = sum(estimate_rows(record, sep=separator, strategy=flatten, explode_path=explode_path) for record in data)
+            if rows > max_rows:
+                if on_overflow not in (INDEX, JSON_CELLS):
+                    raise ValueError(_overflow_message(str(rows), max_rows))
+                flatten = on_overflow
+
         all_records = []
         for record in data:
-            flattened = flatten_json(record, sep=separator)
+            flattened = flatten_json(record, sep=separator, strategy=flatten, explode_path=explode_path)
             all_records.extend(flattened)
 
         df = pd.DataFrame(all_records)
         with StringIO() as csv_buffer:
             df.to_csv(csv_buffer, index=False, encoding="utf-8")
-            return ConversionResponse(result=csv_buffer.getvalue())
+            return CSVConversionResponse(result=csv_buffer.getvalue(), flatten=flatten)
 
     except json.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON format: {str(e)}")
@@ -59,17 +147,271 @@ def json_to_csv_logic(json_data: str, separator: str = '_') -> ConversionRespons
         raise ValueError(f"JSON to CSV conversion failed: {str(e)}")
 
 
-def csv_to_json_logic(file_content: bytes, separator: str = '_') -> ConversionResponse:
-    """Convert CSV file to nested JSON string."""
+def csv_to_json_logic(file_content: bytes, separator: str = '_', engine: str = AUTO) -> ConversionResponse:
+    """
+    Convert CSV file to nested JSON string.
+
+    `auto` reads files up to STDLIB_MAX_BYTES with the stdlib engine and larger ones with
+    pandas. Input the stdlib engine can't read exactly like pandas goes to pandas either way.
+    """
     try:
-        df = pd.read_csv(BytesIO(file_content), encoding="utf-8", encoding_errors="ignore")
-        records = df.where(pd.notnull(df), None).to_dict(orient="records")
-        nested_records = [unflatten_dict(r, sep=separator) for r in records]
-        return ConversionResponse(result=json.dumps(nested_records, indent=2, ensure_ascii=False))
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine '{engine}'")
+        nested_records = None
+        if engine == STDLIB or (engine == AUTO and len(file_content) <= STDLIB_MAX_BYTES):
+            try:
+                header, columns = read_csv_stdlib(file_content)
+                nested_records = ColumnPlan(header, separator).rows_from_columns(columns)
+            except StdlibCSVUnsupported:
+                pass
+        if nested_records is None:
+            df = pd.read_csv(BytesIO(file_content), encoding="utf-8", encoding_errors="ignore")
+            nested_records = ColumnPlan(df.columns, separator).rows(df)
+        return ConversionResponse(result=dumps_json(nested_records))
     except Exception as e:
         raise ValueError(f"CSV to JSON conversion failed: {str(e)}")
 
 
+def _chunk_kind(column: pd.Series) -> str:
+    """The dtype kind of one chunk's column: "n" for all missing, "b" for bools with gaps too."""
+    kind = column.dtype.kind
+    if kind == "f" and column.isna().all():
+        return "n"
+    if kind == "O":
+        present = column.dropna()
+        return "b" if len(present) and pd.api.types.is_bool(present.iloc[0]) else "O"
+    return kind
+
+
+def _stream_dtypes(source: BinaryIO, chunk_rows: int) -> Dict[str, str]:
+    """
+    Dtypes for reading `source` in chunks like one full read, then rewind it.
+
+    pandas infers every chunk on its own. An int column with a gap after the first chunk
+    reads as int64 and then float64, where a full read makes the whole column float64
+    and writes `0.0`; a column of numbers that turns to text later starts as ints where
+    a full read keeps every value a string. Such columns are pinned to float64 or object.
+    """
+    kinds: Dict[str, set] = {}
+    for df in pd.read_csv(source, encoding="utf-8", encoding_errors="ignore", chunksize=chunk_rows):
+        for name in df.columns:
+            kinds.setdefault(name, set()).add(_chunk_kind(df[name]))
+    source.seek(0)
+    dtypes = {}
+    for name, seen in kinds.items():
+        known = seen - {"n"}
+        if known <= {"i", "u", "f"}:
+            if known & {"i", "u"} and seen & {"f", "n"}:
+                dtypes[name] = "float64"
+        elif len(known) > 1:
+            dtypes[name] = "object"
+    return dtypes
+
+
+def csv_to_json_stream(source: BinaryIO, separator: str = '_', ndjson: bool = True, chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    Convert CSV to JSON incrementally, `chunk_rows` rows at a time, yielding NDJSON lines
+    or a JSON array written element by element. Memory stays at one chunk whatever the
+    row count. Elements are compact and `source` is closed when the stream ends.
+
+    `source` must be seekable: a first pass (`_stream_dtypes`) pins the dtypes pandas
+    would pick for the whole file, so values come out as `csv_to_json_logic` writes them.
+    It and the first chunk run before anything is yielded, so bad input raises ValueError
+    on the first `next()`. A later error aborts the stream mid-body.
+    """
+    try:
+        dtypes = _stream_dtypes(source, chunk_rows)
+        reader = pd.read_csv(source, encoding="utf-8", encoding_errors="ignore", chunksize=chunk_rows, dtype=dtypes)
+        delimiter = b"\n" if ndjson else b",\n"
+        plan = None
+        started = False
+        for df in reader:
+            plan = plan or ColumnPlan(df.columns, separator)
+            records = plan.rows(df)
+            if not records:
+                continue
+            body = delimiter.join(dumps_json_bytes(r, pretty=False) for r in records)
+            if ndjson:
+                yield body + b"\n"
+            else:
+                yield (b",\n" if started else b"[\n") + body
+            started = True
+        if not ndjson:
+            yield b"\n]\n" if started else b"[]\n"
+    except Exception as e:
+        raise ValueError(f"CSV to JSON conversion failed: {str(e)}") from e
+    finally:
+        source.close()
+
+
+def _orjson_numbers(value: Any) -> Any:
+    """Turn ints outside int64/uint64 into floats, as `loads_json` (orjson) parses them."""
+    if isinstance(value, dict):
+        return {k: _orjson_numbers(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_orjson_numbers(v) for v in value]
+    if type(value) is int and not -2 ** 63 <= value < 2 ** 64:
+        return float(value)
+    return value
+
+
+class JSONCSVWriter:
+    """
+    JSON to CSV in two passes, with memory bounded by a record instead of the dataset.
+
+    `json_to_csv_logic` needs every flattened row in a DataFrame just to learn the union
+    of columns, then renders the whole CSV at once. Here pass 1 parses `source` record by
+    record with ijson, spools the flattened rows to a temp file in batches of `chunk_rows`
+    and tracks the column union plus what pandas would make of each column. Iterating is
+    pass 2: the header, then one CSV chunk of UTF-8 bytes per batch. Memory stays at one
+    record and one batch. The output matches `json_to_csv_logic`, including pandas
+    turning int columns with gaps into floats.
+
+    Pass 1 runs in the constructor, so bad input raises ValueError before any output. If
+    the row budget is exceeded, `on_overflow` restarts pass 1 with that strategy; the
+    strategy used ends up in `flatten`. Call `close()` to drop the spool.
+    """
+
+    # Value kinds seen per column; ints are split by the numpy dtype pandas would pick
+    _FLOAT, _INT, _UINT, _NEGATIVE, _OTHER = 1, 2, 4, 8, 16
+
+    def __init__(self, source: BinaryIO, separator: str = '_', flatten: str = EXPLODE, explode_path: Optional[str] = None,
+                 max_rows: int = DEFAULT_MAX_ROWS, on_overflow: Optional[str] = None, chunk_rows: int = STREAM_CHUNK_ROWS):
+        _check_flatten_options(flatten, explode_path)
+        self.separator = separator
+        self.explode_path = explode_path
+        self.max_rows = max_rows
+        self.chunk_rows = chunk_rows
+        self.spool = tempfile.TemporaryFile()
+        try:
+            try:
+                self._spool(source, flatten, on_overflow, big_ints=False)
+            except ijson.JSONError as e:
+                if "integer overflow" not in str(e):
+                    raise
+                # yajl stops at ints past int64; the pure-Python backend reads them
+                self._spool(source, flatten, on_overflow, big_ints=True)
+        except Exception as e:
+            self.spool.close()
+            if isinstance(e, ijson.JSONError):
+                raise ValueError(f"Invalid JSON format: {str(e)}") from e
+            raise ValueError(f"JSON to CSV conversion failed: {str(e)}") from e
+
+    @staticmethod
+    def _records(source: BinaryIO, big_ints: bool) -> Iterator[Any]:
+        """Top-level array items one at a time, or a top-level object as the only record."""
+        head = source.read(4096).lstrip()
+        source.seek(0)
+        if head.startswith(b"\xef\xbb\xbf"):
+            head = head[3:].lstrip()
+        if head.startswith(b"["):
+            prefix = "item"
+        elif head.startswith(b"{"):
+            prefix = ""
+        else:
+            raise ValueError("JSON data must be an object or an array of objects")
+        if not big_ints:
+            return ijson.items(source, prefix, use_float=True)
+        return map(_orjson_numbers, ijson.get_backend("python").items(source, prefix, use_float=True))
+
+    def _spool(self, source: BinaryIO, flatten: str, on_overflow: Optional[str], big_ints: bool) -> None:
+        if not self._spool_rows(source, flatten, on_overflow, big_ints):
+            self._spool_rows(source, on_overflow, None, big_ints)
+
+    def _spool_rows(self, source: BinaryIO, flatten: str, on_overflow: Optional[str], big_ints: bool) -> bool:
+        """Pass 1. Returns False when the row budget is exceeded and `on_overflow` should be used."""
+        source.seek(0)
+        self.spool.seek(0)
+        self.spool.truncate()
+        self.flatten = flatten
+        self.columns: List[str] = []
+        index: Dict[str, int] = {}
+        present: List[int] = []
+        kinds: List[int] = []
+        budgeted = flatten in (EXPLODE, EXPLODE_PATH)
+        FLOAT, INT, OTHER = self._FLOAT, self._INT, self._OTHER
+        rows = 0
+        batch: List[List[Any]] = []
+        for record in self._records(source, big_ints):
+            if budgeted:
+                # Checked before flattening, as one record alone can explode past any limit
+                estimate = rows + estimate_rows(record, sep=self.separator, strategy=flatten, explode_path=self.explode_path)
+                if estimate > self.max_rows:
+                    if on_overflow in (INDEX, JSON_CELLS):
+                        return False
+                    raise ValueError(_overflow_message(f"at least {estimate}", self.max_rows))
+            for row in flatten_json(record, sep=self.separator, strategy=flatten, explode_path=self.explode_path):
+                values: List[Any] = [None] * len(self.columns)
+                for key, value in row.items():
+                    i = index.get(key)
+                    if i is None:
+                        i = index[key] = len(self.columns)
+                        self.columns.append(key)
+                        present.append(0)
+                        kinds.append(0)
+                        values.append(None)
+                    values[i] = value
+                    if value is None:
+                        continue
+                    present[i] += 1
+                    kind = type(value)
+                    if kind is int:
+                        kinds[i] |= INT if 0 <= value < 2 ** 63 else self._int_kind(value)
+                    else:
+                        kinds[i] |= FLOAT if kind is float else OTHER
+                batch.append(values)
+                rows += 1
+                if len(batch) == self.chunk_rows:
+                    pickle.dump(batch, self.spool, pickle.HIGHEST_PROTOCOL)
+                    batch = []
+        if batch:
+            pickle.dump(batch, self.spool, pickle.HIGHEST_PROTOCOL)
+        self.rows = rows
+        self.float_columns = [i for i in range(len(self.columns)) if self._is_float_column(kinds[i], present[i] < rows)]
+        return True
+
+    @classmethod
+    def _int_kind(cls, value: int) -> int:
+        if -2 ** 63 <= value < 0:
+            return cls._INT | cls._NEGATIVE
+        return cls._UINT if 2 ** 63 <= value < 2 ** 64 else cls._OTHER
+
+    @classmethod
+    def _is_float_column(cls, kind: int, missing: bool) -> bool:
+        """Whether pandas would give the column float64, which writes its ints as `1.0`."""
+        ints = kind & (cls._INT | cls._UINT)
+        if kind & cls._OTHER or not (kind & cls._FLOAT or (ints and missing)):
+            return False
+        # A column needing both uint64 and negative ints stays objects
+        return not (kind & cls._UINT and kind & cls._NEGATIVE)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Pass 2: the CSV as UTF-8, one chunk per spooled batch. May be iterated once."""
+        width = len(self.columns)
+        float_columns = self.float_columns
+        buffer = StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(self.columns)
+        self.spool.seek(0)
+        for _ in range(-(-self.rows // self.chunk_rows)):
+            batch = pickle.load(self.spool)
+            for values in batch:
+                values.extend([None] * (width - len(values)))
+                for i in float_columns:
+                    if type(values[i]) is int:
+                        values[i] = float(values[i])
+            writer.writerows(batch)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if not self.rows:
+            yield buffer.getvalue().encode("utf-8")
+        self.close()
+
+    def close(self) -> None:
+        self.spool.close()
+
+
 def unflatten_dict(d: Dict[str, Any], sep: str = '_') -> Dict[str, Any]:
     """Unflatten dictionary keys with separator into nested dictionaries."""
     result: Dict[str, Any] = {}
@@ -80,3 +422,82 @@ def unflatten_dict(d: Dict[str, Any], sep: str = '_') -> Dict[str, Any]:
             current = current.setdefault(part, {})
         current[parts[-1]] = value
     return result
+
+
+class ColumnPlan:
+    """
+    How the columns of a CSV header nest into objects, compiled once per header.
+
+    `unflatten_dict` splits every key and walks `setdefault` chains for every cell of
+    every row. The plan splits the header once into a path tree, detecting conflicts
+    such as `a` next to `a_b`, and turns it into a builder that only places values:
+    for `id,user_name,user_age` that is `lambda row: {'id': row[0], 'user': {'name':
+    row[1], 'age': row[2]}}`. Keys are embedded with repr(), so any header text is
+    safe. Trees deeper than MAX_COMPILED_DEPTH use equivalent closures instead, since
+    the parser limits nesting.
+    """
+
+    MAX_COMPILED_DEPTH = 50
+
+    def __init__(self, columns: Sequence[Any], sep: str = '_'):
+        self.columns = [str(column) for column in columns]
+        self.sep = sep
+        self.tree = self._compile_tree()
+        self.nested = any(not isinstance(node, int) for node in self.tree.values())
+        depth = self._depth(self.tree)
+        self.build = self._compile(self.tree) if depth <= self.MAX_COMPILED_DEPTH else self._closure(self.tree)
+
+    def _compile_tree(self) -> Dict[str, Any]:
+        """Path tree whose leaves are column positions, in first-occurrence order like `unflatten_dict`."""
+        tree: Dict[str, Any] = {}
+        owners: Dict[int, str] = {}  # id of a branch -> column that created it, for error messages
+        for position, column in enumerate(self.columns):
+            parts = column.split(self.sep)
+            node = tree
+            for depth, part in enumerate(parts[:-1]):
+                child = node.setdefault(part, {})
+                if isinstance(child, int):
+                    raise ValueError(f"Column '{column}' conflicts with column '{self.columns[child]}': "
+                                     f"'{self.sep.join(parts[:depth + 1])}' can't be both a value and an object")
+                owners.setdefault(id(child), column)
+                node = child
+            leaf = parts[-1]
+            if leaf in node:
+                existing = node[leaf]
+                other = self.columns[existing] if isinstance(existing, int) else owners[id(existing)]
+                raise ValueError(f"Column '{column}' conflicts with column '{other}'")
+            node[leaf] = position
+        return tree
+
+    @classmethod
+    def _depth(cls, tree: Dict[str, Any]) -> int:
+        return 1 + max((cls._depth(node) for node in tree.values() if not isinstance(node, int)), default=0)
+
+    @staticmethod
+    def _compile(tree: Dict[str, Any]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        def expression(node: Dict[str, Any]) -> str:
+            return "{" + ", ".join(
+                f"{key!r}: " + (f"row[{child}]" if isinstance(child, int) else expression(child))
+                for key, child in node.items()
+            ) + "}"
+        return eval(compile(f"lambda row: {expression(tree)}", "<column-plan>", "eval"), {"__builtins__": {}})
+
+    @classmethod
+    def _closure(cls, tree: Dict[str, Any]) -> Callable[[Sequence[Any]], Dict[str, Any]]:
+        items = [(key, child if isinstance(child, int) else cls._closure(child)) for key, child in tree.items()]
+
+        def build(row: Sequence[Any]) -> Dict[str, Any]:
+            return {key: row[child] if isinstance(child, int) else child(row) for key, child in items}
+        return build
+
+    def rows(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Nested records of a DataFrame read with this header; missing values become None."""
+        values = df.where(pd.notnull(df), None)
+        return self.rows_from_columns([values.iloc[:, i].tolist() for i in range(len(self.columns))])
+
+    def rows_from_columns(self, columns: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Nested records from one list of values per column, in header order."""
+        if not self.nested:
+            return [dict(zip(self.columns, row)) for row in zip(*columns)]
+        build = self.build
+        return [build(row) for row in zip(*columns)]
@@ -0,0 +1,112 @@
+"""
+CSV reader on the stdlib `csv` module that infers column types the way pandas does.
+
+pandas pays for DataFrame construction and dtype inference, and the converter then
+turns everything back into Python objects. For typical uploads, reading with `csv` and
+converting only the columns that need it is cheaper. Columns become int, float, bool or
+str, and pandas' default NA markers become None, matching `pd.read_csv` for the same
+bytes. Integer columns with missing values become floats, bool columns with missing
+values stay bools, and numbers may carry surrounding spaces or tabs.
+
+Input it cannot read exactly like pandas raises `StdlibCSVUnsupported`, and the caller
+falls back to pandas. This covers ragged rows, whitespace-only lines, duplicate or blank
+header names, integers past int64, and floats with more than 15 significant digits,
+which pandas' default parser does not always round like Python.
+"""
+import csv
+import math
+import re
+from io import StringIO
+from typing import Any, List, Sequence, Tuple
+
+NA_VALUES = frozenset({
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+})
+BOOLS = {"True": True, "TRUE": True, "true": True, "False": False, "FALSE": False, "false": False}
+MAX_EXACT_DIGITS = 15
+
+# ASCII digits only: pandas reads e.g. "١" as a string
+_INT = re.compile(r"[ \t]*[+-]?(\d+)[ \t]*", re.ASCII)
+_FLOAT = re.compile(r"[ \t]*[+-]?(\d*)\.?(\d*)(?:[eE][+-]?\d+)?[ \t]*", re.ASCII)
+_INF = re.compile(r"[ \t]*[+-]?inf(?:inity)?[ \t]*", re.IGNORECASE)
+
+class StdlibCSVUnsupported(Exception):
+    """The input needs pandas to be read exactly like `pd.read_csv`."""
+
+def _significant_digits(integer: str, fraction: str) -> int:
+    return len((integer + fraction).lstrip("0").rstrip("0")) if fraction else len(integer.lstrip("0"))
+
+def _is_int(value: str) -> bool:
+    # str methods first: most cells are plain digits and the regex costs several times more
+    return (value.isdigit() and value.isascii()) or _INT.fullmatch(value) is not None
+
+def _is_float(value: str) -> bool:
+    if value.replace(".", "", 1).isdigit() and value.isascii():
+        return True
+    match = _FLOAT.fullmatch(value)
+    return bool(match and (match.group(1) or match.group(2))) or _INF.fullmatch(value) is not None
+
+def _coerce_ints(values: Sequence[str], present: List[str], missing: bool) -> List[Any]:
+    limit = MAX_EXACT_DIGITS if missing else 18
+    for value in present:
+        # Only values this long can have too many digits
+        if len(value) > limit and len(_INT.fullmatch(value).group(1).lstrip("0")) > limit:
+            # pandas leaves int64 overflow as uint64 or strings; with gaps it parses via float
+            raise StdlibCSVUnsupported("integer outside the exactly handled range")
+    if not missing:
+        return [int(value) for value in values]
+    return [None if value in NA_VALUES else float(int(value)) for value in values]
+
+def _coerce_floats(values: Sequence[str], present: List[str]) -> List[Any]:
+    for value in present:
+        if len(value) > MAX_EXACT_DIGITS and not _INF.fullmatch(value):
+            integer, fraction = _FLOAT.fullmatch(value).groups()
+            if _significant_digits(integer, fraction) > MAX_EXACT_DIGITS:
+                raise StdlibCSVUnsupported("float with more significant digits than are parsed identically")
+    converted = [None if value in NA_VALUES else float(value) for value in values]
+    for number, value in zip(converted, values):
+        if number is not None and math.isinf(number) and not _INF.fullmatch(value):
+            raise StdlibCSVUnsupported("float overflow")  # pandas keeps e.g. 1e400 as a string column
+    return converted
+
+def _coerce(values: Sequence[str]) -> List[Any]:
+    """Convert one column's strings like pandas' type inference would."""
+    present = [value for value in values if value not in NA_VALUES]
+    if not present:
+        return [None] * len(values)
+    missing = len(present) != len(values)
+    if all(_is_int(value) for value in present):
+        return _coerce_ints(values, present, missing)
+    if all(_is_float(value) for value in present):
+        return _coerce_floats(values, present)
+    if all(value in BOOLS for value in present):
+        return [None if value in NA_VALUES else BOOLS[value] for value in values]
+    return [None if value in NA_VALUES else value for value in values]
+
+def read_csv_stdlib(file_content: bytes) -> Tuple[List[str], List[List[Any]]]:
+    """
+    Parse CSV bytes into the header and one list of typed values per column.
+
+    Raises:
+        StdlibCSVUnsupported: the input needs pandas for an identical result
+    """
+    text = file_content.decode("utf-8-sig", errors="ignore")
+    try:
+        rows = [row for row in csv.reader(StringIO(text, newline="")) if row]
+    except csv.Error as e:
+        raise StdlibCSVUnsupported(str(e)) from e  # e.g. a field over csv's size limit
+    if any(len(row) == 1 and not row[0].strip() for row in rows):
+        # pandas skips whitespace-only lines unless the whitespace is quoted, which csv does not tell us
+        raise StdlibCSVUnsupported("whitespace-only row")
+    if not rows:
+        raise StdlibCSVUnsupported("no header")
+    header, body = rows[0], rows[1:]
+    width = len(header)
+    if "" in header or len(set(header)) != width:
+        raise StdlibCSVUnsupported("blank or duplicate column names")
+    if any(len(row) != width for row in body):
+        raise StdlibCSVUnsupported("ragged rows")
+    if not body:
+        return header, [[] for _ in header]
+    return header, [_coerce(column) for column in zip(*body)]
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, List, Tuple
 from ...schemas.converters.json_python_schema import ConversionResponse
+from ...core.serialization import loads_json
 
 def infer_type(value: Any) -> str:
     """Infer Python type from JSON value for Pydantic models."""
@@ -91,7 +92,7 @@ def generate_class_definitions(json_data: Dict, class_name: str = "Root", depth:
 def json_to_pydantic_logic(json_data: str, class_name: str = "Root") -> ConversionResponse:
     """Convert JSON string to Pydantic class definitions."""
     try:
-        parsed_data = json.loads(json_data)
+        parsed_data = loads_json(json_data)
         if not parsed_data:
             raise ValueError("Empty JSON data")
         class_definitions, imports = generate_class_definitions(parsed_data, class_name)
@@ -1,6 +1,7 @@
 import json
 from io import StringIO
 from ...schemas.converters.json_typescript_schema import ConversionResponse
+from ...core.serialization import loads_json
 
 def json_to_typescript_logic(json_data, interface_name="Data", max_depth=50):
     if max_depth <= 0:
@@ -62,7 +63,7 @@ def json_to_typescript_logic(json_data, interface_name="Data", max_depth=50):
     if not isinstance(json_data, (str, dict)):
         raise ValueError("Input must be a JSON string or dictionary")
     try:
-        data = json.loads(json_data) if isinstance(json_data, str) else json_data
+        data = loads_json(json_data) if isinstance(json_data, str) else json_data
     except json.JSONDecodeError:
         raise ValueError("Invalid JSON string")
 
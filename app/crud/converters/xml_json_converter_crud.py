@@ -4,11 +4,12 @@ from fastapi.responses import JSONResponse
 import xmltodict
 import json
 from ...schemas.converters.xml_json_converter_schema import ConversionResponse
+from ...core.serialization import dumps_json, loads_json
 
 def xml_json_logic(xml_text: str) -> str:
     try:
         xml_dict = xmltodict.parse(xml_text)
-        json_text = json.dumps(xml_dict, indent=2)
+        json_text = dumps_json(xml_dict)
         return json_text
     except ParseError:
         raise HTTPException(status_code=400, detail="Invalid XML format")
@@ -17,7 +18,7 @@ def xml_json_logic(xml_text: str) -> str:
 
 def json_xml_logic(json_text: str) -> str:
     try:
-        json_dict = json.loads(json_text)
+        json_dict = loads_json(json_text)
         xml_text = xmltodict.unparse(json_dict, pretty=True)
         return xml_text
     except json.JSONDecodeError:
@@ -34,7 +35,7 @@ def xml_json_file_logic(contents: bytes) -> ConversionResponse:
         parsed_dict = xmltodict.parse(xml_data)
 
         # Convert to JSON with indentation
-        json_data = json.dumps(parsed_dict, indent=4)
+        json_data = dumps_json(parsed_dict)
 
         return ConversionResponse(result = json_data)
 
@@ -51,7 +52,7 @@ def json_xml_file_logic(contents: bytes) -> ConversionResponse:
         json_data = contents.decode("utf-8")
 
         # Parse JSON to dictionary
-        parsed_dict = json.loads(json_data)
+        parsed_dict = loads_json(json_data)
 
         # Convert to XML with pretty printing
         xml_data = xmltodict.unparse(parsed_dict, pretty=True)
@@ -3,6 +3,7 @@ import json
 import datetime
 from fastapi import HTTPException
 from ...schemas.converters.yaml_json_converter_schema import ConversionResponse
+from ...core.serialization import dumps_json, loads_json
 
 def register_fallback_tag_constructor():
     """
@@ -42,7 +43,7 @@ def yaml_to_json_logic(yaml_text: str) -> ConversionResponse:
             raise HTTPException(status_code=400, detail="Invalid YAML: Empty or invalid content")
         
         processed_data = convert_datetime(yaml_data)
-        json_data = json.dumps(processed_data, indent=2, ensure_ascii=False)
+        json_data = dumps_json(processed_data)
         return ConversionResponse(result=json_data)
     
     except yaml.YAMLError as e:
@@ -56,7 +57,7 @@ def json_to_yaml_logic(json_text: str) -> ConversionResponse:
     Convert a JSON string to YAML.
     """
     try:
-        json_data = json.loads(json_text)
+        json_data = loads_json(json_text)
         
         yaml_data = yaml.dump(
             json_data,
@@ -84,7 +85,7 @@ def yaml_json_file_logic(file_content: bytes) -> ConversionResponse:
             raise HTTPException(status_code=400, detail="Invalid YAML: Empty or invalid content")
         
         processed_data = convert_datetime(yaml_data)
-        json_data = json.dumps(processed_data, indent=2, ensure_ascii=False)
+        json_data = dumps_json(processed_data)
         return ConversionResponse(result=json_data)
     
     except yaml.YAMLError as e:
@@ -101,7 +102,7 @@ def json_yaml_file_logic(file_content: bytes) -> ConversionResponse:
     """
     try:
         json_text = file_content.decode('utf-8')
-        json_data = json.loads(json_text)
+        json_data = loads_json(json_text)
         
         yaml_data = yaml.dump(
             json_data,
@@ -0,0 +1,71 @@
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+from ...core.config import get_settings
+from ...core.serialization import loads_json
+from ..converters.csv_json_crud import EXPLODE, csv_to_json_logic, json_to_csv_logic
+from ..converters.json_pydantic_crud import json_to_pydantic_logic
+from ..converters.json_python_crud import json_to_python_logic
+from ..converters.json_typescript_crud import json_to_typescript_logic
+from ..converters.xml_json_converter_crud import json_xml_file_logic, xml_json_file_logic
+from ..converters.yaml_json_converter_crud import json_yaml_file_logic, yaml_json_file_logic
+
+# Adapters take the raw upload bytes. They live at module level so the process pool can pickle them.
+
+def _decode(contents: bytes) -> str:
+    try:
+        return contents.decode("utf-8")
+    except UnicodeDecodeError:
+        raise ValueError("File is not valid UTF-8")
+
+def _json_to_csv(contents: bytes, separator: str = "_", flatten: str = EXPLODE, explode_path: Optional[str] = None,
+                 on_overflow: Optional[str] = None) -> Any:
+    # Same row budget as /csv-json/json-to-csv, so a large upload cannot explode unchecked
+    return json_to_csv_logic(
+        _decode(contents), separator, flatten, explode_path, max_rows=get_settings().json_csv_max_rows, on_overflow=on_overflow,
+    )
+
+def _json_to_python(contents: bytes, class_name: str = "Root") -> Any:
+    return json_to_python_logic(_decode(contents), class_name)
+
+def _json_to_pydantic(contents: bytes, class_name: str = "Root") -> Any:
+    return json_to_pydantic_logic(_decode(contents), class_name)
+
+def _json_to_typescript(contents: bytes, interface_name: str = "Data") -> Any:
+    try:
+        data = loads_json(_decode(contents))
+    except ValueError:
+        raise ValueError("Invalid JSON format")
+    return json_to_typescript_logic(data, interface_name)
+
+class JobTool(NamedTuple):
+    func: Callable
+    extensions: Tuple[str, ...]  # accepted upload extensions, compression suffix removed
+    result_extension: str
+    media_type: str
+    options: Tuple[str, ...]  # form fields passed through as keyword arguments
+
+JOB_TOOLS: Dict[str, JobTool] = {
+    "csv-to-json": JobTool(csv_to_json_logic, (".csv",), ".json", "application/json", ("separator", "engine")),
+    "json-to-csv": JobTool(_json_to_csv, (".json",), ".csv", "text/csv", ("separator", "flatten", "explode_path", "on_overflow")),
+    "xml-to-json": JobTool(xml_json_file_logic, (".xml",), ".json", "application/json", ()),
+    "json-to-xml": JobTool(json_xml_file_logic, (".json",), ".xml", "application/xml", ()),
+    "yaml-to-json": JobTool(yaml_json_file_logic, (".yaml", ".yml"), ".json", "application/json", ()),
+    "json-to-yaml": JobTool(json_yaml_file_logic, (".json",), ".yaml", "application/yaml", ()),
+    "json-to-python": JobTool(_json_to_python, (".json",), ".py", "text/x-python", ("class_name",)),
+    "json-to-pydantic": JobTool(_json_to_pydantic, (".json",), ".py", "text/x-python", ("class_name",)),
+    "json-to-typescript": JobTool(_json_to_typescript, (".json",), ".ts", "application/typescript", ("interface_name",)),
+}
+
+def resolve_job_tool(tool: str, filename: str, options: Dict[str, Any]) -> Tuple[JobTool, Dict[str, Any]]:
+    """
+    Look up a job tool, check the upload's extension and keep the options it takes.
+
+    Raises:
+        HTTPException: 404 for an unknown tool, 400 for a file type it does not accept
+    """
+    job_tool = JOB_TOOLS.get(tool)
+    if job_tool is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job tool '{tool}'. Available: {', '.join(sorted(JOB_TOOLS))}")
+    if not filename.lower().endswith(job_tool.extensions):
+        raise HTTPException(status_code=400, detail=f"Only {'/'.join(job_tool.extensions)} files are supported")
+    return job_tool, {name: value for name, value in options.items() if name in job_tool.options and value is not None}
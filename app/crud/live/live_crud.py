@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import ValidationError
+from ...core.executor import run_crud
+from ...core.serialization import loads_json
+from ...schemas.live.live_schema import LiveMessage
+from ..batch.batch_crud import TOOLS, run_tool
+
+SendFrame = Callable[[Dict[str, Any]], Awaitable[None]]
+
+class LiveSession:
+    """
+    Per-connection state: at most one pending or running call per channel.
+
+    A convert waits `debounce` seconds before it runs. A newer convert on the same
+    channel supersedes it, whether it is still waiting or already running, and the
+    client gets a `superseded` frame for the old id. Work that already reached a pool
+    thread cannot be interrupted, so its result is discarded instead of sent.
+    """
+
+    def __init__(self, send: SendFrame, debounce_ms: int, max_debounce_ms: int, max_channels: int, max_message_bytes: int):
+        self._send = send
+        self._send_lock = asyncio.Lock()
+        self.debounce_ms = debounce_ms
+        self.max_debounce_ms = max_debounce_ms
+        self.max_channels = max_channels
+        self.max_message_bytes = max_message_bytes
+        self.channels: Dict[str, Tuple[Optional[str], asyncio.Task]] = {}
+        self.superseded = 0
+
+    async def send(self, frame: Dict[str, Any]) -> None:
+        # Replies come from several tasks; frames must not interleave
+        async with self._send_lock:
+            await self._send(frame)
+
+    async def hello(self) -> None:
+        await self.send({"type": "ready", "tools": sorted(TOOLS), "debounce_ms": self.debounce_ms, "max_channels": self.max_channels})
+
+    async def handle(self, raw: str) -> None:
+        # The limit is in bytes; non-ASCII characters take up to 4 each
+        size = len(raw) if raw.isascii() else len(raw.encode("utf-8"))
+        if size > self.max_message_bytes:
+            await self.send({"type": "error", "id": None, "status": 413, "error": f"Message exceeds {self.max_message_bytes} bytes"})
+            return
+        try:
+            message = LiveMessage.model_validate(loads_json(raw))
+        except ValidationError as e:
+            await self.send({"type": "error", "id": None, "status": 422, "error": e.errors(include_url=False, include_context=False)})
+            return
+        except ValueError:
+            await self.send({"type": "error", "id": None, "status": 400, "error": "Message is not valid JSON"})
+            return
+
+        if message.type == "ping":
+            await self.send({"type": "pong", "id": message.id})
+        elif message.type == "cancel":
+            await self.cancel(message)
+        else:
+            await self.convert(message, size=size)
+
+    async def convert(self, message: LiveMessage, size: int) -> None:
+        if message.tool not in TOOLS:
+            await self.send({"type": "error", "id": message.id, "status": 404, "error": f"Unknown tool: {message.tool}"})
+            return
+        channel = message.channel or message.tool
+        if channel not in self.channels and len(self.channels) >= self.max_channels:
+            await self.send({"type": "error", "id": message.id, "status": 429, "error": f"At most {self.max_channels} channels may be active"})
+            return
+        await self._drop(channel, "superseded")
+        delay_ms = self.debounce_ms if message.debounce_ms is None else min(message.debounce_ms, self.max_debounce_ms)
+        task = asyncio.create_task(self._run(channel, message, delay_ms / 1000, size))
+        self.channels[channel] = (message.id, task)
+
+    async def cancel(self, message: LiveMessage) -> None:
+        channel = message.channel or message.tool
+        if not await self._drop(channel, "cancelled"):
+            await self.send({"type": "error", "id": message.id, "status": 404, "error": f"Nothing pending on channel {channel}"})
+
+    async def _drop(self, channel: Optional[str], reason: str) -> bool:
+        entry = self.channels.pop(channel, None) if channel is not None else None
+        if entry is None:
+            return False
+        call_id, task = entry
+        if task.done():
+            return False
+        task.cancel()
+        if reason == "superseded":
+            self.superseded += 1
+        await self.send({"type": reason, "id": call_id, "channel": channel})
+        return True
+
+    async def _run(self, channel: str, message: LiveMessage, delay: float, size: int) -> None:
+        try:
+            if delay:
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            status, result, error = await run_crud(run_tool, message.tool, message.params, size=size)
+            frame = {
+                "type": "result", "id": message.id, "channel": channel, "tool": message.tool,
+                "status": status, "result": result, "error": error,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+            }
+        finally:
+            current = self.channels.get(channel)
+            if current is not None and current[1] is asyncio.current_task():
+                del self.channels[channel]
+        await self.send(frame)
+
+    async def close(self) -> None:
+        for _, task in self.channels.values():
+            task.cancel()
+        self.channels.clear()
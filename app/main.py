@@ -1,23 +1,127 @@
+from .core.startup_report import startup_report
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-import importlib
-import pkgutil
-from pathlib import Path
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from .core.admission import CODEGEN, FILE_CONVERSION, TEXT, AdmissionController, AdmissionMiddleware, route_cost_classes
+from .core.body_limit import BodyLimitMiddleware, route_limits
+from .core.compression import BROTLI, GZIP, ZSTD, CompressionMiddleware, parse_encodings
+from .core.config import get_settings
+from .core.decompression import RequestDecompressionMiddleware, supported_encodings
+from .core.artifacts import PrecompiledOpenAPI
+from .core.coalescing import single_flight
+from .core.executor import crud_executor
+from .core.jobs import job_manager
+from .core.metrics import MetricsMiddleware, metrics
+from .core.profiling import ProfilingMiddleware
+from .core.result_cache import LRUByteCache, ResultCacheMiddleware, cache_metric_families, cacheable_routes
+from .core.serialization import AppJSONResponse, JSONFormatMiddleware
+from .core.structured_logging import CorrelationIdMiddleware, configure_logging, logging_state
+from .core.warmup import readiness, warm_up
+from .core.router_loader import MANIFEST_PATH, LazyRouterLoader, include_all_routers, load_manifest, unlisted_routers
+
+settings = get_settings()
+configure_logging()
+logger = logging.getLogger(__name__)
+manifest = load_manifest() if MANIFEST_PATH.exists() else None
+lazy_loader = None
+result_cache = None
+admission = None
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_load = None
+    if lazy_loader is not None and settings.background_router_loading:
+        # Serve immediately; import the remaining routers while idle
+        background_load = asyncio.create_task(lazy_loader.load_all(trigger="warmup"))
+    warmup = None
+    if settings.warmup_enabled:
+        # The server accepts requests meanwhile; /api/ready reports 503 until this finishes
+        warmup = asyncio.create_task(warm_up(
+            app, lazy_loader, prestart_pool=settings.warmup_process_pool, prestart_timeout=settings.warmup_process_pool_timeout,
+        ))
+    else:
+        readiness.mark_ready()
+    if admission is not None:
+        admission.monitor.start()
+    job_manager.start()
+    startup_report.mark_ready()
+    if startup_report.over_budget:
+        logger.warning("Startup took %.1fms, over the %.1fms budget", startup_report.ready_ms, startup_report.budget_ms)
+    if ZSTD not in supported_encodings():
+        logger.warning("zstandard is not installed; zstd request bodies and .zst uploads will be rejected")
+    yield
+    if background_load is not None:
+        background_load.cancel()
+    if warmup is not None:
+        warmup.cancel()
+    if admission is not None:
+        admission.monitor.stop()
+    job_manager.stop()
+    crud_executor.shutdown()
 
 app = FastAPI(
     title="xutil Dev Tools",
     description="A collection of developer utility tools.",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=AppJSONResponse,
+    lifespan=lifespan
 )
 
-ROUTER_PACKAGE = "app.routers"
-
 origins = [
     "http://localhost:5173",  # Keep this for local development
     "https://xutil.in",       # Add your production domain
     "https://www.xutil.in",   # Add the www subdomain
 ]
 
+# Middleware added last runs first: correlation id -> metrics -> compression -> JSON format -> CORS -> admission -> body limit -> decompression -> profiling -> result cache -> routes
+if settings.result_cache_enabled and manifest is not None:
+    result_cache = LRUByteCache(settings.result_cache_max_entries, settings.result_cache_max_bytes)
+    metrics.register_collector(lambda: cache_metric_families(result_cache))
+    app.add_middleware(
+        ResultCacheMiddleware,
+        backend=result_cache,
+        routes=cacheable_routes(manifest),
+        max_body_bytes=settings.result_cache_max_body_bytes,
+        max_entry_bytes=settings.result_cache_max_entry_bytes,
+        max_age=settings.result_cache_max_age,
+    )
+
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profiling_dir,
+        token=settings.profiling_token,
+        max_files=settings.profiling_max_files,
+    )
+
+body_limits = route_limits(manifest) if manifest is not None else None
+app.add_middleware(
+    RequestDecompressionMiddleware,
+    default_limit=settings.default_max_body_bytes,
+    limits=body_limits,
+    max_ratio=settings.upload_max_compression_ratio,
+)
+app.add_middleware(BodyLimitMiddleware, default_limit=settings.default_max_body_bytes, limits=body_limits)
+
+if settings.admission_enabled and manifest is not None:
+    admission = AdmissionController(
+        limits={
+            TEXT: settings.admission_text_concurrency,
+            FILE_CONVERSION: settings.admission_file_conversion_concurrency,
+            CODEGEN: settings.admission_codegen_concurrency,
+        },
+        queue_size=settings.admission_queue_size,
+        queue_timeout=settings.admission_queue_timeout,
+        max_loop_lag=settings.admission_max_loop_lag,
+        retry_after=settings.admission_retry_after,
+    )
+    # Shed before the body is read, but inside CORS so browsers can see the 503
+    app.add_middleware(AdmissionMiddleware, controller=admission, cost_classes=route_cost_classes(manifest))
+    metrics.register_collector(admission.metric_families)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -25,27 +129,96 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-def include_all_routers():
-    router_path = Path(__file__).parent / "routers"
-
-    for category in router_path.iterdir():
-        if category.is_dir():
-            package_name = f"{ROUTER_PACKAGE}.{category.name}"
-            for _, module_name, is_pkg in pkgutil.iter_modules([str(category)]):
-                if not is_pkg:
-                    full_module_path = f"{package_name}.{module_name}"
-                    module = importlib.import_module(full_module_path)
-                    if hasattr(module, "router"):
-                        app.include_router(module.router, prefix="/api")
-                        print(f"Included: {full_module_path}")
-
-include_all_routers()
+app.add_middleware(JSONFormatMiddleware)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        encodings=parse_encodings(settings.compression_encodings),
+        levels={
+            GZIP: settings.compression_gzip_level,
+            BROTLI: settings.compression_brotli_quality,
+            ZSTD: settings.compression_zstd_level,
+        },
+        min_size=settings.compression_min_bytes,
+    )
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    metrics.register_collector(crud_executor.metric_families)
+    metrics.register_collector(single_flight.metric_families)
+    metrics.register_collector(logging_state.metric_families)
+    metrics.register_collector(job_manager.metric_families)
+app.add_middleware(
+    CorrelationIdMiddleware,
+    cost_classes=route_cost_classes(manifest) if manifest is not None else None,
+    trivial_sample_rate=settings.log_trivial_sample_rate,
+    slow_request_seconds=settings.log_slow_request_seconds,
+)
 
 @app.get("/api/health")
 async def health_check():
     return {"status": "Online"}
 
+@app.get("/api/ready")
+async def readiness_probe():
+    return AppJSONResponse(readiness.as_dict(), status_code=200 if readiness.ready else 503)
+
+@app.get("/api/startup-report")
+async def get_startup_report():
+    report = startup_report.as_dict()
+    report["pending_routers"] = lazy_loader.pending if lazy_loader is not None else []
+    report["readiness"] = readiness.as_dict()
+    return report
+
+@app.get("/api/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/api/executor")
+async def get_executor_stats():
+    return crud_executor.stats()
+
+@app.get("/api/admission")
+async def get_admission_stats():
+    return admission.stats() if admission is not None else {"enabled": False}
+
+@app.get("/api/result-cache")
+async def get_result_cache_stats():
+    return result_cache.stats() if result_cache is not None else {"enabled": False}
+
+startup_report.budget_ms = settings.startup_budget_ms
+if settings.lazy_routers:
+    startup_report.mode = "lazy"
+    lazy_loader = LazyRouterLoader(app, manifest)
+    lazy_loader.register()
+
+    _build_openapi = app.openapi
+
+    def lazy_openapi():
+        # The schema must describe every route, so pull in whatever is still pending
+        if app.openapi_schema is None:
+            lazy_loader.load_all_sync(trigger="openapi")
+        return _build_openapi()
+
+    app.openapi = lazy_openapi
+elif manifest is not None:
+    include_all_routers(app, [entry["module"] for entry in manifest])
+else:
+    include_all_routers(app)
+if manifest is not None and settings.router_manifest_scan:
+    # Lets a router added in development serve before the manifest is rebuilt; CI catches
+    # the drift with `python -m app.core.artifacts check`, so production skips the scan
+    unlisted = unlisted_routers(manifest)
+    if unlisted:
+        logger.warning(
+            "router_manifest.json does not list %s; including them eagerly. Run `python -m app.core.artifacts build`",
+            ", ".join(unlisted),
+        )
+        include_all_routers(app, unlisted)
+
+precompiled_openapi = PrecompiledOpenAPI()
+if settings.precompiled_openapi and precompiled_openapi.available:
+    precompiled_openapi.install(app)
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
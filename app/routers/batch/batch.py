@@ -0,0 +1,32 @@
+from fastapi import APIRouter, status
+from ...core.config import get_settings
+from ...core.serialization import ORJSONRoute
+from ...crud.batch.batch_crud import TOOLS, run_batch_logic
+from ...schemas.batch.batch_schema import BatchRequest, BatchResponse
+
+router = APIRouter(prefix="/batch", tags=["Batch"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "", {"operations": [{"tool": "hash.generate", "params": {"text": "warm-up", "algorithm": "sha256"}}]}),
+]
+
+@router.post(
+    "",
+    summary="Run many tool invocations in one request",
+    description="Runs an array of {tool, params} operations against the tool functions directly. Each item gets its own status, result and error; one failing item does not fail the batch.",
+    response_description="Per-operation results in request order",
+    response_model=BatchResponse,
+    status_code=status.HTTP_200_OK
+)
+async def run_batch(request: BatchRequest):
+    settings = get_settings()
+    return await run_batch_logic(request.operations, settings.batch_max_operations, settings.batch_concurrency)
+
+@router.get(
+    "/tools",
+    summary="List batchable tools",
+    description="Returns the tool names accepted by the batch endpoint.",
+)
+async def list_batch_tools():
+    return {"tools": sorted(TOOLS)}
@@ -5,14 +5,20 @@ from ...schemas.converters.base_converter_schema import (
     NumberInput,
     ConversionResponse
 )
+from ...core.serialization import ORJSONRoute
 
 
 router = APIRouter(
     prefix="/base-converter",
     tags=["Base Converter"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
+WARMUP_REQUESTS = [
+    ("POST", "/base-convert", {"number": "ff7a", "source_base": 16, "target_base": 2}),
+]
+
 @router.post(
     "/base-convert",
     summary="Convert number between bases",
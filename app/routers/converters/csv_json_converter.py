@@ -1,59 +1,222 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+import itertools
+import tempfile
+from typing import BinaryIO, Literal, Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 from ...schemas.converters.csv_json_schema import (
     ConversionResponse,
+    CSVConversionResponse,
     JSONInput,
 )
 from ...crud.converters.csv_json_crud import (
+    JSONCSVWriter,
     csv_to_json_logic,
+    csv_to_json_stream,
     json_to_csv_logic,
 )
+from ...core.serialization import ORJSONRoute
+from ...core.body_limit import max_body_size
+from ...core.config import get_settings
+from ...core.executor import run_crud
+from ...core.coalescing import run_coalesced
+from ...core.decompression import iter_upload, read_upload, upload_encoding
+from ...core.raw_body import CSV_TYPES, JSON_TYPES, raw_openapi, raw_response, read_raw_body
 
 router = APIRouter(
     prefix="/csv-json",
     tags=["CSV - JSON/XML"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing and JSON escaping
+STREAM_MAX_FILE_SIZE = 512 * 1024 * 1024  # 512MB; the streaming route holds one chunk of rows at a time
+COST_CLASS = "file-conversion"
+WARMUP_REQUESTS = [
+    ("POST", "/json-to-csv", {"json_data": "[{\"id\": 1, \"user\": {\"name\": \"a\"}}]"}),
+    ("POST", "/csv-to-json-raw", b"id,user_name\n1,a\n", "text/csv"),
+    ("POST", "/csv-to-json-raw?engine=pandas", b"id,user_name\n1,a\n", "text/csv"),
+]
+
+async def _spool_upload(file: UploadFile) -> BinaryIO:
+    """Copy the decompressed upload to an anonymous temp file, rewound, for the streaming routes to read back."""
+    spool = tempfile.TemporaryFile()
+    size = 0
+    try:
+        async for chunk in iter_upload(file, STREAM_MAX_FILE_SIZE):
+            size += len(chunk)
+            await run_in_threadpool(spool.write, chunk)
+        if not size:
+            raise HTTPException(status_code=400, detail="File is empty")
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
 
 @router.post(
     "/csv-to-json",
     summary="Convert CSV File to JSON",
-    description="Converts an uploaded CSV file (.csv) to JSON format. Max file size: 10MB.",
+    description="Converts an uploaded CSV file (.csv, or .csv.gz/.csv.zst/.csv.bz2) to JSON format. Max file size: 10MB after decompression. `engine` picks the CSV reader: `auto` (default) uses the stdlib reader for small files and pandas for large ones; both give the same JSON.",
     response_description="JSON representation of the CSV file data",
     response_model=ConversionResponse,
     status_code=status.HTTP_200_OK
 )
-async def csv_to_json(file: UploadFile = File(...), separator: str = Form('_')):
-    try:
-        if not file.filename.lower().endswith(".csv"):
-            raise HTTPException(status_code=400, detail="Only .csv files are supported")
-        
-        if file.size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"File size exceeds {MAX_FILE_SIZE/1024/1024}MB limit")
-
-        contents = await file.read()
-        if not contents:
-            raise HTTPException(status_code=400, detail="File is empty")
+async def csv_to_json(
+    file: UploadFile = File(...),
+    separator: str = Form('_'),
+    engine: Literal["auto", "stdlib", "pandas"] = Form("auto"),
+):
+    filename, _ = upload_encoding(file)
+    if not filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only .csv files are supported")
 
-        return csv_to_json_logic(contents, separator=separator)
+    # Counts decompressed bytes as they are read instead of trusting file.size
+    contents = (await read_upload(file, MAX_FILE_SIZE)).content
+    if not contents:
+        raise HTTPException(status_code=400, detail="File is empty")
+
+    try:
+        return await run_coalesced("csv-to-json", csv_to_json_logic, contents, separator=separator, engine=engine)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CSV to JSON conversion failed: {str(e)}")
 
+@router.post(
+    "/csv-to-json-stream",
+    summary="Stream a CSV File as JSON",
+    description="Converts an uploaded CSV file (.csv, or .csv.gz/.csv.zst/.csv.bz2) row chunk by row chunk and streams the result, as NDJSON (one compact object per line, the default) or as a JSON array. The file is read once up front to fix each column's type, so values match /csv-to-json, and then streamed. Memory stays constant, so files up to 512MB after decompression are accepted.",
+    response_description="NDJSON lines or a JSON array of the CSV rows",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}, "application/json": {}}}},
+)
+@max_body_size(STREAM_MAX_FILE_SIZE + 1024 * 1024)
+async def csv_to_json_streaming(
+    file: UploadFile = File(...),
+    separator: str = Form('_'),
+    output: Literal["ndjson", "array"] = Form("ndjson"),
+):
+    filename, _ = upload_encoding(file)
+    if not filename.lower().endswith(".csv"):
+        raise HTTPException(status_code=400, detail="Only .csv files are supported")
+
+    spool = await _spool_upload(file)
+    ndjson = output == "ndjson"
+    stream = csv_to_json_stream(spool, separator=separator, ndjson=ndjson)
+    try:
+        # Parse the first chunk now so bad input still gets a 400 instead of a cut-off body
+        head = await run_in_threadpool(next, stream, b"")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        itertools.chain([head], stream),
+        media_type="application/x-ndjson" if ndjson else "application/json",
+    )
+
 @router.post(
     "/json-to-csv",
     summary="Convert JSON to CSV",
-    description="Converts provided JSON data to CSV format.",
+    description="Converts provided JSON data to CSV format. By default every list explodes into rows; `flatten` selects index-suffixed columns, a single exploded path or JSON-encoded cells instead. Requests whose exploded row count exceeds the server limit are rejected unless `on_overflow` names a fallback strategy.",
     response_description="CSV representation of the JSON data",
-    response_model=ConversionResponse,
+    response_model=CSVConversionResponse,
     status_code=status.HTTP_200_OK
 )
 async def json_to_csv(input: JSONInput):
     try:
-        return json_to_csv_logic(input.json_data, separator=input.separator)
+        return await run_crud(
+            json_to_csv_logic, input.json_data, separator=input.separator, flatten=input.flatten, explode_path=input.explode_path,
+            max_rows=get_settings().json_csv_max_rows, on_overflow=input.on_overflow, size=len(input.json_data),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"JSON to CSV conversion failed: {str(e)}")
+
+@router.post(
+    "/json-to-csv-stream",
+    summary="Stream a JSON File as CSV",
+    description="Converts an uploaded JSON file (.json, or .json.gz/.json.zst/.json.bz2) to CSV with the same flatten options as /json-to-csv. Records are parsed and flattened one at a time and spooled to disk, then the CSV is streamed, so memory stays at about one record. Files up to 512MB after decompression are accepted, and the row limit is higher than /json-to-csv's. The strategy used is sent in X-Flatten-Strategy.",
+    response_description="CSV representation of the JSON file",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/csv": {}}}},
+)
+@max_body_size(STREAM_MAX_FILE_SIZE + 1024 * 1024)
+async def json_to_csv_streaming(
+    file: UploadFile = File(...),
+    separator: str = Form('_'),
+    flatten: Literal["explode", "index", "explode-path", "json"] = Form("explode"),
+    explode_path: Optional[str] = Form(None),
+    on_overflow: Optional[Literal["index", "json"]] = Form(None),
+):
+    filename, _ = upload_encoding(file)
+    if not filename.lower().endswith(".json"):
+        raise HTTPException(status_code=400, detail="Only .json files are supported")
+
+    spool = await _spool_upload(file)
+    try:
+        # Pass 1 (parse, flatten, spool rows) runs before responding, so bad input is still a 400
+        writer = await run_in_threadpool(
+            JSONCSVWriter, spool, separator=separator, flatten=flatten, explode_path=explode_path,
+            max_rows=get_settings().json_csv_stream_max_rows, on_overflow=on_overflow,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        spool.close()
+    return StreamingResponse(
+        writer, media_type="text/csv", headers={"X-Flatten-Strategy": writer.flatten}, background=BackgroundTask(writer.close),
+    )
+
+@router.post(
+    "/csv-to-json-raw",
+    summary="Convert a raw CSV body to JSON",
+    description="Takes the CSV document itself as the request body (Content-Type: text/csv) and returns the JSON document without the `result` envelope. Max body size: 10MB after decompression. Takes the same `engine` option as /csv-to-json.",
+    response_description="JSON representation of the CSV body",
+    response_class=Response,
+    openapi_extra=raw_openapi(CSV_TYPES, "application/json"),
+)
+async def csv_to_json_raw(
+    request: Request,
+    separator: str = Query('_'),
+    engine: Literal["auto", "stdlib", "pandas"] = Query("auto"),
+):
+    contents = await read_raw_body(request, CSV_TYPES, MAX_FILE_SIZE)
+    try:
+        return await run_coalesced("csv-to-json-raw", csv_to_json_logic, contents, raw_media_type="application/json", separator=separator, engine=engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"CSV to JSON conversion failed: {str(e)}")
+
+@router.post(
+    "/json-to-csv-raw",
+    summary="Convert a raw JSON body to CSV",
+    description="Takes the JSON document itself as the request body (Content-Type: application/json) and returns the CSV document (text/csv). Accepts the same flatten options as /json-to-csv as query parameters; the strategy used is sent in X-Flatten-Strategy.",
+    response_description="CSV representation of the JSON body",
+    response_class=Response,
+    openapi_extra=raw_openapi(JSON_TYPES, "text/csv"),
+)
+async def json_to_csv_raw(
+    request: Request,
+    separator: str = Query('_'),
+    flatten: Literal["explode", "index", "explode-path", "json"] = Query("explode"),
+    explode_path: Optional[str] = Query(None),
+    on_overflow: Optional[Literal["index", "json"]] = Query(None),
+):
+    contents = await read_raw_body(request, JSON_TYPES, MAX_FILE_SIZE)
+    try:
+        result = await run_crud(
+            json_to_csv_logic, contents.decode("utf-8"), separator=separator, flatten=flatten, explode_path=explode_path,
+            max_rows=get_settings().json_csv_max_rows, on_overflow=on_overflow, size=len(contents),
+        )
+        response = raw_response(result, "text/csv")
+        response.headers["X-Flatten-Strategy"] = result.flatten
+        return response
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"JSON to CSV conversion failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"JSON to CSV conversion failed: {str(e)}")
@@ -1,28 +1,33 @@
 import json
 import re
 import logging
-import tempfile
-import ijson
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Response, UploadFile
 from typing import Dict, Any
 from ...crud.converters.json_python_crud import json_to_python_logic
 from ...schemas.converters.json_python_schema import (
     JSONInput,
     ConversionResponse
 )
+from ...core.serialization import ORJSONRoute
+from ...core.executor import run_crud
+from ...core.decompression import read_upload, upload_encoding
+from ...core.raw_body import JSON_TYPES, raw_openapi, raw_response, read_raw_body
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/json-python",
     tags=["JSON - Python"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing and JSON escaping
+COST_CLASS = "codegen"
+WARMUP_REQUESTS = [
+    ("POST", "/json-to-python", {"json_data": "{\"id\": 1, \"tags\": [\"a\"], \"user\": {\"name\": \"a\"}}", "class_name": "Root"}),
+]
 
 @router.post(
     "/json-to-python",
@@ -62,14 +67,14 @@ CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
     }
 )
 async def json_to_python(input: JSONInput):
-    logger.info(f"Processing JSON to Python dataclass with class name: {input.class_name}")
+    logger.info("Processing JSON to Python dataclass with class name: %s", input.class_name)
     try:
-        return json_to_python_logic(input.json_data, input.class_name)
+        return await run_crud(json_to_python_logic, input.json_data, input.class_name, size=len(input.json_data))
     except ValueError as e:
-        logger.error(f"ValueError in JSON conversion: {str(e)}")
+        logger.error("ValueError in JSON conversion: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Unexpected error in JSON conversion: {str(e)}")
+        logger.error("Unexpected error in JSON conversion: %s", e)
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
 @router.post(
@@ -110,12 +115,13 @@ async def json_to_python(input: JSONInput):
     }
 )
 async def convert_json_to_python_file(file: UploadFile = File(...), class_name: str = Form(default="Root")):
-    logger.info(f"Processing JSON file upload with class name: {class_name}")
+    logger.info("Processing JSON file upload with class name: %s", class_name)
     
-    if not file.filename.lower().endswith(".json"):
+    filename, encoding = upload_encoding(file)
+    if not filename.lower().endswith(".json"):
         logger.error("Invalid file extension")
         raise HTTPException(status_code=400, detail="Only .json files are supported")
-    if file.content_type != "application/json":
+    if encoding is None and file.content_type != "application/json":
         logger.error("Invalid content type")
         raise HTTPException(status_code=400, detail="Invalid content type. Expected JSON")
     if not re.match(r'^[a-zA-Z_$][a-zA-Z0-9_$]*$', class_name):
@@ -123,47 +129,47 @@ async def convert_json_to_python_file(file: UploadFile = File(...), class_name:
         raise HTTPException(status_code=400, detail="Invalid class name. Must be a valid Python identifier")
 
     try:
-        # Use tempfile for safe temporary file management
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".json") as temp_file:
-            size = 0
-            while True:
-                chunk = await file.read(CHUNK_SIZE)
-                if not chunk:
-                    break
-                size += len(chunk)
-                if size > MAX_FILE_SIZE:
-                    await file.close()
-                    logger.error("File size exceeds limit")
-                    raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-                temp_file.write(chunk)
-            
-            # Reset file position for parsing
-            temp_file.seek(0)
-            # Parse JSON incrementally with ijson
-            json_data = next(ijson.items(temp_file, ""), None)
-        
-        # Clean up temporary file
-        import os
-        os.unlink(temp_file.name)
-        
-        if json_data is None:
-            await file.close()
-            logger.error("Invalid JSON format")
-            raise HTTPException(status_code=400, detail="Invalid JSON format")
-
-        result = json_to_python_logic(json.dumps(json_data), class_name)
+        # Decompresses .gz/.zst/.bz2 uploads; the 10MB limit applies to the decompressed bytes.
+        # The crud parses the bytes itself (orjson), in the executor for big files
+        upload = await read_upload(file, MAX_FILE_SIZE)
+        result = await run_crud(json_to_python_logic, upload.content, class_name, size=len(upload.content))
         await file.close()
         return result
     
+    except HTTPException:
+        await file.close()
+        raise
     except json.JSONDecodeError:
         await file.close()
         logger.error("Invalid JSON format")
         raise HTTPException(status_code=400, detail="Invalid JSON format")
     except ValueError as e:
         await file.close()
-        logger.error(f"ValueError in JSON file conversion: {str(e)}")
+        logger.error("ValueError in JSON file conversion: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         await file.close()
-        logger.error(f"Unexpected error in JSON file conversion: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        logger.error("Unexpected error in JSON file conversion: %s", e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post(
+    "/json-to-python-raw",
+    summary="Convert a raw JSON body to Python dataclass definitions",
+    description="Takes the JSON document itself as the request body (Content-Type: application/json) and returns the generated Python source (text/x-python). Maximum body size is 10MB.",
+    response_description="Python dataclass definitions of the JSON body",
+    response_class=Response,
+    openapi_extra=raw_openapi(JSON_TYPES, "text/x-python"),
+)
+async def json_to_python_raw(request: Request, class_name: str = Query(default="Root")):
+    if not re.match(r'^[a-zA-Z_$][a-zA-Z0-9_$]*$', class_name):
+        raise HTTPException(status_code=400, detail="Invalid class name. Must be a valid Python identifier")
+    contents = await read_raw_body(request, JSON_TYPES, MAX_FILE_SIZE)
+    try:
+        result = await run_crud(json_to_python_logic, contents, class_name, size=len(contents))
+        return raw_response(result, "text/x-python")
+    except ValueError as e:
+        logger.error("ValueError in raw JSON conversion: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Unexpected error in raw JSON conversion: %s", e)
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
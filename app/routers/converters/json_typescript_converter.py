@@ -1,17 +1,26 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Form
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Form, Query, Request, Response
 import json
 import re
 from ...crud.converters.json_typescript_crud import json_to_typescript_logic
 from ...schemas.converters.json_typescript_schema import ConversionResponse, JSONInput
+from ...core.serialization import ORJSONRoute, loads_json
+from ...core.executor import run_crud
+from ...core.decompression import read_upload, upload_encoding
+from ...core.raw_body import JSON_TYPES, raw_openapi, raw_response, read_raw_body
 
 router = APIRouter(
     prefix="/json-ts",
     tags=["JSON - TypeScript"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing and JSON escaping
+COST_CLASS = "codegen"
+WARMUP_REQUESTS = [
+    ("POST", "/json-to-typescript", {"json_data": "{\"id\": 1, \"tags\": [\"a\"], \"user\": {\"name\": \"a\"}}", "interface_name": "Root"}),
+]
 
 @router.post(
     "/json-to-typescript",
@@ -22,7 +31,7 @@ CHUNK_SIZE = 1024 * 1024  # 1MB chunks for reading
 )
 async def json_to_typescript(input: JSONInput):
     try:
-        return json_to_typescript_logic(input.json_data, input.interface_name)
+        return await run_crud(json_to_typescript_logic, input.json_data, input.interface_name, size=len(input.json_data))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -36,34 +45,52 @@ async def json_to_typescript(input: JSONInput):
     response_model=ConversionResponse
 )
 async def convert_json_to_typescript_file(file: UploadFile = File(...), interface_name: str = Form(default="Data")):
-    if not file.filename.lower().endswith(".json"):
+    filename, encoding = upload_encoding(file)
+    if not filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Only .json files are supported")
-    if file.content_type != "application/json":
+    if encoding is None and file.content_type != "application/json":
         raise HTTPException(status_code=400, detail="Invalid content type. Expected JSON")
     if not re.match(r'^[a-zA-Z_$][a-zA-Z0-9_$]*$', interface_name):
         raise HTTPException(status_code=400, detail="Invalid interface name. Must be a valid TypeScript identifier")
     
-    size = 0
-    contents = b""
-    while True:
-        chunk = await file.read(CHUNK_SIZE)
-        if not chunk:
-            break
-        size += len(chunk)
-        if size > MAX_FILE_SIZE:
-            await file.close()
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-        contents += chunk
-    
-    await file.close()
+    try:
+        # Reads in chunks and stops at 10MB of decompressed content
+        contents = (await read_upload(file, MAX_FILE_SIZE)).content
+    finally:
+        await file.close()
+    size = len(contents)
     
     try:
-        data = json.loads(contents.decode('utf-8'))
-        result = json_to_typescript_logic(data, interface_name)
+        data = loads_json(contents.decode('utf-8'))
+        result = await run_crud(json_to_typescript_logic, data, interface_name, size=size)
         return result
     except json.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON format")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post(
+    "/json-to-typescript-raw",
+    summary="Convert a raw JSON body to TypeScript interface",
+    description="Takes the JSON document itself as the request body (Content-Type: application/json) and returns the TypeScript source (application/typescript). Maximum body size is 10MB.",
+    response_description="TypeScript interface of the JSON body",
+    response_class=Response,
+    openapi_extra=raw_openapi(JSON_TYPES, "application/typescript"),
+)
+async def json_to_typescript_raw(request: Request, interface_name: str = Query(default="Data")):
+    if not re.match(r'^[a-zA-Z_$][a-zA-Z0-9_$]*$', interface_name):
+        raise HTTPException(status_code=400, detail="Invalid interface name. Must be a valid TypeScript identifier")
+    contents = await read_raw_body(request, JSON_TYPES, MAX_FILE_SIZE)
+
+    try:
+        data = loads_json(contents)
+        result = await run_crud(json_to_typescript_logic, data, interface_name, size=len(contents))
+        return raw_response(result, "application/typescript")
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON format")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -8,8 +8,13 @@ from ...schemas.converters.px_rem_em_schema import (
     ConversionRequest,
     ConversionResponse
 )
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/px-rem-em", tags=["PX-REM-EM Converter"])
+router = APIRouter(prefix="/px-rem-em", tags=["PX-REM-EM Converter"], route_class=ORJSONRoute)
+
+WARMUP_REQUESTS = [
+    ("GET", "/", {"conversion_type": "px-to-rem-em", "value": 24}),
+]
 
 # Constants
 DEFAULT_FONT_SIZE = 16
@@ -6,13 +6,21 @@ from ...schemas.converters.text_base_converter_schema import (
     BaseInput,
     ConversionResponse
 )
+from ...core.serialization import ORJSONRoute
 
 router = APIRouter(
     prefix="/text-base",
     tags=["Text - Base Converter"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/text-to-base", {"input_text": "HelloWorld123", "target_base": 16}),
+    ("POST", "/base-to-text", {"base_text": "48 65 6C 6C 6F", "source_base": 16}),
+]
+
 @router.post(
     "/text-to-base",
     summary="Convert text to base numbers",
@@ -2,13 +2,19 @@ from fastapi import APIRouter, Body
 import pytz
 from ...schemas.converters.timezone_converter_schema import TimezoneRequest
 from ...crud.converters.timezone_converter_crud import convert_timezone_logic
+from ...core.serialization import ORJSONRoute
 
 router = APIRouter(
     prefix="/timezone-converter",
     tags=["Timezone Converter"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
+WARMUP_REQUESTS = [
+    ("POST", "/", {"datetime_str": "2024-05-01 12:30:00", "from_timezone": "UTC", "to_timezone": "Asia/Kolkata"}),
+]
+
 @router.post(
     "/",
     summary="Convert datetime between timezones",
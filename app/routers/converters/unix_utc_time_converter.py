@@ -2,13 +2,20 @@ from fastapi import APIRouter
 from fastapi import Body
 from ...crud.converters.unix_utc_time_crud import unix_to_utc_logic, utc_to_unix_logic
 from ...schemas.converters.unix_utc_time_schema import UnixTimeRequest, UnixTimeResponse, UtcTimeRequest, UtcTimeResponse
+from ...core.serialization import ORJSONRoute
 
 router = APIRouter(
     prefix="/unix-utc",
     tags=["Unix <-> UTC Converter"],
-    responses={404: {"description": "Not found"}}
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
 )
 
+WARMUP_REQUESTS = [
+    ("POST", "/unix-to-utc", {"timestamp": 1714566600}),
+    ("POST", "/utc-to-unix", {"datetime_utc": "2024-05-01 12:30:00"}),
+]
+
 @router.post(
     "/unix-to-utc",
     response_model=UnixTimeResponse,
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, Response, UploadFile
 from fastapi.responses import JSONResponse
 from ...crud.converters.xml_json_converter_crud import (
     json_xml_file_logic,
@@ -11,8 +11,21 @@ from ...schemas.converters.xml_json_converter_schema import (
     JSONInput,
     XMLInput
 )
+from ...core.serialization import ORJSONRoute
+from ...core.executor import run_crud
+from ...core.coalescing import run_coalesced
+from ...core.decompression import read_upload, upload_encoding
+from ...core.raw_body import JSON_TYPES, XML_TYPES, raw_openapi, raw_response, read_raw_body
 
-router = APIRouter(prefix="/xml-json", tags=["XML - JSON"])
+router = APIRouter(prefix="/xml-json", tags=["XML - JSON"], route_class=ORJSONRoute)
+
+MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing and JSON escaping
+COST_CLASS = "file-conversion"
+WARMUP_REQUESTS = [
+    ("POST", "/xml-to-json", {"xml_text": "<root><item id=\"1\">a</item><item id=\"2\">b</item></root>"}),
+    ("POST", "/json-to-xml", {"json_text": "{\"root\": {\"item\": [\"a\", \"b\"]}}"}),
+]
 
 @router.post(
     "/xml-to-json",
@@ -22,7 +35,7 @@ router = APIRouter(prefix="/xml-json", tags=["XML - JSON"])
     response_model=ConversionResponse
 )
 async def xml_to_json(input: XMLInput):
-    result = xml_json_logic(input.xml_text)
+    result = await run_crud(xml_json_logic, input.xml_text, size=len(input.xml_text))
     return ConversionResponse(result=result)
 
 @router.post(
@@ -33,11 +46,9 @@ async def xml_to_json(input: XMLInput):
     response_model=ConversionResponse
 )
 async def json_to_xml(input: JSONInput):
-    result = json_xml_logic(input.json_text)
+    result = await run_crud(json_xml_logic, input.json_text, size=len(input.json_text))
     return ConversionResponse(result=result)
 
-MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
-
 @router.post(
     "/xml-to-json-file",
     summary="Convert XML file to JSON",
@@ -47,23 +58,18 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
 )
 async def convert_xml_to_json(file: UploadFile = File(...)):
     # Validate file extension
-    if not file.filename.lower().endswith(".xml"):
+    filename, encoding = upload_encoding(file)
+    if not filename.lower().endswith(".xml"):
         raise HTTPException(status_code=400, detail="Only XML files (.xml) are supported")
 
-    # Validate content type
-    if file.content_type not in ["application/xml", "text/xml"]:
+    # Validate content type (compressed uploads carry the archive's type)
+    if encoding is None and file.content_type not in ["application/xml", "text/xml"]:
         raise HTTPException(status_code=400, detail="Invalid content type. Must be XML")
 
-    # Check file size
-    file_size = 0
-    contents = b""
-
     try:
-        contents = await file.read()
-        file_size = len(contents)
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"File size exceeds {MAX_FILE_SIZE / (1024 * 1024)}MB limit")
-        return xml_json_file_logic(contents)
+        # The size limit applies to the decompressed bytes
+        contents = (await read_upload(file, MAX_FILE_SIZE)).content
+        return await run_coalesced("xml-to-json-file", xml_json_file_logic, contents)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -78,24 +84,53 @@ async def convert_xml_to_json(file: UploadFile = File(...)):
 )
 async def convert_json_to_xml(file: UploadFile = File(...)):
     # Validate file extension
-    if not file.filename.lower().endswith(".json"):
+    filename, encoding = upload_encoding(file)
+    if not filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Only JSON files (.json) are supported")
 
-    # Validate content type
-    if file.content_type != "application/json":
+    # Validate content type (compressed uploads carry the archive's type)
+    if encoding is None and file.content_type != "application/json":
         raise HTTPException(status_code=400, detail="Invalid content type. Must be JSON")
 
-    # Check file size
-    file_size = 0
-    contents = b""
+    try:
+        # The size limit applies to the decompressed bytes
+        contents = (await read_upload(file, MAX_FILE_SIZE)).content
+        return await run_crud(json_xml_file_logic, contents, size=len(contents))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+@router.post(
+    "/xml-to-json-raw",
+    summary="Convert a raw XML body to JSON",
+    description="Takes the XML document itself as the request body (Content-Type: application/xml or text/xml) and returns the JSON document without the `result` envelope.",
+    response_description="JSON representation of the XML body",
+    response_class=Response,
+    openapi_extra=raw_openapi(XML_TYPES, "application/json"),
+)
+async def xml_to_json_raw(request: Request):
+    contents = await read_raw_body(request, XML_TYPES, MAX_FILE_SIZE)
+    try:
+        return await run_coalesced("xml-to-json-raw", xml_json_file_logic, contents, raw_media_type="application/json")
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post(
+    "/json-to-xml-raw",
+    summary="Convert a raw JSON body to XML",
+    description="Takes the JSON document itself as the request body (Content-Type: application/json) and returns the XML document (application/xml).",
+    response_description="XML representation of the JSON body",
+    response_class=Response,
+    openapi_extra=raw_openapi(JSON_TYPES, "application/xml"),
+)
+async def json_to_xml_raw(request: Request):
+    contents = await read_raw_body(request, JSON_TYPES, MAX_FILE_SIZE)
     try:
-        contents = await file.read()
-        file_size = len(contents)
-        if file_size > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail=f"File size exceeds {MAX_FILE_SIZE / (1024 * 1024)}MB limit")
-        return json_xml_file_logic(contents)
+        return raw_response(await run_crud(json_xml_file_logic, contents, size=len(contents)), "application/xml")
     except HTTPException as e:
         raise e
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, File, HTTPException, UploadFile
+from fastapi import APIRouter, File, HTTPException, Request, Response, UploadFile
 from ...schemas.converters.yaml_json_converter_schema import (
     YAMLInput,
     JSONInput,
@@ -10,9 +10,20 @@ from ...crud.converters.yaml_json_converter_crud import (
     yaml_json_file_logic,
     json_yaml_file_logic,
 )
+from ...core.serialization import ORJSONRoute
+from ...core.executor import run_crud
+from ...core.coalescing import run_coalesced
+from ...core.decompression import read_upload, upload_encoding
+from ...core.raw_body import JSON_TYPES, YAML_TYPES, raw_openapi, raw_response, read_raw_body
 
-router = APIRouter(prefix="/yaml-json", tags=["YAML - JSON"])
+router = APIRouter(prefix="/yaml-json", tags=["YAML - JSON"], route_class=ORJSONRoute)
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing and JSON escaping
+COST_CLASS = "file-conversion"
+WARMUP_REQUESTS = [
+    ("POST", "/yaml-to-json", {"yaml_text": "id: 1\ncreated: 2024-05-01\ntags: [a, b]\n"}),
+    ("POST", "/json-to-yaml", {"json_text": "{\"id\": 1, \"tags\": [\"a\", \"b\"]}"}),
+]
 
 @router.post(
     "/yaml-to-json",
@@ -22,7 +33,7 @@ MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
     response_model=ConversionResponse
 )
 async def yaml_to_json(input: YAMLInput):
-    return yaml_to_json_logic(input.yaml_text)
+    return await run_crud(yaml_to_json_logic, input.yaml_text, size=len(input.yaml_text))
 
 @router.post(
     "/json-to-yaml",
@@ -32,7 +43,7 @@ async def yaml_to_json(input: YAMLInput):
     response_model=ConversionResponse
 )
 async def json_to_yaml(input: JSONInput):
-    return json_to_yaml_logic(input.json_text)
+    return await run_crud(json_to_yaml_logic, input.json_text, size=len(input.json_text))
 
 @router.post(
     "/yaml-to-json-file",
@@ -43,14 +54,14 @@ async def json_to_yaml(input: JSONInput):
 )
 async def convert_yaml_to_json(file: UploadFile = File(...)):
     # Validate file extension first
-    if not file.filename.lower().endswith((".yaml", ".yml")):
+    filename, _ = upload_encoding(file)
+    if not filename.lower().endswith((".yaml", ".yml")):
         raise HTTPException(status_code=400, detail="Only .yaml or .yml files are supported")
-    
+
+    # Read outside the try so size and decompression errors keep their 400
+    contents = (await read_upload(file, MAX_FILE_SIZE)).content
     try:
-        contents = await file.read()
-        if len(contents) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-        return yaml_json_file_logic(contents)
+        return await run_coalesced("yaml-to-json-file", yaml_json_file_logic, contents)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
@@ -62,14 +73,47 @@ async def convert_yaml_to_json(file: UploadFile = File(...)):
     response_model=ConversionResponse
 )
 async def convert_json_to_yaml(file: UploadFile = File(...)):
-    if not file.filename.lower().endswith(".json"):
+    filename, encoding = upload_encoding(file)
+    if not filename.lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Only .json files are supported")
-    if file.content_type != "application/json":
+    if encoding is None and file.content_type != "application/json":
         raise HTTPException(status_code=400, detail="Invalid content type. Expected JSON")
+    contents = (await read_upload(file, MAX_FILE_SIZE)).content
+    try:
+        return await run_crud(json_yaml_file_logic, contents, size=len(contents))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post(
+    "/yaml-to-json-raw",
+    summary="Convert a raw YAML body to JSON",
+    description="Takes the YAML document itself as the request body (Content-Type: application/yaml or text/yaml) and returns the JSON document without the `result` envelope.",
+    response_description="JSON representation of the YAML body",
+    response_class=Response,
+    openapi_extra=raw_openapi(YAML_TYPES, "application/json"),
+)
+async def yaml_to_json_raw(request: Request):
+    contents = await read_raw_body(request, YAML_TYPES, MAX_FILE_SIZE)
     try:
-        contents = await file.read()
-        if len(contents) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=400, detail="File size exceeds 10MB limit")
-        return json_yaml_file_logic(contents)
+        return await run_coalesced("yaml-to-json-raw", yaml_json_file_logic, contents, raw_media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+@router.post(
+    "/json-to-yaml-raw",
+    summary="Convert a raw JSON body to YAML",
+    description="Takes the JSON document itself as the request body (Content-Type: application/json) and returns the YAML document (application/yaml).",
+    response_description="YAML representation of the JSON body",
+    response_class=Response,
+    openapi_extra=raw_openapi(JSON_TYPES, "application/yaml"),
+)
+async def json_to_yaml_raw(request: Request):
+    contents = await read_raw_body(request, JSON_TYPES, MAX_FILE_SIZE)
+    try:
+        return raw_response(await run_crud(json_yaml_file_logic, contents, size=len(contents)), "application/yaml")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
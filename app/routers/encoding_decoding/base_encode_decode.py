@@ -10,8 +10,15 @@ from ...crud.encoding_decoding.base_encode_decode_crud import (
     base_encode_logic,
     base_decode_logic,
 )
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/base", tags=["Base-Encoder-Decoder"])
+router = APIRouter(prefix="/base", tags=["Base-Encoder-Decoder"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/encode", {"text": "Hello, World!", "base_type": "base64"}),
+    ("POST", "/decode", {"encoded_text": "SGVsbG8sIFdvcmxkIQ==", "base_type": "base64"}),
+]
 
 @router.post(
     "/encode",
@@ -11,8 +11,15 @@ from ...crud.encoding_decoding.cipher_crud import (
     caesar_cipher_logic,
     validate_text_has_alnum,
 )
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/cipher", tags=["Cipher"])
+router = APIRouter(prefix="/cipher", tags=["Cipher"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/rot13", {"text": "Hello, World!"}),
+    ("POST", "/caesar", {"text": "Hello, World!", "shift": 3}),
+]
 
 @router.post(
     "/rot13",
@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Query
 from ...crud.encoding_decoding.guid_generator_crud import get_guid_logic, get_bulk_guids_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/guid", tags=["GUID"])
+router = APIRouter(prefix="/guid", tags=["GUID"], route_class=ORJSONRoute)
+
+# Random output: responses must not be cached
+RESULT_CACHEABLE = False
+
+WARMUP_REQUESTS = [
+    ("GET", "/", None),
+]
 
 @router.get(
     "/",
@@ -1,8 +1,14 @@
 from fastapi import APIRouter
 from ...crud.encoding_decoding.hash_generator_crud import generate_hash_logic
 from ...schemas.encoding_decoding.hash_generator_schema import HashRequest, HashResponse
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/hash", tags=["Hash"])
+router = APIRouter(prefix="/hash", tags=["Hash"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/generate", {"text": "Hello, World!", "algorithm": "sha256"}),
+]
 
 @router.post(
     "/generate",
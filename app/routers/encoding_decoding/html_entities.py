@@ -1,8 +1,15 @@
 from fastapi import APIRouter, Query, HTTPException
 from pydantic import BaseModel
 from ...crud.encoding_decoding.html_entities_crud import encode_html_entities_logic, decode_html_entities_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/html-entities", tags=["HTML Entities"])
+router = APIRouter(prefix="/html-entities", tags=["HTML Entities"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/encode", {"text": "<a href='x'>Tom & Jerry</a>"}),
+    ("POST", "/decode", {"text": "&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;"}),
+]
 
 # Pydantic models for response structure
 class EncodeResponse(BaseModel):
@@ -1,8 +1,16 @@
 from fastapi import APIRouter
 from ...crud.encoding_decoding.jwt_crud import decode_jwt_logic, encode_jwt_logic
 from ...schemas.encoding_decoding.jwt_schema import JWTDecodeRequest, JWTDecodeResponse, JWTEncodeRequest, JWTEncodeResponse
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/jwt", tags=["JWT Encoder/Decoder"])
+router = APIRouter(prefix="/jwt", tags=["JWT Encoder/Decoder"], route_class=ORJSONRoute)
+
+# Output depends on the clock (iat/exp), so responses must not be cached
+RESULT_CACHEABLE = False
+
+WARMUP_REQUESTS = [
+    ("POST", "/encode", {"payload": {"sub": "42"}, "secret": "warm-up-secret-with-enough-length"}),
+]
 
 @router.post(
     "/encode",
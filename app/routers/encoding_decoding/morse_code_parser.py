@@ -6,8 +6,16 @@ from ...crud.encoding_decoding.morse_code_parser_crud import (
     char_to_morse_file_logic,
     morse_to_char_file_logic,
 )
+from ...core.result_cache import no_result_cache
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/morse", tags=["Morse Code"])
+router = APIRouter(prefix="/morse", tags=["Morse Code"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/char-to-morse", {"text": "Hello World"}),
+    ("POST", "/morse-to-char", {"text": ".... . .-.. .-.. --- / .-- --- .-. .-.. -.."}),
+]
 
 @router.post(
     "/char-to-morse",
@@ -33,6 +41,7 @@ async def morse_to_char(payload: MorseInput):
     description="Converts a .txt file's content to Morse code and saves to a new file",
     response_description="Path to the generated Morse code file",
 )
+@no_result_cache
 async def char_to_morse_file(
     file_path: str
 ):
@@ -44,6 +53,7 @@ async def char_to_morse_file(
     description="Converts a Morse code .txt file to text and saves to a new file",
     response_description="Path to the generated text file",
 )
+@no_result_cache
 async def morse_to_char_file(
     file_path: str
 ):
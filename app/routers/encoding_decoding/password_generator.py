@@ -1,8 +1,16 @@
 from fastapi import APIRouter, Query
 from ...crud.encoding_decoding.password_generator_crud import generate_password_logic
 from typing import Optional
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/password", tags=["Password Generator"])
+router = APIRouter(prefix="/password", tags=["Password Generator"], route_class=ORJSONRoute)
+
+# Random output: responses must not be cached
+RESULT_CACHEABLE = False
+
+WARMUP_REQUESTS = [
+    ("GET", "/generate", {"length": 24}),
+]
 
 @router.get(
     "/generate",
@@ -1,7 +1,15 @@
 from fastapi import APIRouter, Query
 from ...crud.encoding_decoding.ulid_generator_crud import get_ulid_logic, get_bulk_ulids_logic, get_ulid_timestamp_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/ulid", tags=["ULID"])
+router = APIRouter(prefix="/ulid", tags=["ULID"], route_class=ORJSONRoute)
+
+# Random output: responses must not be cached
+RESULT_CACHEABLE = False
+
+WARMUP_REQUESTS = [
+    ("GET", "/", None),
+]
 
 @router.get(
     "/",
@@ -1,8 +1,15 @@
 from fastapi import APIRouter, Query
 from ...schemas.encoding_decoding.url_encode_decode_schema import URLEncodeResponse, URLDecodeResponse
 from ...crud.encoding_decoding.url_encode_decode_crud import encode_url_logic, decode_url_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/url", tags=["URL Encoder/Decoder"])
+router = APIRouter(prefix="/url", tags=["URL Encoder/Decoder"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("GET", "/encode", {"text": "a b&c=d/é"}),
+    ("GET", "/decode", {"encoded_text": "a%20b%26c%3Dd%2F%C3%A9"}),
+]
 
 @router.get("/encode", response_model=URLEncodeResponse)
 def encode_url(
@@ -14,8 +14,14 @@ from ...schemas.general_converters.time_converter_scehma import TimeConvertReque
 from ...schemas.general_converters.volume_converter_schema import VolumeConvertRequest, VolumeConvertResponse, UNIT_TO_LITERS
 from ...schemas.general_converters.weight_converter_schema import WeightConvertRequest, WeightConvertResponse, UNIT_TO_GRAMS
 from ...crud.general_converters.unit_converter_crud import convert_temperature_logic, convert_unit_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/unit-converter", tags=["General Converters"])
+router = APIRouter(prefix="/unit-converter", tags=["General Converters"], route_class=ORJSONRoute)
+
+WARMUP_REQUESTS = [
+    ("POST", "/length", {"value": 42.5, "unit": "km"}),
+    ("POST", "/temperature", {"value": 42.5, "unit": "celsius"}),
+]
 
 @router.post("/angle", response_model=AngleConvertResponse)
 async def convert_angle(data: AngleConvertRequest) -> AngleConvertResponse:
@@ -0,0 +1,117 @@
+from typing import Any, Dict, Literal, Optional
+from fastapi import APIRouter, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from ...core.config import get_settings
+from ...core.decompression import iter_upload, upload_encoding
+from ...core.jobs import SUCCEEDED, job_manager
+from ...core.serialization import ORJSONRoute
+from ...crud.jobs.jobs_crud import JOB_TOOLS, resolve_job_tool
+from ...schemas.jobs.jobs_schema import JobStatus
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["Jobs"],
+    responses={404: {"description": "Not found"}},
+    route_class=ORJSONRoute
+)
+
+MAX_FILE_SIZE = get_settings().jobs_max_input_bytes
+MAX_BODY_BYTES = MAX_FILE_SIZE + 1024 * 1024  # Headroom for multipart framing
+RESULT_CACHEABLE = False
+COST_CLASS = "text"  # Submitting only spools the upload to disk; the conversion runs in the job pool
+
+def _job_status(request: Request, meta: Dict[str, Any]) -> Dict[str, Any]:
+    ttl = job_manager.store.ttl
+    status_url = str(request.url_for("get_job", job_id=meta["id"]))
+    return {
+        **{key: value for key, value in meta.items() if key != "worker"},
+        "expires_at": (meta["finished_at"] or meta["created_at"]) + ttl,
+        "status_url": status_url,
+        "result_url": f"{status_url}/result" if meta["status"] == SUCCEEDED else None,
+    }
+
+def _read_job(job_id: str) -> Dict[str, Any]:
+    meta = job_manager.store.read(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return meta
+
+@router.post(
+    "/{tool}",
+    summary="Submit a conversion job",
+    description=f"Uploads a file and converts it in the background. Tools: {', '.join(JOB_TOOLS)}. Accepts .gz/.zst/.bz2 uploads. Max file size: {MAX_FILE_SIZE // (1024 * 1024)}MB after decompression. Poll `status_url` and download from `result_url` once the job succeeded.",
+    response_description="The queued job",
+    response_model=JobStatus,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_job(
+    request: Request,
+    tool: str,
+    file: UploadFile = File(...),
+    separator: Optional[str] = Form(None),
+    engine: Optional[Literal["auto", "stdlib", "pandas"]] = Form(None),
+    flatten: Optional[Literal["explode", "index", "explode-path", "json"]] = Form(None),
+    explode_path: Optional[str] = Form(None),
+    on_overflow: Optional[Literal["index", "json"]] = Form(None),
+    class_name: Optional[str] = Form(None),
+    interface_name: Optional[str] = Form(None),
+):
+    filename, _ = upload_encoding(file)
+    job_tool, options = resolve_job_tool(tool, filename, {
+        "separator": separator, "engine": engine, "flatten": flatten, "explode_path": explode_path, "on_overflow": on_overflow,
+        "class_name": class_name, "interface_name": interface_name,
+    })
+    if not job_manager.accepts():
+        raise HTTPException(status_code=503, detail="Too many queued jobs, retry later", headers={"Retry-After": "10"})
+
+    directory = await run_in_threadpool(job_manager.store.new_job_dir)
+    input_path = directory / "input"
+    size = 0
+    try:
+        with open(input_path, "wb") as out:
+            # Spool to disk as it arrives so a large upload never sits in memory
+            async for chunk in iter_upload(file, MAX_FILE_SIZE):
+                size += len(chunk)
+                await run_in_threadpool(out.write, chunk)
+        if not size:
+            raise HTTPException(status_code=400, detail="File is empty")
+        meta = job_manager.submit(tool, job_tool.func, input_path, f"result{job_tool.result_extension}", job_tool.media_type, options, size)
+    except BaseException:
+        job_manager.store.delete(directory.name)
+        raise
+    finally:
+        await file.close()
+    return _job_status(request, meta)
+
+@router.get(
+    "/{job_id}",
+    summary="Get job status",
+    description="Returns the job's status and coarse progress. Finished jobs are deleted after XUTIL_JOBS_TTL_SECONDS (one hour by default).",
+    response_model=JobStatus
+)
+async def get_job(request: Request, job_id: str):
+    return _job_status(request, _read_job(job_id))
+
+@router.get(
+    "/{job_id}/result",
+    summary="Download a job result",
+    description="Streams the converted file. Supports Range requests for resuming large downloads.",
+    response_description="The converted file"
+)
+async def get_job_result(job_id: str):
+    meta = _read_job(job_id)
+    if meta["status"] != SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is {meta['status']}, no result available")
+    path = job_manager.store.job_dir(job_id) / meta["result_name"]
+    return FileResponse(path, media_type=meta["media_type"], filename=f"{meta['tool']}-{job_id}{path.suffix}")
+
+@router.delete(
+    "/{job_id}",
+    summary="Delete a job",
+    description="Deletes the job and its files. A running conversion finishes but its result is discarded.",
+    status_code=status.HTTP_204_NO_CONTENT
+)
+async def delete_job(job_id: str):
+    if not job_manager.store.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found or expired")
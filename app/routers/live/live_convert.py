@@ -0,0 +1,44 @@
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from ...core.config import get_settings
+from ...core.serialization import dumps_json
+from ...crud.live.live_crud import LiveSession
+
+router = APIRouter(prefix="/live", tags=["Live Conversion"])
+
+@router.websocket("/ws")
+async def live_convert(websocket: WebSocket):
+    """
+    Multiplexes tool calls over one connection for editors that convert as the user types.
+
+    Send `{"type": "convert", "id": "1", "channel": "left-pane", "tool": "yaml-json.yaml-to-json",
+    "params": {"yaml_text": "a: 1"}}`. The reply is a `result` frame that has the same fields
+    as a batch item. A newer convert on the same channel supersedes the older one, and
+    `{"type": "cancel", "channel": ...}` drops it.
+    """
+    settings = get_settings()
+    await websocket.accept()
+
+    async def send(frame):
+        await websocket.send_text(dumps_json(frame, pretty=False))
+
+    session = LiveSession(
+        send,
+        debounce_ms=settings.live_debounce_ms,
+        max_debounce_ms=settings.live_max_debounce_ms,
+        max_channels=settings.live_max_channels,
+        max_message_bytes=settings.live_max_message_bytes,
+    )
+    await session.hello()
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            text = message.get("text")
+            if text is None:
+                text = (message.get("bytes") or b"").decode("utf-8", errors="replace")
+            await session.handle(text)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await session.close()
@@ -1,8 +1,16 @@
 from fastapi import APIRouter, HTTPException
 from ...schemas.text_utilities.lorem_ipsum_schema import LoremIpsumRequest, LoremIpsumResponse
 from ...crud.text_utilities.lorem_ipsum_crud import generate_lorem_ipsum_logic
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/lorem-ipsum", tags=["Lorem Ipsum Generator"])
+router = APIRouter(prefix="/lorem-ipsum", tags=["Lorem Ipsum Generator"], route_class=ORJSONRoute)
+
+# Random output: responses must not be cached
+RESULT_CACHEABLE = False
+
+WARMUP_REQUESTS = [
+    ("POST", "/generate", {"type": "paragraph", "count": 1}),
+]
 
 @router.post("/generate", response_model=LoremIpsumResponse)
 async def generate_lorem_ipsum(data: LoremIpsumRequest) -> LoremIpsumResponse:
@@ -2,8 +2,14 @@ from fastapi import APIRouter, HTTPException
 from ...schemas.text_utilities.slug_converter_schema import SlugGenerateRequest, SlugGenerateResponse
 from ...crud.text_utilities.slug_generator_crud import generate_slug_logic
 import re
+from ...core.serialization import ORJSONRoute
 
-router = APIRouter(prefix="/slug", tags=["Slug Generator"])
+router = APIRouter(prefix="/slug", tags=["Slug Generator"], route_class=ORJSONRoute)
+
+COST_CLASS = "text"
+WARMUP_REQUESTS = [
+    ("POST", "/generate", {"text": "Hello World, From xutil!"}),
+]
 @router.post("/generate", response_model=SlugGenerateResponse)
 async def generate_slug(data: SlugGenerateRequest) -> SlugGenerateResponse:
     """
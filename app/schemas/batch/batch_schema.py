@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+class BatchOperation(BaseModel):
+    id: Optional[str] = Field(None, description="Client-chosen identifier echoed back in the result")
+    tool: str = Field(..., min_length=1, description="Tool name, e.g. 'hash.generate' or 'unit.length'")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Parameters of the tool's regular endpoint")
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, description="Operations to run, results keep this order")
+
+class BatchItemResult(BaseModel):
+    id: Optional[str] = Field(None, description="Identifier from the matching operation")
+    tool: str = Field(..., description="Tool that was invoked")
+    status: int = Field(..., description="HTTP status the regular endpoint would have returned")
+    result: Optional[Any] = Field(None, description="Tool output on success")
+    error: Optional[Any] = Field(None, description="Error detail on failure")
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int = Field(..., description="Number of operations that returned 2xx")
+    failed: int = Field(..., description="Number of operations that failed")
+
+# Parameter models for tools whose regular endpoints take query parameters; same limits as those queries
+class TextParams(BaseModel):
+    text: str = Field(..., min_length=1, max_length=10000, description="Input text")
+
+class EncodedTextParams(BaseModel):
+    encoded_text: str = Field(..., min_length=1, max_length=10000, description="Encoded input text")
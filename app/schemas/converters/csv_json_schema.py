@@ -1,8 +1,20 @@
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 class JSONInput(BaseModel):
     json_data: str = Field(..., min_length=1, description="JSON data to convert to CSV (expected as a list of objects)")
     separator: str = Field('_', description="Separator used for nested fields during conversion")
+    flatten: Literal["explode", "index", "explode-path", "json"] = Field(
+        "explode",
+        description="How lists are flattened: explode every list into rows (cartesian product), index-suffixed columns (items_0_name), explode only `explode_path`, or JSON-encoded cells",
+    )
+    explode_path: Optional[str] = Field(None, description="Flattened key of the list to explode with the explode-path strategy, e.g. 'order_items'")
+    on_overflow: Optional[Literal["index", "json"]] = Field(
+        None, description="Strategy to fall back to when exploding would exceed the row limit; rejected with 400 when unset"
+    )
 
 class ConversionResponse(BaseModel):
     result: str = Field(..., description="Converted data (JSON, XML or CSV)")
+
+class CSVConversionResponse(ConversionResponse):
+    flatten: str = Field(..., description="Flatten strategy actually used; differs from the requested one after an on_overflow fallback")
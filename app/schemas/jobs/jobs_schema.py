@@ -0,0 +1,19 @@
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+class JobStatus(BaseModel):
+    id: str = Field(..., description="Job identifier")
+    tool: str = Field(..., description="Conversion the job runs, e.g. 'csv-to-json'")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(..., description="Lifecycle state")
+    stage: str = Field(..., description="Current step: queued, starting, reading, converting, writing, or the final status")
+    progress: float = Field(..., ge=0, le=1, description="Coarse completion estimate from the stage")
+    created_at: float = Field(..., description="Submission time, Unix seconds")
+    started_at: Optional[float] = Field(None, description="Time a worker picked the job up")
+    finished_at: Optional[float] = Field(None, description="Completion time")
+    expires_at: float = Field(..., description="Time after which the job and its result are deleted")
+    input_bytes: int = Field(..., description="Decompressed size of the uploaded file")
+    result_bytes: Optional[int] = Field(None, description="Size of the result once the job succeeded")
+    error: Optional[str] = Field(None, description="Why the job failed")
+    status_code: Optional[int] = Field(None, description="HTTP status the synchronous endpoint would have returned for the failure")
+    status_url: str = Field(..., description="Poll this for progress")
+    result_url: Optional[str] = Field(None, description="Download the result here once the job succeeded; supports Range requests")
@@ -0,0 +1,10 @@
+from typing import Any, Dict, Literal, Optional
+from pydantic import BaseModel, Field
+
+class LiveMessage(BaseModel):
+    type: Literal["convert", "cancel", "ping"] = Field(..., description="convert runs a tool, cancel drops a channel's pending or running call")
+    id: Optional[str] = Field(None, max_length=128, description="Client-chosen identifier echoed back in replies")
+    channel: Optional[str] = Field(None, max_length=128, description="Supersede key; defaults to the tool name. A newer convert on the same channel replaces the older one")
+    tool: Optional[str] = Field(None, description="Tool name from the batch registry, e.g. 'yaml-json.yaml-to-json'")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Parameters of the tool's regular endpoint")
+    debounce_ms: Optional[int] = Field(None, ge=0, description="Wait this long for a newer call before running; defaults to the server setting")
@@ -0,0 +1,96 @@
+"""
+Sized input corpora for the HTTP benchmarks.
+
+Every generator is deterministic and returns text of roughly the requested size, so
+runs on different machines (and against a stored baseline) send the same bytes. The
+"10mb" tier stays just under the converters' 10MB upload limit.
+"""
+from typing import Any, Dict, List
+import orjson
+
+KB = 1024
+MB = 1024 * 1024
+
+SIZES = {
+    "small": 2 * KB,
+    "1mb": 1 * MB,
+    "10mb": 10 * MB - 64 * KB,
+}
+DEEP_JSON_DEPTH = 48
+BIG_TEXT_SIZE = 1 * MB
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua ut enim ad minim veniam quis nostrud"
+).split()
+
+def _fill(header: str, row, footer: str, size: int, separator: str = "") -> str:
+    """Repeat row(i) between header and footer until the text reaches about `size` bytes."""
+    rows: List[str] = []
+    total = len(header) + len(footer)
+    while True:
+        chunk = row(len(rows))
+        if rows and total + len(chunk) + len(separator) > size:
+            break
+        rows.append(chunk)
+        total += len(chunk) + len(separator)
+    return header + separator.join(rows) + footer
+
+def record(i: int) -> Dict[str, Any]:
+    return {
+        "id": i,
+        "user": {"name": f"user-{i}", "email": f"user{i}@example.com", "active": i % 3 == 0},
+        "address": {"city": "Pune", "zip": 411001 + i % 100},
+        "score": round(i * 1.5, 2),
+        "tags": ["a", "b"] if i % 2 else ["c"],
+    }
+
+def csv_text(size: int) -> str:
+    return _fill(
+        "id,user_name,user_email,user_active,address_city,address_zip,score\n",
+        lambda i: f"{i},user-{i},user{i}@example.com,{str(i % 3 == 0).lower()},Pune,{411001 + i % 100},{i * 1.5}\n",
+        "", size,
+    )
+
+def json_records(size: int) -> str:
+    return _fill("[", lambda i: orjson.dumps(record(i)).decode(), "]", size, separator=",")
+
+def json_document(size: int) -> str:
+    """A single-rooted object, which the XML converter requires."""
+    return _fill('{"catalog":{"book":[', lambda i: orjson.dumps(record(i)).decode(), "]}}", size, separator=",")
+
+def xml_text(size: int) -> str:
+    return _fill(
+        '<?xml version="1.0" encoding="UTF-8"?>\n<catalog>\n',
+        lambda i: (
+            f'  <book id="bk{i}"><author>Author {i}</author><title>Title {i}</title>'
+            f"<price>{i % 50}.95</price><tags><tag>a</tag><tag>b</tag></tags></book>\n"
+        ),
+        "</catalog>\n", size,
+    )
+
+def yaml_text(size: int) -> str:
+    return _fill(
+        "books:\n",
+        lambda i: (
+            f"  - id: {i}\n    author: Author {i}\n    title: Title {i}\n"
+            f"    price: {i % 50}.95\n    tags: [a, b]\n    address:\n      city: Pune\n      zip: {411001 + i % 100}\n"
+        ),
+        "", size,
+    )
+
+def deep_json(depth: int) -> str:
+    """Nested objects `depth` levels deep, each level with scalars and a list of objects."""
+    node: Dict[str, Any] = {"leaf": True, "value": 0}
+    for level in range(depth, 0, -1):
+        node = {
+            "level": level,
+            "name": f"node-{level}",
+            "ratio": level / depth,
+            "items": [{"key": f"k{level}", "count": level}],
+            f"child_{level}": node,
+        }
+    return orjson.dumps(node).decode()
+
+def big_text(size: int) -> str:
+    return _fill("", lambda i: WORDS[i % len(WORDS)] + (". " if i % 12 == 11 else " "), "", size)
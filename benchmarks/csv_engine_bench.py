@@ -0,0 +1,77 @@
+"""
+Find where the pandas CSV engine overtakes the stdlib one for CSV-to-JSON.
+
+    python -m benchmarks.csv_engine_bench [--repeat 5] [--max-size 10mb]
+
+Times `csv_to_json_logic` end to end with each engine on the corpus CSV (mixed ints,
+floats, bools and strings with nested column names) and on an all-numeric CSV, at
+growing sizes. The crossover is the largest size the stdlib engine still wins at, and
+is what STDLIB_MAX_BYTES in csv_json_crud should be set to.
+"""
+import argparse
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List
+from app.crud.converters.csv_json_crud import PANDAS, STDLIB, csv_to_json_logic
+from .corpus import KB, MB, _fill, csv_text
+
+SIZES = [1 * KB, 4 * KB, 16 * KB, 64 * KB, 256 * KB, 1 * MB, 4 * MB, 10 * MB - 64 * KB]
+
+def numeric_csv(size: int) -> str:
+    rng = random.Random(size)
+    return _fill(
+        "id,m_a,m_b,m_c,m_d,n_x,n_y\n",
+        lambda i: f"{i},{rng.randint(0, 10**6)},{rng.random():.6f},{rng.randint(-50, 50)},{rng.random() * 100:.2f},{i % 7},{rng.random():.3f}\n",
+        "", size,
+    )
+
+SHAPES: Dict[str, Callable[[int], str]] = {"corpus": csv_text, "numeric": numeric_csv}
+
+def best_of(data: bytes, engine: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        csv_to_json_logic(data, engine=engine)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+def pandas_import_ms() -> float:
+    code = "import time; s = time.perf_counter(); import pandas; print((time.perf_counter() - s) * 1000)"
+    return float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+
+def describe(size: int) -> str:
+    return f"{size / MB:.1f}MB" if size >= MB else f"{size / KB:.0f}KB"
+
+def parse_size(text: str) -> int:
+    text = text.lower()
+    for suffix, unit in (("mb", MB), ("kb", KB)):
+        if text.endswith(suffix):
+            return int(float(text[:-len(suffix)]) * unit)
+    return int(text)
+
+def run(repeat: int, max_size: int) -> None:
+    print(f"pandas import: {pandas_import_ms():.0f}ms, paid once per process (warm-up and the process pool preload it)")
+    for shape, generate in SHAPES.items():
+        print(f"\n{shape}")
+        print(f"{'size':>8}{'stdlib ms':>12}{'pandas ms':>12}{'stdlib/pandas':>15}")
+        crossover: List[int] = []
+        for size in (s for s in SIZES if s <= max_size):
+            data = generate(size).encode()
+            assert csv_to_json_logic(data, engine=STDLIB).result == csv_to_json_logic(data, engine=PANDAS).result
+            stdlib_ms, pandas_ms = best_of(data, STDLIB, repeat), best_of(data, PANDAS, repeat)
+            if stdlib_ms < pandas_ms:
+                crossover.append(size)
+            print(f"{describe(size):>8}{stdlib_ms:>12.2f}{pandas_ms:>12.2f}{stdlib_ms / pandas_ms:>14.2f}x")
+        print(f"stdlib faster up to: {describe(max(crossover)) if crossover else 'never'}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-size", type=parse_size, default=SIZES[-1])
+    args = parser.parse_args()
+    run(args.repeat, args.max_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Check that the stdlib CSV engine gives the same JSON as pandas on random small CSVs.
+
+    python -m benchmarks.csv_engine_fuzz [--cases 3000] [--seed 7]
+
+Each case is a few rows built from awkward cells: signs, padding, exponents, NA
+markers, bools, non-ASCII digits, quoting, long numbers and blank or whitespace-only
+lines. Every case must either give identical output from both engines or be one the
+stdlib engine hands to pandas (counted as a fallback). Exits with status 1 on any
+difference, so it doubles as the regression check for csv_stdlib_crud.
+"""
+import argparse
+import random
+import sys
+from app.crud.converters.csv_json_crud import PANDAS, STDLIB, csv_to_json_logic
+from app.crud.converters.csv_stdlib_crud import StdlibCSVUnsupported, read_csv_stdlib
+
+CELLS = [
+    "1", "-2", "+3", " 4", "5 ", "\t6", "007", "1.5", ".5", "1.", "1e5", "2E-3", "inf", "-Infinity", "True", "false", "TRUE",
+    "", "NA", "null", "nan", "N/A", "None", "x", " y ", "a,b", 'q"t', "1_000", "0x1F", "1.5e", "12345678901234567",
+    "0.1234567890123456789", "1e400", "é", "line\nbreak", "2024-01-01", "-0", "123456789012345", "9223372036854775807",
+    "yes", "#N/A", " NA", " ", "\t", "١", "١.5", "²", "٣e2", "１２",
+]
+HEADER = ["id", "user_name", "user_age", "a_b_c", "z", "meta_x"]
+BLANK_LINES = ["", " ", "\t", " \t ", '" "']
+
+def cell(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"' if any(ch in value for ch in ',"\n') else value
+
+def random_csv(rng: random.Random) -> bytes:
+    columns = rng.randint(1, 5)
+    pools = [rng.sample(CELLS, rng.randint(1, 4)) for _ in range(columns)]
+    lines = [",".join(rng.sample(HEADER, columns))]
+    lines += [",".join(cell(rng.choice(pools[c])) for c in range(columns)) for _ in range(rng.randint(0, 6))]
+    if rng.random() < 0.2:
+        lines.insert(rng.randint(0, len(lines)), rng.choice(BLANK_LINES))
+    return ("\n".join(lines) + rng.choice(["\n", "", "\r\n"])).encode()
+
+def convert(data: bytes, engine: str) -> str:
+    try:
+        return csv_to_json_logic(data, engine=engine).result
+    except ValueError:
+        return "ERR"
+
+def run(cases: int, seed: int) -> int:
+    rng = random.Random(seed)
+    same = fallback = differ = 0
+    for _ in range(cases):
+        data = random_csv(rng)
+        try:
+            read_csv_stdlib(data)
+        except StdlibCSVUnsupported:
+            fallback += 1
+            continue
+        stdlib, pandas = convert(data, STDLIB), convert(data, PANDAS)
+        if stdlib == pandas:
+            same += 1
+            continue
+        differ += 1
+        if differ <= 5:
+            print(f"DIFF {data[:120]!r}\n  stdlib {stdlib[:200]}\n  pandas {pandas[:200]}")
+    print(f"same {same}, fallback {fallback}, differ {differ}")
+    return differ
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    sys.exit(1 if run(args.cases, args.seed) else 0)
+
+if __name__ == "__main__":
+    main()
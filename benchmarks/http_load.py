@@ -0,0 +1,664 @@
+"""
+End-to-end HTTP load benchmark for every route under /api.
+
+    python -m benchmarks.http_load [--mode inprocess|uvicorn] [--workers 2]
+        [--tiers small,1mb,10mb,deep,bigtext] [--match csv-json] [--concurrency 8]
+        [--duration 2] [--save results.json] [--baseline PATH | --no-baseline]
+        [--update-baseline] [--tolerance 0.25] [--strict]
+
+`inprocess` drives the ASGI app through httpx.ASGITransport (lifespan included), which
+measures the app without socket or HTTP parsing cost. `uvicorn` starts
+`uvicorn app.main:app --workers N` on a free port and drives it over real connections.
+
+Each scenario is one route with one input tier: "small" covers every route, "1mb" and
+"10mb" push CSV/JSON/XML/YAML through the file, raw, streaming and text converters and
+the job API, "deep" sends deeply nested JSON to the code generators, and "bigtext"
+sends 1MB texts to the encoders. A job scenario times the whole round trip (submit,
+poll, download, delete); a live scenario times one convert frame and its result over a
+WebSocket that each client keeps open. Requests are encoded once up front so
+client-side multipart/JSON encoding is not timed. The report lists RPS, p50/p99
+latency, failed calls and peak RSS of the serving process tree (read from /proc, Linux
+only). Any failed call makes the run exit 1, and such results are never stored as a
+baseline.
+
+Results are compared with benchmarks/baselines/http_load-<mode>.json; a scenario
+regresses when RPS drops, or p99 or peak RSS rises, by more than --tolerance, and the
+run then exits 1. Baselines are machine-specific, so refresh the stored one with
+--update-baseline on the machine that runs the comparison. The result cache is turned
+off unless --result-cache is given, since repeating one request would otherwise only
+measure cache hits. Other settings come from the usual XUTIL_* variables; both modes
+pass them through.
+"""
+import argparse
+import asyncio
+import base64
+import itertools
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
+from typing import Any, AsyncContextManager, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+import httpx
+import orjson
+from benchmarks import corpus
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+TIERS = ("small", "1mb", "10mb", "deep", "bigtext")
+# Routes served by app.main itself rather than a router module
+APP_ROUTES = [("GET", "/api/health"), ("GET", "/api/startup-report"), ("GET", "/api/executor"), ("GET", "/api/result-cache")]
+JWT_SECRET = "benchmark-secret"
+HTTP = "http"  # one request
+JOB = "job"  # submit to the job API, poll until finished, download, delete
+LIVE = "live"  # one convert frame over a WebSocket, waiting for its result
+JOB_ROUTES = (("POST", "/api/jobs/{tool}"), ("GET", "/api/jobs/{job_id}"), ("GET", "/api/jobs/{job_id}/result"), ("DELETE", "/api/jobs/{job_id}"))
+JOB_POLL_SECONDS = 0.005
+# Scenarios start once the server's decayed loop lag is below this
+SETTLED_LAG_MS = 50.0
+
+# One timed call of a scenario: returns None on success, or a short failure description
+Call = Callable[[], Awaitable[Optional[str]]]
+
+class Scenario(NamedTuple):
+    method: str
+    path: str
+    tier: str
+    request: Dict[str, Any]  # httpx.Request keyword arguments; for LIVE, the convert frame's tool and params
+    kind: str = HTTP
+    covers: Tuple[Tuple[str, str], ...] = ()  # manifest routes exercised besides (method, path)
+
+    @property
+    def name(self) -> str:
+        if self.kind == LIVE:
+            return f"WS {self.path} {self.request['tool']} [{self.tier}]"
+        name = f"{self.method} {self.path} [{self.tier}]"
+        return name if self.kind == HTTP else f"{self.kind.upper()} {name}"
+
+class Prepared(NamedTuple):
+    method: str
+    url: str
+    headers: Dict[str, str]
+    content: bytes
+
+def _upload(filename: str, text: str, content_type: str, **data: str) -> Dict[str, Any]:
+    return {"files": {"file": (filename, text.encode(), content_type)}, "data": data}
+
+def _raw(text: str, content_type: str, **params: str) -> Dict[str, Any]:
+    return {"content": text.encode(), "headers": {"Content-Type": content_type}, "params": params}
+
+def _small_scenarios(workdir: Path) -> Iterable[Scenario]:
+    record = orjson.dumps(corpus.record(1)).decode()
+    text = "Hello, World! 123"
+    morse = ".... . .-.. .-.. --- / .-- --- .-. .-.. -.."
+    (workdir / "small.txt").write_text(text)
+    (workdir / "small_morse_in.txt").write_text(morse)
+    jwt_token = _jwt_token()
+
+    yield from (Scenario(method, path, "small", {}) for method, path in APP_ROUTES)
+    units = {
+        "angle": "deg", "area": "m2", "bit-byte": "Byte", "energy": "kj", "frequency": "khz",
+        "fuel-economy": "km_l", "length": "km", "power": "kw", "pressure": "bar", "speed": "km_h",
+        "temperature": "celsius", "time": "min", "volume": "ml", "weight": "kg",
+    }
+    yield from (Scenario("POST", f"/api/unit-converter/{kind}", "small", {"json": {"value": 42.5, "unit": unit}}) for kind, unit in units.items())
+    yield from [
+        Scenario("POST", "/api/batch", "small", {"json": {"operations": [
+            {"tool": "hash.generate", "params": {"text": f"item {i}", "algorithm": "sha256"}} for i in range(20)
+        ]}}),
+        Scenario("GET", "/api/batch/tools", "small", {}),
+        Scenario("POST", "/api/base-converter/base-convert", "small", {"json": {"number": "ff7a", "source_base": 16, "target_base": 2}}),
+        Scenario("GET", "/api/px-rem-em/", "small", {"params": {"conversion_type": "px-to-rem-em", "value": 24}}),
+        Scenario("POST", "/api/text-base/text-to-base", "small", {"json": {"input_text": "HelloWorld123", "target_base": 16}}),
+        Scenario("POST", "/api/text-base/base-to-text", "small", {"json": {"base_text": "48 65 6C 6C 6F", "source_base": 16}}),
+        Scenario("POST", "/api/timezone-converter/", "small", {"json": {"datetime_str": "2024-05-01 12:30:00", "from_timezone": "UTC", "to_timezone": "Asia/Kolkata"}}),
+        Scenario("GET", "/api/timezone-converter/all-timezones", "small", {}),
+        Scenario("POST", "/api/unix-utc/unix-to-utc", "small", {"json": {"timestamp": 1714566600}}),
+        Scenario("POST", "/api/unix-utc/utc-to-unix", "small", {"json": {"datetime_utc": "2024-05-01 12:30:00"}}),
+        Scenario("POST", "/api/base/encode", "small", {"json": {"text": text, "base_type": "base64"}}),
+        Scenario("POST", "/api/base/decode", "small", {"json": {"encoded_text": base64.b64encode(text.encode()).decode(), "base_type": "base64"}}),
+        Scenario("POST", "/api/cipher/rot13", "small", {"json": {"text": text}}),
+        Scenario("POST", "/api/cipher/caesar", "small", {"json": {"text": text, "shift": 3}}),
+        Scenario("GET", "/api/guid/", "small", {}),
+        Scenario("GET", "/api/guid/bulk", "small", {"params": {"count": 50}}),
+        Scenario("POST", "/api/hash/generate", "small", {"json": {"text": text, "algorithm": "sha256"}}),
+        Scenario("GET", "/api/html-entities/encode", "small", {"params": {"text": "<a href='x'>Tom & Jerry</a>"}}),
+        Scenario("POST", "/api/html-entities/encode", "small", {"json": {"text": "<a href='x'>Tom & Jerry</a>"}}),
+        Scenario("GET", "/api/html-entities/decode", "small", {"params": {"text": "&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;"}}),
+        Scenario("POST", "/api/html-entities/decode", "small", {"json": {"text": "&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;"}}),
+        Scenario("POST", "/api/jwt/encode", "small", {"json": {"payload": {"sub": "42", "role": "admin"}, "secret": JWT_SECRET}}),
+        Scenario("POST", "/api/jwt/decode", "small", {"json": {"token": jwt_token, "secret": JWT_SECRET, "verify_expiry": False}}),
+        Scenario("POST", "/api/morse/char-to-morse", "small", {"json": {"text": text}}),
+        Scenario("POST", "/api/morse/morse-to-char", "small", {"json": {"text": morse}}),
+        Scenario("POST", "/api/morse/char-to-morse-file", "small", {"params": {"file_path": str(workdir / "small.txt")}}),
+        Scenario("POST", "/api/morse/morse-to-char-file", "small", {"params": {"file_path": str(workdir / "small_morse_in.txt")}}),
+        Scenario("GET", "/api/password/generate", "small", {"params": {"length": 24}}),
+        Scenario("GET", "/api/ulid/", "small", {}),
+        Scenario("GET", "/api/ulid/bulk", "small", {"params": {"count": 50}}),
+        Scenario("GET", "/api/ulid/timestamp", "small", {"params": {"ULID_str": "01ARZ3NDEKTSV4RZFFQ69G5FAV"}}),
+        Scenario("GET", "/api/url/encode", "small", {"params": {"text": "a b&c=d/é"}}),
+        Scenario("GET", "/api/url/decode", "small", {"params": {"encoded_text": "a%20b%26c%3Dd%2F%C3%A9"}}),
+        Scenario("POST", "/api/lorem-ipsum/generate", "small", {"json": {"type": "paragraph", "count": 3}}),
+        Scenario("POST", "/api/slug/generate", "small", {"json": {"text": "Hello World, From xutil!"}}),
+    ]
+    yield from _codegen_scenarios("small", record)
+    yield from (Scenario("WS", "/api/live/ws", "small", {"tool": tool, "params": params}, kind=LIVE) for tool, params in (
+        ("hash.generate", {"text": text, "algorithm": "sha256"}),
+        ("yaml-json.yaml-to-json", {"yaml_text": corpus.yaml_text(2 * corpus.KB)}),
+        ("json-python.json-to-python", {"json_data": record, "class_name": "Root"}),
+    ))
+
+def _codegen_scenarios(tier: str, document: str) -> Iterable[Scenario]:
+    for prefix, route, name_field in (
+        ("/api/json-pydantic", "json-to-pydantic", "class_name"),
+        ("/api/json-python", "json-to-python", "class_name"),
+        ("/api/json-ts", "json-to-typescript", "interface_name"),
+    ):
+        yield Scenario("POST", f"{prefix}/{route}", tier, {"json": {"json_data": document, name_field: "Root"}})
+        yield Scenario("POST", f"{prefix}/{route}-file", tier, _upload("data.json", document, "application/json", **{name_field: "Root"}))
+        yield Scenario("POST", f"{prefix}/{route}-raw", tier, _raw(document, "application/json", **{name_field: "Root"}))
+
+def _converter_scenarios(tier: str) -> Iterable[Scenario]:
+    size = corpus.SIZES[tier]
+    csv, records, document = corpus.csv_text(size), corpus.json_records(size), corpus.json_document(size)
+    xml, yaml = corpus.xml_text(size), corpus.yaml_text(size)
+    yield from [
+        Scenario("POST", "/api/csv-json/csv-to-json", tier, _upload("data.csv", csv, "text/csv")),
+        Scenario("POST", "/api/csv-json/json-to-csv", tier, {"json": {"json_data": records}}),
+        Scenario("POST", "/api/xml-json/xml-to-json", tier, {"json": {"xml_text": xml}}),
+        Scenario("POST", "/api/xml-json/json-to-xml", tier, {"json": {"json_text": document}}),
+        Scenario("POST", "/api/xml-json/xml-to-json-file", tier, _upload("data.xml", xml, "application/xml")),
+        Scenario("POST", "/api/xml-json/json-to-xml-file", tier, _upload("data.json", document, "application/json")),
+        Scenario("POST", "/api/yaml-json/yaml-to-json", tier, {"json": {"yaml_text": yaml}}),
+        Scenario("POST", "/api/yaml-json/json-to-yaml", tier, {"json": {"json_text": records}}),
+        Scenario("POST", "/api/yaml-json/yaml-to-json-file", tier, _upload("data.yaml", yaml, "application/x-yaml")),
+        Scenario("POST", "/api/yaml-json/json-to-yaml-file", tier, _upload("data.json", records, "application/json")),
+        Scenario("POST", "/api/csv-json/csv-to-json-raw", tier, _raw(csv, "text/csv")),
+        Scenario("POST", "/api/csv-json/json-to-csv-raw", tier, _raw(records, "application/json")),
+        Scenario("POST", "/api/xml-json/xml-to-json-raw", tier, _raw(xml, "application/xml")),
+        Scenario("POST", "/api/xml-json/json-to-xml-raw", tier, _raw(document, "application/json")),
+        Scenario("POST", "/api/yaml-json/yaml-to-json-raw", tier, _raw(yaml, "application/x-yaml")),
+        Scenario("POST", "/api/yaml-json/json-to-yaml-raw", tier, _raw(records, "application/json")),
+        Scenario("POST", "/api/csv-json/csv-to-json-stream", tier, _upload("data.csv", csv, "text/csv")),
+        Scenario("POST", "/api/csv-json/json-to-csv-stream", tier, _upload("data.json", records, "application/json")),
+        Scenario("POST", "/api/jobs/csv-to-json", tier, _upload("data.csv", csv, "text/csv"), kind=JOB, covers=JOB_ROUTES),
+        Scenario("POST", "/api/jobs/json-to-csv", tier, _upload("data.json", records, "application/json"), kind=JOB, covers=JOB_ROUTES),
+    ]
+
+def _bigtext_scenarios(workdir: Path) -> Iterable[Scenario]:
+    from app.crud.encoding_decoding.morse_code_parser_crud import char_to_morse_logic
+
+    text = corpus.big_text(corpus.BIG_TEXT_SIZE)
+    # Morse is about 5x the text; cut it at a letter boundary to stay near 1MB and under the body limit
+    morse = char_to_morse_logic(text)[:corpus.BIG_TEXT_SIZE].rsplit(" ", 1)[0]
+    alphanumeric = text.replace(" ", "").replace(".", "")
+    (workdir / "big.txt").write_text(text)
+    (workdir / "big_morse_in.txt").write_text(morse)
+    # Query-string routes are left out: 1MB does not fit in a request line
+    yield from [
+        Scenario("POST", "/api/hash/generate", "bigtext", {"json": {"text": text, "algorithm": "sha256"}}),
+        Scenario("POST", "/api/base/encode", "bigtext", {"json": {"text": text, "base_type": "base64"}}),
+        Scenario("POST", "/api/base/decode", "bigtext", {"json": {"encoded_text": base64.b64encode(text.encode()).decode(), "base_type": "base64"}}),
+        Scenario("POST", "/api/cipher/rot13", "bigtext", {"json": {"text": text}}),
+        Scenario("POST", "/api/cipher/caesar", "bigtext", {"json": {"text": text, "shift": 7}}),
+        Scenario("POST", "/api/html-entities/encode", "bigtext", {"json": {"text": text}}),
+        Scenario("POST", "/api/html-entities/decode", "bigtext", {"json": {"text": text}}),
+        Scenario("POST", "/api/morse/char-to-morse", "bigtext", {"json": {"text": text}}),
+        Scenario("POST", "/api/morse/morse-to-char", "bigtext", {"json": {"text": morse}}),
+        Scenario("POST", "/api/morse/char-to-morse-file", "bigtext", {"params": {"file_path": str(workdir / "big.txt")}}),
+        Scenario("POST", "/api/morse/morse-to-char-file", "bigtext", {"params": {"file_path": str(workdir / "big_morse_in.txt")}}),
+        Scenario("POST", "/api/text-base/text-to-base", "bigtext", {"json": {"input_text": alphanumeric, "target_base": 16}}),
+        Scenario("POST", "/api/slug/generate", "bigtext", {"json": {"text": text}}),
+    ]
+
+def build_scenarios(tiers: Iterable[str], workdir: Path) -> List[Scenario]:
+    scenarios: List[Scenario] = []
+    for tier in tiers:
+        if tier == "small":
+            scenarios.extend(_small_scenarios(workdir))
+            scenarios.extend(_converter_scenarios(tier))
+        elif tier in ("1mb", "10mb"):
+            scenarios.extend(_converter_scenarios(tier))
+        elif tier == "deep":
+            scenarios.extend(_codegen_scenarios(tier, corpus.deep_json(corpus.DEEP_JSON_DEPTH)))
+        elif tier == "bigtext":
+            scenarios.extend(_bigtext_scenarios(workdir))
+    return scenarios
+
+def _jwt_token() -> str:
+    from jose import jwt
+
+    return jwt.encode({"sub": "42", "role": "admin"}, JWT_SECRET, algorithm="HS256")
+
+def uncovered_routes(scenarios: List[Scenario]) -> List[Tuple[str, str]]:
+    """Routes in the router manifest that no scenario exercises."""
+    from app.core.router_loader import load_manifest
+
+    covered: Set[Tuple[str, str]] = {(s.method, s.path) for s in scenarios}
+    covered.update(route for s in scenarios for route in s.covers)
+    return sorted(
+        (method, route["path"])
+        for entry in load_manifest()
+        for route in entry["routes"]
+        for method in route["methods"]
+        if (method, route["path"]) not in covered
+    )
+
+def prepare(scenario: Scenario, base_url: str) -> Prepared:
+    request = httpx.Request(scenario.method, base_url + scenario.path, **scenario.request)
+    content = request.read()
+    headers = {k: v for k, v in request.headers.items() if k.lower() != "host"}
+    return Prepared(scenario.method, str(request.url), headers, content)
+
+def process_tree_rss(root_pid: int) -> int:
+    """Resident set size in bytes of a process and all of its descendants (Linux)."""
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    parents: Dict[int, int] = {}
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so split after its closing parenthesis
+        parents[int(entry.name)] = int(stat[stat.rindex(b")") + 2:].split()[1])
+    tree, frontier = {root_pid}, [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        children = [child for child, parent in parents.items() if parent == pid]
+        tree.update(children)
+        frontier.extend(children)
+    total = 0
+    for pid in tree:
+        try:
+            with open(f"/proc/{pid}/statm", "rb") as f:
+                total += int(f.read().split()[1]) * page_size
+        except OSError:
+            pass
+    return total
+
+class RSSSampler:
+    """Polls the RSS of a process tree in a thread and keeps the peak."""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self.available = Path("/proc/self/statm").exists()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> int:
+        if not self.available:
+            return 0
+        rss = process_tree_rss(self.pid)
+        self.peak = max(self.peak, rss)
+        return rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self) -> "RSSSampler":
+        self.peak = 0
+        self.sample()
+        if self.available:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def _failure(response: httpx.Response) -> Optional[str]:
+    return None if response.status_code < 400 else str(response.status_code)
+
+def http_caller(client: httpx.AsyncClient, prepared: Prepared) -> Callable[[], AsyncContextManager[Call]]:
+    async def call() -> Optional[str]:
+        return _failure(await client.request(prepared.method, prepared.url, headers=prepared.headers, content=prepared.content))
+
+    return lambda: nullcontext(call)
+
+def job_caller(client: httpx.AsyncClient, prepared: Prepared) -> Callable[[], AsyncContextManager[Call]]:
+    async def call() -> Optional[str]:
+        response = await client.request(prepared.method, prepared.url, headers=prepared.headers, content=prepared.content)
+        if response.status_code != 202:
+            return f"submit {response.status_code}"
+        job = response.json()
+        while job["status"] in ("queued", "running"):
+            await asyncio.sleep(JOB_POLL_SECONDS)
+            response = await client.get(job["status_url"])
+            if response.status_code != 200:
+                return f"poll {response.status_code}"
+            job = response.json()
+        if job["status"] != "succeeded":
+            return f"job {job['status']}"
+        for step, response in (("result", await client.get(job["result_url"])), ("delete", await client.delete(job["status_url"]))):
+            if _failure(response):
+                return f"{step} {response.status_code}"
+        return None
+
+    return lambda: nullcontext(call)
+
+class ASGIWebSocket:
+    """Minimal in-process WebSocket client for an ASGI app; httpx.ASGITransport only speaks HTTP."""
+
+    def __init__(self, app: Any, path: str):
+        self.app = app
+        self.path = path
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.outgoing: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "ASGIWebSocket":
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": self.path,
+            "raw_path": self.path.encode(), "root_path": "", "query_string": b"", "headers": [],
+            "client": ("127.0.0.1", 0), "server": ("bench", 80), "subprotocols": [],
+        }
+        await self.incoming.put({"type": "websocket.connect"})
+        self.task = asyncio.create_task(self.app(scope, self.incoming.get, self.outgoing.put))
+        message = await self.outgoing.get()
+        if message["type"] != "websocket.accept":
+            raise ConnectionError(f"WebSocket not accepted: {message}")
+        return self
+
+    async def send(self, text: str) -> None:
+        await self.incoming.put({"type": "websocket.receive", "text": text})
+
+    async def recv(self) -> str:
+        message = await self.outgoing.get()
+        if message["type"] == "websocket.close":
+            raise ConnectionError(f"WebSocket closed with code {message.get('code')}")
+        return message.get("text") or message["bytes"].decode()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.incoming.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+def live_caller(connect: Callable[[], AsyncContextManager[Any]], scenario: Scenario) -> Callable[[], AsyncContextManager[Call]]:
+    @asynccontextmanager
+    async def session() -> AsyncIterator[Call]:
+        # One connection per client, as an editor holds one; the ready frame is not timed
+        async with connect() as websocket:
+            await websocket.recv()
+            ids = itertools.count()
+
+            async def call() -> Optional[str]:
+                frame_id = str(next(ids))
+                # No debounce: time the conversion, not the keystroke-collapsing wait
+                await websocket.send(orjson.dumps({
+                    "type": "convert", "id": frame_id, "channel": "bench", "debounce_ms": 0, **scenario.request,
+                }).decode())
+                while True:
+                    reply = orjson.loads(await websocket.recv())
+                    if reply.get("id") == frame_id:
+                        break
+                return None if reply["type"] == "result" and reply["status"] < 400 else f"{reply['type']} {reply.get('status')}"
+
+            yield call
+
+    return session
+
+async def drive(open_caller: Callable[[], AsyncContextManager[Call]], request_bytes: int, concurrency: int, duration: float,
+                min_requests: int, max_requests: int) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal issued
+        async with open_caller() as call:
+            while issued < max_requests and (issued < min_requests or time.perf_counter() < deadline):
+                issued += 1
+                sent = time.perf_counter()
+                try:
+                    outcome = await call()
+                except (httpx.HTTPError, ConnectionError) as e:
+                    outcome = type(e).__name__
+                latencies.append(time.perf_counter() - sent)
+                if outcome is not None:
+                    errors[outcome] = errors.get(outcome, 0) + 1
+                # In-process calls can complete without suspending; without this a worker holds the
+                # shared loop for the whole run and admission sheds on the loop lag it causes
+                await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "request_bytes": request_bytes,
+    }
+
+async def settle(client: httpx.AsyncClient, timeout: float = 15.0) -> None:
+    """Wait for loop lag left by the previous scenario to decay, so admission does not shed the next one."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        stats = (await client.get("/api/admission")).json()
+        if stats.get("loop_lag_ms", 0.0) < SETTLED_LAG_MS:
+            return
+        await asyncio.sleep(0.1)
+
+async def run_scenarios(client: httpx.AsyncClient, base_url: str, scenarios: List[Scenario], sampler: RSSSampler,
+                        connect_live: Callable[[str], AsyncContextManager[Any]], args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for scenario in scenarios:
+        if scenario.kind == LIVE:
+            open_caller = live_caller(lambda: connect_live(scenario.path), scenario)
+            request_bytes = len(orjson.dumps(scenario.request))
+        else:
+            prepared = prepare(scenario, base_url)
+            open_caller = (job_caller if scenario.kind == JOB else http_caller)(client, prepared)
+            request_bytes = len(prepared.content)
+        # The corpus generators land just under their nominal size, so go by the tier as well
+        large = max(request_bytes, corpus.SIZES.get(scenario.tier, 0)) >= corpus.MB
+        await settle(client)
+        async with open_caller() as call:
+            for _ in range(args.warmup):
+                await call()
+        with sampler:
+            result = await drive(
+                open_caller, request_bytes,
+                concurrency=min(args.concurrency, 2) if large else args.concurrency,
+                duration=args.duration, min_requests=args.min_requests,
+                max_requests=args.max_requests,
+            )
+        result["peak_rss_mb"] = round(sampler.peak / corpus.MB, 1)
+        results[scenario.name] = result
+        print_row(scenario.name, result)
+    return results
+
+async def run_inprocess(scenarios: List[Scenario], args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    from app.main import app
+
+    base_url = "http://bench"
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout) as client:
+            return await run_scenarios(client, base_url, scenarios, RSSSampler(os.getpid()), lambda path: ASGIWebSocket(app, path), args)
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def _wait_until_healthy(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError(f"uvicorn was not healthy after {timeout:.0f}s")
+
+async def run_uvicorn(scenarios: List[Scenario], args: argparse.Namespace) -> Dict[str, Dict[str, Any]]:
+    import websockets
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--no-access-log", "--log-level", "warning"],
+        cwd=ROOT,
+    )
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            await _wait_until_healthy(client, server, timeout=60)
+            # Every worker imports lazily and starts its pools on first use; touch them all
+            await asyncio.gather(*(client.get("/api/health") for _ in range(args.workers * 4)))
+            return await run_scenarios(
+                client, base_url, scenarios, RSSSampler(server.pid),
+                lambda path: websockets.connect(f"ws://127.0.0.1:{port}{path}", max_size=None), args,
+            )
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+def print_header() -> None:
+    print(f"{'scenario':<58}{'reqs':>7}{'rps':>10}{'p50 ms':>10}{'p99 ms':>10}{'rss MB':>9}  errors")
+
+def print_row(name: str, result: Dict[str, Any]) -> None:
+    errors = ",".join(f"{code}x{count}" for code, count in sorted(result["errors"].items())) or "-"
+    print(f"{name:<58}{result['requests']:>7}{result['rps']:>10.1f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+          f"{result['peak_rss_mb']:>9.1f}  {errors}")
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """Describe every scenario that got slower or heavier than the baseline by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if previous["rps"] and result["rps"] < previous["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {previous['rps']:.1f} -> {result['rps']:.1f}")
+        if previous["p99_ms"] and result["p99_ms"] > previous["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p99 {previous['p99_ms']:.2f}ms -> {result['p99_ms']:.2f}ms")
+        if previous.get("peak_rss_mb") and result["peak_rss_mb"] > previous["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak rss {previous['peak_rss_mb']:.1f}MB -> {result['peak_rss_mb']:.1f}MB")
+        if not previous["errors"] and result["errors"]:
+            regressions.append(f"{name}: new errors {result['errors']}")
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.http_load", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--tiers", default=",".join(TIERS), help=f"Comma-separated subset of {','.join(TIERS)}")
+    parser.add_argument("--match", default="", help="Only run scenarios whose name contains this text")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight (2 for inputs of 1MB and up)")
+    parser.add_argument("--duration", type=float, default=2.0, help="Seconds per scenario")
+    parser.add_argument("--min-requests", type=int, default=3)
+    parser.add_argument("--max-requests", type=int, default=20000)
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed requests per scenario")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--save", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Baseline to compare with (default: the stored one for --mode)")
+    parser.add_argument("--no-baseline", action="store_true", help="Skip the baseline comparison")
+    parser.add_argument("--update-baseline", action="store_true", help="Merge these results into the baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative change before flagging")
+    parser.add_argument("--strict", action="store_true", help="Fail when a manifest route has no scenario")
+    parser.add_argument("--result-cache", action="store_true", help="Leave the result cache on (it is off by default)")
+    args = parser.parse_args(argv)
+
+    tiers = [tier for tier in args.tiers.split(",") if tier]
+    unknown = set(tiers) - set(TIERS)
+    if unknown:
+        parser.error(f"unknown tiers: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory(prefix="xutil-bench-") as workdir:
+        # Read by app.main at import (inprocess) or inherited by uvicorn
+        os.environ["XUTIL_RESULT_CACHE_ENABLED"] = "true" if args.result_cache else "false"
+        os.environ.setdefault("XUTIL_JOBS_DIR", str(Path(workdir) / "jobs"))
+        scenarios = build_scenarios(tiers, Path(workdir))
+        missing = uncovered_routes(scenarios) if "small" in tiers else []
+        scenarios = [s for s in scenarios if args.match in s.name]
+        print(f"{len(scenarios)} scenarios, mode={args.mode}, concurrency={args.concurrency}, duration={args.duration}s")
+        print_header()
+        runner = run_inprocess if args.mode == "inprocess" else run_uvicorn
+        results = asyncio.run(runner(scenarios, args))
+
+    report = {
+        "meta": {
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "uvicorn" else None,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "result_cache": args.result_cache,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.save:
+        args.save.write_bytes(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+
+    status = 0
+    failed = {name: result["errors"] for name, result in results.items() if result["errors"]}
+    if failed:
+        print(f"\n{len(failed)} scenarios had failed calls:")
+        for name, errors in failed.items():
+            print(f"  {name}: {errors}")
+        status = 1
+    if missing:
+        print(f"\n{len(missing)} routes without a scenario:")
+        for method, path in missing:
+            print(f"  {method} {path}")
+        status = 1 if args.strict else 0
+
+    baseline_path = args.baseline or BASELINE_DIR / f"http_load-{args.mode}.json"
+    if args.update_baseline and failed:
+        print("\nBaseline not updated: a baseline must not record failing scenarios")
+    elif args.update_baseline:
+        stored = orjson.loads(baseline_path.read_bytes()) if baseline_path.exists() else {"results": {}}
+        stored["meta"] = report["meta"]
+        stored["results"].update(results)
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_bytes(orjson.dumps(stored, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) + b"\n")
+        print(f"\nBaseline updated: {baseline_path}")
+    elif not args.no_baseline and baseline_path.exists():
+        baseline = orjson.loads(baseline_path.read_bytes())
+        regressions = compare(results, baseline["results"], args.tolerance)
+        print(f"\nCompared with {baseline_path} (recorded {baseline['meta'].get('recorded_at')}, tolerance {args.tolerance:.0%})")
+        for line in regressions:
+            print(f"  REGRESSION {line}")
+        if regressions:
+            status = 1
+        else:
+            print("  no regressions")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Compare stdlib json with the orjson serialization layer on large converter outputs.
+
+    python -m benchmarks.serialization_bench [--rows 20000] [--repeat 5]
+
+The payloads mimic what the converters produce: nested records from CSV-to-JSON and
+the attribute/text dicts that xmltodict builds for XML-to-JSON.
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+from app.core.serialization import dumps_json, loads_json
+
+def csv_like_records(rows: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "user": {"name": f"user-{i}", "email": f"user{i}@example.com", "active": i % 3 == 0},
+            "address": {"city": "Pune", "zip": 411001 + i % 100, "geo": {"lat": 18.52 + i / 1e6, "lng": 73.85}},
+            "score": i * 1.5,
+            "notes": None if i % 5 else "préférence ✓",
+        }
+        for i in range(rows)
+    ]
+
+def xmltodict_like(rows: int) -> Dict[str, Any]:
+    return {
+        "catalog": {
+            "@version": "1.0",
+            "book": [
+                {"@id": f"bk{i}", "author": f"Author {i}", "title": f"Title {i}", "price": f"{i % 50}.95",
+                 "tags": {"tag": ["a", "b", "c"]}, "#text": None}
+                for i in range(rows)
+            ],
+        }
+    }
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+def run(rows: int, repeat: int) -> None:
+    payloads = {"csv-to-json": csv_like_records(rows), "xml-to-json": xmltodict_like(rows)}
+    print(f"{'payload':<14}{'encoder':<24}{'ms':>10}{'MB':>8}{'speedup':>9}")
+    for name, payload in payloads.items():
+        baseline_text = json.dumps(payload, indent=2, ensure_ascii=False)
+        baseline = best_of(lambda: json.dumps(payload, indent=2, ensure_ascii=False), repeat)
+        cases = [
+            ("json.dumps indent=2", baseline, baseline_text),
+            ("orjson pretty", best_of(lambda: dumps_json(payload, pretty=True), repeat), dumps_json(payload, pretty=True)),
+            ("orjson compact", best_of(lambda: dumps_json(payload, pretty=False), repeat), dumps_json(payload, pretty=False)),
+        ]
+        for label, ms, text in cases:
+            print(f"{name:<14}{label:<24}{ms:>10.1f}{len(text.encode()) / 1e6:>8.2f}{baseline / ms:>8.1f}x")
+        decode_baseline = best_of(lambda: json.loads(baseline_text), repeat)
+        decode_orjson = best_of(lambda: loads_json(baseline_text), repeat)
+        print(f"{name:<14}{'json.loads':<24}{decode_baseline:>10.1f}")
+        print(f"{name:<14}{'orjson loads':<24}{decode_orjson:>10.1f}{'':>8}{decode_baseline / decode_orjson:>8.1f}x")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.rows, args.repeat)
+
+if __name__ == "__main__":
+    main()
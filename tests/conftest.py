@@ -0,0 +1,14 @@
+import os
+import tempfile
+import pytest
+
+# Settings are read once at import, so point state at a scratch directory before the app loads
+os.environ.setdefault("XUTIL_JOBS_DIR", tempfile.mkdtemp(prefix="xutil-jobs-"))
+os.environ.setdefault("XUTIL_WARMUP_ENABLED", "false")
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
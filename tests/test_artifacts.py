@@ -0,0 +1,5 @@
+from app.core.artifacts import check
+
+def test_build_artifacts_are_current():
+    # Fails when a router was added or changed without `python -m app.core.artifacts build`
+    assert check() == []
@@ -0,0 +1,19 @@
+from app.core.body_limit import route_limits
+from app.core.router_loader import load_manifest
+
+def test_templated_route_gets_its_module_limit():
+    limits = route_limits(load_manifest())
+    assert limits.get("/api/jobs/csv-to-json") > 2 * 1024 * 1024
+    assert limits.get("/api/no-such-route", 123) == 123
+
+def test_job_upload_over_default_limit_is_accepted(client):
+    # Over the 2MB default body limit, well under the job API's own limit
+    body = b"a,b\n" + b"12345,67890\n" * 300_000
+    assert len(body) > 3 * 1024 * 1024
+    response = client.post("/api/jobs/csv-to-json", files={"file": ("big.csv", body)})
+    assert response.status_code == 202, response.text
+    client.delete(f"/api/jobs/{response.json()['id']}")
+
+def test_templated_route_gets_its_cost_class():
+    from app.core.admission import route_cost_classes
+    assert route_cost_classes(load_manifest()).get("/api/jobs/csv-to-json") == "text"
@@ -0,0 +1,46 @@
+import bz2
+import gzip
+import pytest
+from app.core.decompression import BZIP2, GZIP, ZSTD, DecompressionError, StreamDecompressor, zstandard
+
+FIRST = b"id,name\n" + b"1,alpha\n" * 500
+SECOND = b"2,beta\n" * 500
+
+def compress(encoding: str, data: bytes) -> bytes:
+    if encoding == GZIP:
+        return gzip.compress(data)
+    if encoding == BZIP2:
+        return bz2.compress(data)
+    return zstandard.ZstdCompressor().compress(data)
+
+def decompress(encoding: str, data: bytes, step: int = 7) -> bytes:
+    decompressor = StreamDecompressor(encoding, 10 * 1024 * 1024, 200)
+    out = b"".join(b"".join(decompressor.feed(data[i:i + step])) for i in range(0, len(data), step))
+    decompressor.finish()
+    return out
+
+ENCODINGS = [GZIP, BZIP2, pytest.param(ZSTD, marks=pytest.mark.skipif(zstandard is None, reason="zstandard not installed"))]
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_concatenated_members_are_all_decoded(encoding):
+    data = compress(encoding, FIRST) + compress(encoding, SECOND)
+    assert decompress(encoding, data) == FIRST + SECOND
+    assert decompress(encoding, data, step=len(data)) == FIRST + SECOND
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_truncated_member_is_rejected(encoding):
+    data = compress(encoding, FIRST) + compress(encoding, SECOND)[:-4]
+    with pytest.raises(DecompressionError):
+        decompress(encoding, data)
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_trailing_garbage_is_rejected(encoding):
+    with pytest.raises(DecompressionError):
+        decompress(encoding, compress(encoding, FIRST) + b"not compressed")
+
+def test_multi_member_gzip_body_reaches_the_route(client):
+    body = gzip.compress(FIRST) + gzip.compress(SECOND)
+    response = client.post("/api/csv-json/csv-to-json-raw", content=body,
+                           headers={"Content-Type": "text/csv", "Content-Encoding": "gzip"})
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 1000
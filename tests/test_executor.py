@@ -0,0 +1,38 @@
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from app.core.executor import PROCESS, CrudExecutor, _worker_ping
+from app.core.warmup import Readiness
+
+def test_killed_worker_does_not_break_the_pool_for_good():
+    executor = CrudExecutor(inline_max_bytes=0, process_min_bytes=0, thread_workers=1, process_workers=1)
+
+    async def scenario():
+        first = await executor.run(_worker_ping, size=0, mode=PROCESS)
+        with pytest.raises(BrokenProcessPool):
+            await executor.run(os._exit, 1, size=0, mode=PROCESS)
+        second = await executor.run(_worker_ping, size=0, mode=PROCESS)
+        return first, second
+
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert first != second
+    assert executor.process_stats.in_flight == 0
+
+def test_prestart_waits_for_every_worker():
+    executor = CrudExecutor(inline_max_bytes=0, process_min_bytes=0, thread_workers=1, process_workers=2)
+    try:
+        assert asyncio.run(executor.prestart()) == 2
+    finally:
+        executor.shutdown()
+
+def test_readiness_waits_for_the_configured_workers():
+    state = Readiness()
+    state.mark_ready()
+    state.process_workers, state.process_workers_expected = 1, 2
+    assert not state.ready and state.as_dict()["status"] == "process_pool_incomplete"
+    state.process_workers = 2
+    assert state.ready
@@ -0,0 +1,39 @@
+import asyncio
+import subprocess
+import sys
+import time
+from app.core.jobs import FAILED, RESTARTED_ERROR, RUNNING, WORKER_HOST, JobManager, JobStore, worker_id
+
+def convert(contents: bytes) -> str:
+    return contents.decode()
+
+def test_stop_fails_unfinished_jobs(tmp_path):
+    manager = JobManager(JobStore(str(tmp_path), ttl=60), concurrency=1, max_queued=8, sweep_interval=60)
+
+    async def scenario():
+        manager.start()
+        ids = []
+        for _ in range(2):
+            directory = manager.store.new_job_dir()
+            (directory / "input.txt").write_bytes(b"x")
+            ids.append(manager.submit("echo", convert, directory / "input.txt", "result.txt", "text/plain", {}, 1)["id"])
+        manager.stop()
+        return ids
+
+    for job_id in asyncio.run(scenario()):
+        meta = manager.store.read(job_id)
+        assert (meta["status"], meta["error"], meta["status_code"]) == (FAILED, RESTARTED_ERROR, 503)
+
+def test_sweep_fails_jobs_whose_worker_exited(tmp_path):
+    store = JobStore(str(tmp_path), ttl=60)
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    jobs = {}
+    for worker in (f"{WORKER_HOST}:{exited.pid}", worker_id(), f"other-host:{exited.pid}"):
+        directory = store.new_job_dir()
+        store.write_meta(directory, {"id": directory.name, "status": RUNNING, "created_at": time.time(), "finished_at": None, "worker": worker})
+        jobs[worker] = directory.name
+    assert store.sweep() == (0, 1)
+    assert store.read(jobs[f"{WORKER_HOST}:{exited.pid}"])["status"] == FAILED
+    assert store.read(jobs[worker_id()])["status"] == RUNNING
+    assert store.read(jobs[f"other-host:{exited.pid}"])["status"] == RUNNING
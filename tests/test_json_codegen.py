@@ -0,0 +1,21 @@
+import gzip
+import pytest
+
+DOCUMENT = b'{"id": 1, "price": 9.99, "ratio": 1e-3, "user": {"name": "a", "scores": [1.5, 2.25]}}'
+
+@pytest.mark.parametrize("path", ["/api/json-python/json-to-python-file", "/api/json-pydantic/json-to-pydantic-file"])
+def test_file_route_accepts_non_integer_numbers(client, path):
+    response = client.post(path, files={"file": ("data.json", DOCUMENT, "application/json")}, data={"class_name": "Order"})
+    assert response.status_code == 200, response.text
+    assert "price: float" in response.json()["result"]
+
+@pytest.mark.parametrize("path", ["/api/json-python/json-to-python-file", "/api/json-pydantic/json-to-pydantic-file"])
+def test_file_route_reads_compressed_uploads(client, path):
+    response = client.post(path, files={"file": ("data.json.gz", gzip.compress(DOCUMENT))})
+    assert response.status_code == 200, response.text
+
+@pytest.mark.parametrize("path", ["/api/json-python/json-to-python-file", "/api/json-pydantic/json-to-pydantic-file"])
+def test_file_route_rejects_invalid_json(client, path):
+    response = client.post(path, files={"file": ("data.json", b'{"id": ', "application/json")})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON format"
@@ -0,0 +1,18 @@
+from app.core.result_cache import cacheable_routes
+from app.core.router_loader import load_manifest
+
+def test_side_effect_routes_are_not_cacheable():
+    routes = cacheable_routes(load_manifest())
+    assert routes.get("/api/morse/char-to-morse") is True
+    assert routes.get("/api/morse/char-to-morse-file") is False
+    assert routes.get("/api/morse/morse-to-char-file") is False
+    assert routes.get("/api/jobs/csv-to-json") is False
+
+def test_file_route_is_never_served_from_cache(client):
+    for _ in range(2):
+        response = client.post("/api/morse/char-to-morse-file", params={"file_path": "/nonexistent/input.txt"})
+        assert response.headers.get("x-cache") is None
+
+def test_pure_route_is_served_from_cache(client):
+    responses = [client.post("/api/morse/char-to-morse", json={"text": "cache me"}) for _ in range(2)]
+    assert [r.headers.get("x-cache") for r in responses] == ["MISS", "HIT"]
@@ -0,0 +1,10 @@
+import asyncio
+from app.core.warmup import collect_warmup_requests, run_warmup_requests
+
+def test_warmup_requests_all_succeed(client):
+    app = client.app
+    requests = collect_warmup_requests(app)
+    assert ("POST", "/api/csv-json/csv-to-json-raw?engine=pandas", b"id,user_name\n1,a\n", "text/csv") in requests
+    count, failures = asyncio.run(run_warmup_requests(app))
+    assert count == len(requests)
+    assert failures == []